@@ -12,6 +12,7 @@ https://docs.djangoproject.com/en/5.1/ref/settings/
 
 from pathlib import Path
 import os
+import sys
 import dj_database_url
 from dotenv import load_dotenv
 
@@ -103,6 +104,7 @@ MIDDLEWARE = [
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
     'checker.middleware.access_control.AccessControlMiddleware',  # 2-tier access control - RE-ENABLED WITH SUBSCRIPTION MANAGER
+    'checker.middleware.prerendered_pages.PrerenderedPageMiddleware',  # Anonymous detail pages from prerender_pages
     # 'monitoring.performance_middleware.PerformanceOptimizationMiddleware',  # Temporarily disabled for performance
 ]
 
@@ -152,6 +154,24 @@ if 'DATABASE_URL' in os.environ:
         conn_health_checks=True,  # Enable connection health checks
     )
 
+# Optional read replica for @read_replica views (checker.db_router); without it everything uses default
+READ_REPLICA_ALIAS = os.environ.get('READ_REPLICA_ALIAS', 'replica')
+READ_REPLICA_APPS = ('checker',)  # accounts, trades, sessions etc. always read the primary
+if 'DATABASE_REPLICA_URL' in os.environ:
+    replica_url = os.environ['DATABASE_REPLICA_URL']
+    DATABASES[READ_REPLICA_ALIAS] = dj_database_url.parse(
+        replica_url,
+        conn_max_age=300,
+        ssl_require=not replica_url.startswith('sqlite'),  # Two local SQLite files for testing the routing
+        conn_health_checks=True,
+    )
+    DATABASES[READ_REPLICA_ALIAS]['TEST'] = {'MIRROR': 'default'}
+elif 'test' in sys.argv:
+    # checker's router tests need the alias; as a mirror it shares the test database
+    DATABASES[READ_REPLICA_ALIAS] = {**DATABASES['default'], 'TEST': {'MIRROR': 'default'}}
+
+DATABASE_ROUTERS = ['checker.db_router.ReadReplicaRouter']
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.1/ref/settings/#auth-password-validators
@@ -205,18 +225,68 @@ DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 # Update the API_URL with the correct National Grid ESO domain
 API_URL = 'https://data.nationalgrideso.com/api/3/action/datastore_search'
 
+# NESO CKAN datastore used by the crawlers (benchmark_crawl points this at a local stand-in)
+NESO_API_URL = os.environ.get('NESO_API_URL', 'https://api.neso.energy/api/3/action/datastore_search')
+
+# Offline postcode centroid table (built by `python manage.py build_postcode_centroids <onspd.csv>`)
+POSTCODE_CENTROID_TABLE = os.environ.get(
+    'POSTCODE_CENTROID_TABLE',
+    str(BASE_DIR.parent / 'checker' / 'data' / 'postcodes' / 'postcode_centroids.bin'),
+)
+
 # Update your CACHES setting to use Redis
 import os
 redis_url = os.environ.get('REDIS_URL', 'redis://127.0.0.1:6379/0')
 
 CACHES = {
     'default': {
-        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        # Redis with an in-process LRU for hot keys and per-namespace memory budgets
+        'BACKEND': 'checker.cache_backends.TieredRedisCache',
         'LOCATION': redis_url,
         'TIMEOUT': 3600,  # 1 hour default timeout (good balance)
+        'OPTIONS': {
+            # Type-tagged values, zstd-compressed above CACHE_COMPRESS_MIN_BYTES
+            'serializer': 'checker.cache_backends.CompressedSerializer',
+            'LOCAL_MAX_BYTES': 24 * 1024 * 1024,
+            'LOCAL_MAX_ITEM_BYTES': 4 * 1024 * 1024,
+            'LOCAL_TIMEOUT': 60,
+            'LOCAL_PREFIXES': ['filter:', 'search:dictionary:', 'company_index_'],
+            # Budgets sum to ~2/3 of the 30MB plan so the rest of Redis never needs a flush
+            'NAMESPACE_BUDGETS': {
+                'views.decorators.cache.cache_page': 6 * 1024 * 1024,
+                'search_service_': 3 * 1024 * 1024,
+                'response_body:': 3 * 1024 * 1024,  # precompressed GeoJSON/API bodies
+                'map_data_': 3 * 1024 * 1024,
+                'filter_api_': 1 * 1024 * 1024,
+                'static_page_': 4 * 1024 * 1024,
+            },
+            # Key families reported in the cache monitor besides the budgeted ones
+            'STATS_PREFIXES': [
+                'filter:', 'search:', 'search_results_', 'location_search:', 'components_', 'company_index_',
+                'statistics_', 'cmu_df', 'cmu_dataframe', 'cmu_to_', 'location_to_', 'loc_group:', 'tech_map_', 'technology_',
+                'seo_', 'postcode_', 'outcode_', 'nearest_postcodes_', 'area_postcodes_', 'coalesce:',
+            ],
+            # Data-derived keys carry the dataset generation; a crawl flips it instead of clearing keys.
+            # Rate-limit counters (django-ratelimit's rl:) and monitoring keys aren't data and survive a flip
+            'GENERATION_SCOPED': True,
+            'GENERATION_EXEMPT_PREFIXES': [
+                'rl:', 'perf_', 'egress_monitor:', 'redis_test', 'test_redis', 'cache_test_',
+            ],
+        },
     }
 }
 
+# Release id mixed into conditional-GET ETags and pre-rendered page rows. It must be the same in
+# every process of a deploy: set RELEASE_VERSION at deploy time or enable Heroku dyno metadata
+# (HEROKU_SLUG_COMMIT). Left empty otherwise - never a per-process value
+RELEASE_VERSION = os.environ.get('RELEASE_VERSION') or os.environ.get('HEROKU_SLUG_COMMIT', '')
+
+CACHE_COMPRESS_MIN_BYTES = 1024  # Smaller values aren't worth compressing
+CACHE_COMPRESS_LEVEL = 3
+
+# Detail pages pre-rendered after each rebuild (prerender_pages) and served to anonymous visitors
+PRERENDER_ENABLED = os.environ.get('PRERENDER_ENABLED', 'True').lower() == 'true'
+
 # Cache middleware settings to prevent excessive page caching
 CACHE_MIDDLEWARE_SECONDS = 120  # Maximum 2 minutes for page cache
 CACHE_MIDDLEWARE_KEY_PREFIX = 'cmr'
@@ -371,6 +441,7 @@ API_KEY = os.environ.get('API_KEY', 'your_custom_api_key_for_auth')
 PUBLIC_API_KEY = os.environ.get('PUBLIC_API_KEY', 'cmr_public_readonly_ai_access_2024')
 # Redis monitoring and limits
 REDIS_MAX_MEMORY_PERCENT = 80  # Warn when Redis uses more than 80% memory
+REDIS_MAX_MEMORY_BYTES = int(os.environ.get('REDIS_MAX_MEMORY_BYTES', 30 * 1024 * 1024))  # Used when Redis reports no maxmemory
 CACHE_MIDDLEWARE_SECONDS = 120  # Cache pages for 2 minutes (reduced from 10 to prevent Redis spikes)
 CACHE_MIDDLEWARE_KEY_PREFIX = 'cmr'
 
@@ -0,0 +1,611 @@
+"""
+Two-tier cache backend: a byte-bounded in-process LRU in front of Redis.
+
+Hot, rarely-changing keys (filter options, the search dictionary, the company
+index) are answered from process memory; everything else goes straight to
+Redis as before. Key prefixes listed in NAMESPACE_BUDGETS get a Redis memory
+budget each: live bytes and hit counts are tracked per key, and a write that
+pushes a namespace over budget evicts that namespace's coldest / largest keys
+(fewest hits per byte first) instead of anyone having to flush Redis.
+
+Configured through CACHES['default']['OPTIONS']:
+    LOCAL_MAX_BYTES       total size of the in-process tier (default 16MB)
+    LOCAL_MAX_ITEM_BYTES  values larger than this are never held locally (default 2MB)
+    LOCAL_TIMEOUT         max seconds a local copy is trusted (default 60)
+    LOCAL_PREFIXES        key prefixes served from the in-process tier
+    NAMESPACE_BUDGETS     {key prefix: max Redis bytes}
+    EVICTION_SAMPLE       coldest keys considered per eviction round (default 50)
+    HIT_FLUSH_INTERVAL    seconds between hit-count and stats flushes to Redis (default 30)
+    STATS_PREFIXES        extra key prefixes reported by namespace_stats() (budgeted ones always are)
+    STATS_RETENTION_DAYS  days of per-namespace stats kept in Redis (default 8)
+    GENERATION_SCOPED     prefix keys with the dataset generation (default False)
+    GENERATION_EXEMPT_PREFIXES  keys that are not data-derived and survive a generation flip
+
+Other processes only see a delete/overwrite once their local copy ages out, so
+LOCAL_PREFIXES should only list data that is fine to serve LOCAL_TIMEOUT stale.
+
+Every read and write is also counted per key family (hits, misses, bytes
+read/written) in process and added to a daily Redis hash on each flush;
+namespace_stats() combines those with live bytes from a key scan for the cache
+monitor, so TTLs and budgets can be sized from real traffic.
+
+CompressedSerializer (OPTIONS['serializer']) stores values with a small
+type-tagged header and compresses anything above CACHE_COMPRESS_MIN_BYTES with
+zstd (zlib when zstandard isn't installed).
+"""
+import logging
+import pickle
+import threading
+import time
+import zlib
+from collections import OrderedDict, defaultdict
+from datetime import date, timedelta
+
+from django.conf import settings
+from django.core.cache.backends.base import DEFAULT_TIMEOUT
+from django.core.cache.backends.redis import RedisCache
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+logger = logging.getLogger(__name__)
+
+_TIER_OPTIONS = {
+    'LOCAL_MAX_BYTES': 16 * 1024 * 1024,
+    'LOCAL_MAX_ITEM_BYTES': 2 * 1024 * 1024,
+    'LOCAL_TIMEOUT': 60,
+    'LOCAL_PREFIXES': (),
+    'NAMESPACE_BUDGETS': {},
+    'EVICTION_SAMPLE': 50,
+    'HIT_FLUSH_INTERVAL': 30,
+    'STATS_PREFIXES': (),
+    'STATS_RETENTION_DAYS': 8,
+    'GENERATION_SCOPED': False,
+    'GENERATION_EXEMPT_PREFIXES': (),
+}
+
+# Backend bookkeeping and the generation counter itself are never generation scoped
+_ALWAYS_EXEMPT_PREFIXES = ('_tier:', 'dataset:')
+
+OTHER_NAMESPACE = 'other'
+STAT_FIELDS = ('hits', 'local_hits', 'misses', 'bytes_read', 'writes', 'bytes_written')
+
+# Record a write's size and return the namespace's new live byte total.
+# KEYS: sizes hash, bytes counter, hits zset - ARGV: cache key, size
+_RECORD_WRITE_LUA = """
+local old = tonumber(redis.call('HGET', KEYS[1], ARGV[1]) or '0')
+redis.call('HSET', KEYS[1], ARGV[1], ARGV[2])
+redis.call('ZADD', KEYS[3], 'NX', 0, ARGV[1])
+return redis.call('INCRBY', KEYS[2], tonumber(ARGV[2]) - old)
+"""
+
+# Forget a key and return the bytes released.
+# KEYS: sizes hash, bytes counter, hits zset - ARGV: cache key
+_FORGET_LUA = """
+local old = tonumber(redis.call('HGET', KEYS[1], ARGV[1]) or '0')
+redis.call('HDEL', KEYS[1], ARGV[1])
+redis.call('ZREM', KEYS[3], ARGV[1])
+if old > 0 then redis.call('DECRBY', KEYS[2], old) end
+return old
+"""
+
+
+_MISSING = object()
+
+# Serialized layout: MAGIC + type tag + codec + body
+_MAGIC = b'\xcc\x01'
+_HEADER_LEN = len(_MAGIC) + 2
+_TAG_BYTES, _TAG_STR, _TAG_PICKLE = b'b', b's', b'p'
+_CODEC_NONE, _CODEC_ZSTD, _CODEC_ZLIB = b'-', b'z', b'd'
+
+
+class CompressedSerializer:
+    """
+    Cache serializer with a type-tagged header and size-threshold compression.
+
+    bytes and str skip pickle entirely (HTTP bodies and JSON strings come back
+    as the same type with a single decompress), everything else is pickled with
+    the highest protocol. Ints stay raw so incr()/decr() keep working, and
+    values written by the stock RedisSerializer are still readable.
+    """
+
+    def __init__(self, protocol=None):
+        self.protocol = pickle.HIGHEST_PROTOCOL if protocol is None else protocol
+        self.min_bytes = getattr(settings, 'CACHE_COMPRESS_MIN_BYTES', 1024)
+        self.level = getattr(settings, 'CACHE_COMPRESS_LEVEL', 3)
+        self._local = threading.local()  # zstd contexts are not thread-safe
+
+    def _zstd(self):
+        if not hasattr(self._local, 'compressor'):
+            self._local.compressor = zstandard.ZstdCompressor(level=self.level)
+            self._local.decompressor = zstandard.ZstdDecompressor()
+        return self._local.compressor, self._local.decompressor
+
+    def dumps(self, obj):
+        if type(obj) is int:
+            return obj
+        if isinstance(obj, (bytes, bytearray, memoryview)):
+            tag, body = _TAG_BYTES, bytes(obj)
+        elif isinstance(obj, str):
+            tag, body = _TAG_STR, obj.encode('utf-8')
+        else:
+            tag, body = _TAG_PICKLE, pickle.dumps(obj, self.protocol)
+
+        codec = _CODEC_NONE
+        if len(body) >= self.min_bytes:
+            if zstandard is not None:
+                compressed, codec_used = self._zstd()[0].compress(body), _CODEC_ZSTD
+            else:
+                compressed, codec_used = zlib.compress(body, 1), _CODEC_ZLIB
+            if len(compressed) < len(body):
+                body, codec = compressed, codec_used
+        return b''.join((_MAGIC, tag, codec, body))
+
+    def loads(self, data):
+        if not (isinstance(data, bytes) and data.startswith(_MAGIC)):
+            # Raw int or a value written by RedisSerializer
+            try:
+                return int(data)
+            except ValueError:
+                return pickle.loads(data)
+
+        tag = data[2:3]
+        codec = data[3:4]
+        body = memoryview(data)[_HEADER_LEN:]
+        if codec == _CODEC_ZSTD:
+            body = self._zstd()[1].decompress(body)
+        elif codec == _CODEC_ZLIB:
+            body = zlib.decompress(body)
+
+        if tag == _TAG_BYTES:
+            return bytes(body)
+        if tag == _TAG_STR:
+            return str(body, 'utf-8')
+        return pickle.loads(body)
+
+
+def _payload_size(payload):
+    # RedisSerializer leaves ints unpickled
+    return len(payload) if isinstance(payload, (bytes, bytearray)) else 8
+
+
+class LocalLRU:
+    """Thread-safe LRU of serialized payloads, bounded by total bytes"""
+
+    def __init__(self, max_bytes, max_item_bytes):
+        self.max_bytes = max_bytes
+        self.max_item_bytes = max_item_bytes
+        self.bytes = 0
+        self._data = OrderedDict()  # key -> (expires_at, payload, size)
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            if entry[0] < time.monotonic():
+                self._pop(key)
+                return None
+            self._data.move_to_end(key)
+            return entry[1]
+
+    def set(self, key, payload, ttl):
+        size = _payload_size(payload)
+        with self._lock:
+            self._pop(key)
+            if ttl <= 0 or size > self.max_item_bytes:
+                return
+            self._data[key] = (time.monotonic() + ttl, payload, size)
+            self.bytes += size
+            while self.bytes > self.max_bytes and self._data:
+                self._pop(next(iter(self._data)))
+
+    def delete(self, key):
+        with self._lock:
+            self._pop(key)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self.bytes = 0
+
+    def __len__(self):
+        return len(self._data)
+
+    def _pop(self, key):
+        entry = self._data.pop(key, None)
+        if entry is not None:
+            self.bytes -= entry[2]
+
+
+class TieredRedisCache(RedisCache):
+    """RedisCache with an in-process LRU tier and per-namespace Redis budgets"""
+
+    def __init__(self, server, params):
+        params = dict(params)
+        options = dict(params.get('OPTIONS', {}))
+        tier = {name: options.pop(name, default) for name, default in _TIER_OPTIONS.items()}
+        params['OPTIONS'] = options  # the rest goes to the redis connection pool
+        super().__init__(server, params)
+
+        self.local = LocalLRU(tier['LOCAL_MAX_BYTES'], tier['LOCAL_MAX_ITEM_BYTES'])
+        self.local_timeout = tier['LOCAL_TIMEOUT']
+        self.local_prefixes = tuple(tier['LOCAL_PREFIXES'])
+        self.budgets = dict(tier['NAMESPACE_BUDGETS'])
+        # Longest prefix first so 'map_data_geo' wins over 'map_data_'
+        self._namespaces = sorted(self.budgets, key=len, reverse=True)
+        self.eviction_sample = tier['EVICTION_SAMPLE']
+        self.hit_flush_interval = tier['HIT_FLUSH_INTERVAL']
+        self._stat_namespaces = sorted(set(self.budgets) | set(tier['STATS_PREFIXES']), key=len, reverse=True)
+        self.stats_retention_days = tier['STATS_RETENTION_DAYS']
+        self.generation_scoped = tier['GENERATION_SCOPED']
+        self.generation_exempt = _ALWAYS_EXEMPT_PREFIXES + tuple(tier['GENERATION_EXEMPT_PREFIXES'])
+
+        self._pending_hits = defaultdict(int)  # (namespace, redis key) -> hits
+        self._pending_stats = defaultdict(int)  # (stats namespace, field) -> count
+        self._hits_lock = threading.Lock()
+        self._last_hit_flush = time.monotonic()
+        self._scripts = None
+
+    # --- key classification -------------------------------------------------
+
+    def make_key(self, key, version=None):
+        if self.generation_scoped and not key.startswith(self.generation_exempt):
+            from checker.services.dataset_generation import current_generation
+            key = f'g{current_generation()}:{key}'
+        return super().make_key(key, version=version)
+
+    def namespace_for(self, key):
+        """Budgeted namespace (key prefix) of an unversioned cache key, or None"""
+        for prefix in self._namespaces:
+            if key.startswith(prefix):
+                return prefix
+        return None
+
+    def stats_namespace_for(self, key):
+        """Reporting namespace of an unversioned cache key ('other' when no prefix matches)"""
+        for prefix in self._stat_namespaces:
+            if key.startswith(prefix):
+                return prefix
+        return OTHER_NAMESPACE
+
+    def _unversioned(self, redis_key):
+        """'prefix:1:g7:map_data_x' -> ('map_data_x', 7); generation is None for unscoped keys"""
+        key = redis_key.split(':', 2)[-1]
+        if key.startswith('g'):
+            number, sep, rest = key[1:].partition(':')
+            if sep and number.isdigit():
+                return rest, int(number)
+        return key, None
+
+    def _is_local(self, key):
+        return bool(self.local_prefixes) and key.startswith(self.local_prefixes)
+
+    def _meta_keys(self, namespace):
+        base = self.make_key(f'_tier:{namespace}')
+        return [f'{base}:sizes', f'{base}:bytes', f'{base}:hits']
+
+    def _client(self, key=None, write=False):
+        return self._cache.get_client(key, write=write)
+
+    def _script(self, name):
+        if self._scripts is None:
+            client = self._client(write=True)
+            self._scripts = {
+                'record': client.register_script(_RECORD_WRITE_LUA),
+                'forget': client.register_script(_FORGET_LUA),
+            }
+        return self._scripts[name]
+
+    # --- reads --------------------------------------------------------------
+
+    def get(self, key, default=None, version=None):
+        redis_key = self.make_and_validate_key(key, version=version)
+        namespace = self.namespace_for(key)
+        local = self._is_local(key)
+
+        if local:
+            payload = self.local.get(redis_key)
+            if payload is not None:
+                self._count_read(key, namespace, redis_key, payload, local=True)
+                return self._cache._serializer.loads(payload)
+
+        payload = self._client(redis_key).get(redis_key)
+        self._count_read(key, namespace, redis_key, payload)
+        if payload is None:
+            return default
+
+        if local:
+            self.local.set(redis_key, payload, self._local_ttl(redis_key))
+        return self._cache._serializer.loads(payload)
+
+    def get_many(self, keys, version=None):
+        found = {}
+        remaining = []
+        for key in keys:
+            if self._is_local(key):
+                value = self.get(key, _MISSING, version=version)
+                if value is not _MISSING:
+                    found[key] = value
+            else:
+                remaining.append(key)
+        if remaining:
+            redis_keys = {self.make_and_validate_key(key, version=version): key for key in remaining}
+            payloads = self._client().mget(list(redis_keys))
+            for (redis_key, key), payload in zip(redis_keys.items(), payloads):
+                self._count_read(key, self.namespace_for(key), redis_key, payload)
+                if payload is not None:
+                    found[key] = self._cache._serializer.loads(payload)
+        return found
+
+    # --- writes -------------------------------------------------------------
+
+    def set(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        redis_key = self.make_and_validate_key(key, version=version)
+        timeout = self.get_backend_timeout(timeout)
+        self._write(key, redis_key, self._cache._serializer.dumps(value), timeout)
+
+    def add(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        redis_key = self.make_and_validate_key(key, version=version)
+        timeout = self.get_backend_timeout(timeout)
+        return self._write(key, redis_key, self._cache._serializer.dumps(value), timeout, nx=True)
+
+    def set_many(self, data, timeout=DEFAULT_TIMEOUT, version=None):
+        for key, value in data.items():
+            self.set(key, value, timeout=timeout, version=version)
+        return []
+
+    def _write(self, key, redis_key, payload, timeout, nx=False):
+        client = self._client(redis_key, write=True)
+        namespace = self.namespace_for(key)
+
+        if timeout == 0:
+            # Same semantics as RedisCacheClient: a zero timeout means "expire now"
+            written = bool(client.set(redis_key, payload, nx=True)) if nx else True
+            client.delete(redis_key)
+            self._forget(namespace, redis_key)
+            return written
+
+        written = bool(client.set(redis_key, payload, ex=timeout, nx=nx))
+        if not written:
+            return False
+
+        self._count(self.stats_namespace_for(key), writes=1, bytes_written=_payload_size(payload))
+
+        if self._is_local(key):
+            self.local.set(redis_key, payload, min(self.local_timeout, timeout or self.local_timeout))
+        if namespace:
+            total = self._script('record')(
+                keys=self._meta_keys(namespace), args=[redis_key, _payload_size(payload)]
+            )
+            budget = self.budgets[namespace]
+            if total > budget:
+                self.evict_namespace(namespace, budget, keep=redis_key)
+        return True
+
+    def delete(self, key, version=None):
+        redis_key = self.make_and_validate_key(key, version=version)
+        self.local.delete(redis_key)
+        self._forget(self.namespace_for(key), redis_key)
+        return super().delete(key, version=version)
+
+    def delete_many(self, keys, version=None):
+        for key in keys:
+            redis_key = self.make_and_validate_key(key, version=version)
+            self.local.delete(redis_key)
+            self._forget(self.namespace_for(key), redis_key)
+        return super().delete_many(keys, version=version)
+
+    def incr(self, key, delta=1, version=None):
+        self.local.delete(self.make_and_validate_key(key, version=version))
+        return super().incr(key, delta=delta, version=version)
+
+    def clear(self):
+        self.local.clear()
+        with self._hits_lock:
+            self._pending_hits.clear()
+            self._pending_stats.clear()
+        return super().clear()
+
+    def _local_ttl(self, redis_key):
+        ttl = self._client(redis_key).ttl(redis_key)
+        return self.local_timeout if ttl is None or ttl < 0 else min(self.local_timeout, ttl)
+
+    def _forget(self, namespace, redis_key):
+        if namespace:
+            return self._script('forget')(keys=self._meta_keys(namespace), args=[redis_key]) or 0
+        return 0
+
+    # --- hit and traffic accounting -----------------------------------------
+
+    def _count_read(self, key, namespace, redis_key, payload, local=False):
+        stats_namespace = self.stats_namespace_for(key)
+        with self._hits_lock:
+            if payload is None:
+                self._pending_stats[(stats_namespace, 'misses')] += 1
+            else:
+                self._pending_stats[(stats_namespace, 'hits')] += 1
+                self._pending_stats[(stats_namespace, 'bytes_read')] += _payload_size(payload)
+                if local:
+                    self._pending_stats[(stats_namespace, 'local_hits')] += 1
+                if namespace:
+                    self._pending_hits[(namespace, redis_key)] += 1
+            due = time.monotonic() - self._last_hit_flush >= self.hit_flush_interval
+        if due:
+            self.flush_hits()
+
+    def _count(self, stats_namespace, **fields):
+        with self._hits_lock:
+            for field, amount in fields.items():
+                self._pending_stats[(stats_namespace, field)] += amount
+            due = time.monotonic() - self._last_hit_flush >= self.hit_flush_interval
+        if due:
+            self.flush_hits()
+
+    def _stats_key(self, day):
+        return self.make_key(f"_tier:stats:{day.strftime('%Y%m%d')}")
+
+    def flush_hits(self):
+        """Push locally counted hits into the per-namespace hit sorted sets, and stats into today's hash"""
+        with self._hits_lock:
+            pending, self._pending_hits = self._pending_hits, defaultdict(int)
+            stats, self._pending_stats = self._pending_stats, defaultdict(int)
+            self._last_hit_flush = time.monotonic()
+        if not pending and not stats:
+            return
+        try:
+            pipe = self._client(write=True).pipeline(transaction=False)
+            for (namespace, redis_key), hits in pending.items():
+                # xx: never resurrect metadata for keys that were deleted meanwhile
+                pipe.zadd(self._meta_keys(namespace)[2], {redis_key: hits}, xx=True, incr=True)
+            if stats:
+                stats_key = self._stats_key(date.today())
+                for (namespace, field), amount in stats.items():
+                    pipe.hincrby(stats_key, f'{namespace}|{field}', amount)
+                pipe.expire(stats_key, self.stats_retention_days * 86400)
+            pipe.execute()
+        except Exception as e:
+            logger.warning(f"Failed to flush cache hit counts: {e}")
+
+    def live_bytes(self, max_keys=100000):
+        """
+        {stats namespace: {'keys', 'bytes', 'stale_bytes'}} from a SCAN of the cache's keys.
+        stale_bytes are keys of an older dataset generation that are still aging out.
+        """
+        from checker.services.dataset_generation import current_generation
+        generation = current_generation() if self.generation_scoped else None
+        client = self._client()
+        live = defaultdict(lambda: {'keys': 0, 'bytes': 0, 'stale_bytes': 0})
+        batch = []
+
+        def measure(batch):
+            pipe = client.pipeline(transaction=False)
+            for redis_key in batch:
+                pipe.strlen(redis_key)
+            for redis_key, size in zip(batch, pipe.execute(raise_on_error=False)):
+                key, key_generation = self._unversioned(redis_key.decode())
+                if isinstance(size, Exception) or key.startswith('_tier:'):
+                    continue  # backend bookkeeping
+                usage = live[self.stats_namespace_for(key)]
+                usage['keys'] += 1
+                usage['bytes'] += size
+                if key_generation is not None and key_generation != generation:
+                    usage['stale_bytes'] += size
+
+        for count, redis_key in enumerate(client.scan_iter(match=f'{self.key_prefix}:*', count=1000)):
+            if count >= max_keys:
+                break
+            batch.append(redis_key)
+            if len(batch) >= 1000:
+                measure(batch)
+                batch = []
+        if batch:
+            measure(batch)
+        return dict(live)
+
+    def namespace_stats(self, days=1):
+        """
+        Per key family: hits, misses, bytes read/written over the last `days` days,
+        live bytes now, and the budget where one is set.
+        """
+        self.flush_hits()
+        client = self._client()
+        totals = defaultdict(lambda: dict.fromkeys(STAT_FIELDS, 0))
+        for offset in range(days):
+            for field, amount in client.hgetall(self._stats_key(date.today() - timedelta(days=offset))).items():
+                namespace, _, name = field.decode().rpartition('|')
+                if name in STAT_FIELDS:
+                    totals[namespace][name] += int(amount)
+
+        for namespace, usage in self.live_bytes().items():
+            totals[namespace].update(live_keys=usage['keys'], live_bytes=usage['bytes'], stale_bytes=usage['stale_bytes'])
+
+        stats = {}
+        for namespace, row in totals.items():
+            lookups = row['hits'] + row['misses']
+            row.setdefault('live_keys', 0)
+            row.setdefault('live_bytes', 0)
+            row.setdefault('stale_bytes', 0)
+            row['hit_rate'] = round(row['hits'] / lookups * 100, 1) if lookups else None
+            row['budget'] = self.budgets.get(namespace)
+            stats[namespace] = row
+        return stats
+
+    # --- eviction -----------------------------------------------------------
+
+    def namespace_usage(self):
+        """{namespace: {'bytes', 'budget', 'keys'}} as tracked in Redis"""
+        client = self._client()
+        usage = {}
+        for namespace, budget in self.budgets.items():
+            sizes_key, bytes_key, _ = self._meta_keys(namespace)
+            usage[namespace] = {
+                'bytes': int(client.get(bytes_key) or 0),
+                'budget': budget,
+                'keys': client.hlen(sizes_key),
+            }
+        return usage
+
+    def reconcile_namespace(self, namespace):
+        """Drop metadata for keys Redis already expired; returns bytes released"""
+        client = self._client(write=True)
+        sizes_key, bytes_key, hits_key = self._meta_keys(namespace)
+        tracked = list(client.hkeys(sizes_key))
+        released = 0
+        for start in range(0, len(tracked), 500):
+            batch = tracked[start:start + 500]
+            pipe = client.pipeline(transaction=False)
+            for redis_key in batch:
+                pipe.exists(redis_key)
+            for redis_key, exists in zip(batch, pipe.execute()):
+                if not exists:
+                    released += self._script('forget')(keys=[sizes_key, bytes_key, hits_key], args=[redis_key]) or 0
+        return released
+
+    def evict_namespace(self, namespace, target_bytes, keep=None):
+        """
+        Delete keys from a namespace until its live bytes are <= target_bytes.
+        Candidates are the least-hit keys; among those the fewest hits per byte
+        go first, so large cold values are dropped before small hot ones.
+        Returns bytes freed.
+        """
+        self.flush_hits()
+        client = self._client(write=True)
+        sizes_key, bytes_key, hits_key = self._meta_keys(namespace)
+        freed = 0
+
+        while int(client.get(bytes_key) or 0) > target_bytes:
+            candidates = client.zrange(hits_key, 0, self.eviction_sample - 1, withscores=True)
+            candidates = [(k, hits) for k, hits in candidates if k.decode() != keep]
+            if not candidates:
+                break
+            sizes = client.hmget(sizes_key, [k for k, _ in candidates])
+            ranked = sorted(
+                ((k, hits, int(size or 0)) for (k, hits), size in zip(candidates, sizes)),
+                key=lambda c: (c[1] + 1) / max(c[2], 1),
+            )
+            for redis_key, _, _ in ranked:
+                redis_key = redis_key.decode()
+                client.delete(redis_key)
+                self.local.delete(redis_key)
+                freed += self._script('forget')(keys=[sizes_key, bytes_key, hits_key], args=[redis_key]) or 0
+                if int(client.get(bytes_key) or 0) <= target_bytes:
+                    break
+
+        if freed:
+            logger.info(f"Evicted {freed / 1024:.0f}KB from cache namespace '{namespace}'")
+        return freed
+
+    def shrink_namespaces(self, fraction=1.0):
+        """
+        Bring every budgeted namespace down to `fraction` of its budget.
+        Used under Redis memory pressure instead of a blanket clear(). Returns bytes freed.
+        """
+        freed = 0
+        for namespace, budget in self.budgets.items():
+            self.reconcile_namespace(namespace)
+            freed += self.evict_namespace(namespace, int(budget * fraction))
+        return freed
@@ -0,0 +1,138 @@
+"""
+Read-replica routing.
+
+Views marked with @read_replica (checker.decorators.read_replica) run with
+read intent: ORM reads of READ_REPLICA_APPS models go to the READ_REPLICA_ALIAS
+database. Everything else stays on default:
+
+- writes, always (even for objects that were read from the replica)
+- reads outside a marked view (accounts, trades, crawls, commands)
+- reads inside a transaction on default, or after the view has written
+  anything, so a request sees its own writes despite replication lag
+- every read while the alias is not configured, or for REPLICA_RETRY_SECONDS
+  after connecting to it failed
+- every read inside primary_reads(), which dataset_generation.warming() uses so
+  caches for a new generation are never built from a lagging replica
+
+bump_dataset_generation also calls wait_for_replica() before activating a new
+generation, so live requests don't cache pre-rebuild rows under it either.
+
+Local check with two SQLite files (copy the primary to act as the replica):
+    cp db.sqlite3 replica.sqlite3
+    DATABASE_REPLICA_URL=sqlite:///replica.sqlite3 python manage.py runserver
+"""
+import logging
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.db.utils import DatabaseError
+
+logger = logging.getLogger(__name__)
+
+REPLICA_RETRY_SECONDS = getattr(settings, 'READ_REPLICA_RETRY_SECONDS', 30)
+REPLICA_CATCHUP_SECONDS = getattr(settings, 'READ_REPLICA_CATCHUP_SECONDS', 120)
+CATCHUP_POLL_INTERVAL = 1
+
+_read_intent = ContextVar('read_intent', default=False)
+_wrote = ContextVar('wrote_primary', default=False)
+_primary_only = ContextVar('primary_reads', default=False)
+_unavailable_until = {}
+
+
+@contextmanager
+def read_intent():
+    """Route this block's reads to the replica (see module docstring for the exceptions)"""
+    intent = _read_intent.set(True)
+    wrote = _wrote.set(False)
+    try:
+        yield
+    finally:
+        _wrote.reset(wrote)
+        _read_intent.reset(intent)
+
+
+@contextmanager
+def primary_reads():
+    """Keep every read in this block on default, read intent or not"""
+    token = _primary_only.set(True)
+    try:
+        yield
+    finally:
+        _primary_only.reset(token)
+
+
+def replica_alias():
+    """The configured replica alias when it is defined and reachable, else None"""
+    alias = getattr(settings, 'READ_REPLICA_ALIAS', 'replica')
+    if alias == DEFAULT_DB_ALIAS or alias not in settings.DATABASES:
+        return None
+    if time.monotonic() < _unavailable_until.get(alias, 0):
+        return None
+    try:
+        connections[alias].ensure_connection()
+    except DatabaseError as e:
+        logger.warning(f"Read replica '{alias}' unavailable, reading from primary for {REPLICA_RETRY_SECONDS}s: {e}")
+        _unavailable_until[alias] = time.monotonic() + REPLICA_RETRY_SECONDS
+        return None
+    return alias
+
+
+def wait_for_replica(timeout=None):
+    """
+    Block until the replica has replayed everything written to the primary so
+    far. Returns False on timeout; True once caught up, or when there is no
+    replica or its lag can't be measured (only Postgres streaming replicas can).
+    """
+    alias = replica_alias()
+    if alias is None or connections[alias].vendor != 'postgresql':
+        return True
+    with connections[DEFAULT_DB_ALIAS].cursor() as cursor:
+        cursor.execute("SELECT pg_current_wal_lsn()")
+        primary_lsn = cursor.fetchone()[0]
+
+    deadline = time.monotonic() + (REPLICA_CATCHUP_SECONDS if timeout is None else timeout)
+    while True:
+        with connections[alias].cursor() as cursor:
+            cursor.execute("SELECT pg_last_wal_replay_lsn() >= %s::pg_lsn", [primary_lsn])
+            caught_up = cursor.fetchone()[0]
+        if caught_up is None:
+            logger.info(f"Read replica '{alias}' is not a streaming standby, can't measure its lag")
+            return True
+        if caught_up:
+            return True
+        if time.monotonic() >= deadline:
+            logger.warning(f"Read replica '{alias}' has not replayed primary LSN {primary_lsn} yet")
+            return False
+        time.sleep(CATCHUP_POLL_INTERVAL)
+
+
+class ReadReplicaRouter:
+    def db_for_read(self, model, **hints):
+        if _primary_only.get() or not _read_intent.get() or _wrote.get():
+            return None
+        if model._meta.app_label not in getattr(settings, 'READ_REPLICA_APPS', ('checker',)):
+            return None
+        if connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            return None
+        return replica_alias()
+
+    def db_for_write(self, model, **hints):
+        if _read_intent.get():
+            _wrote.set(True)
+        # Explicit, so saving an object read from the replica doesn't follow it there
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        databases = {DEFAULT_DB_ALIAS, getattr(settings, 'READ_REPLICA_ALIAS', 'replica')}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # The replica gets its schema through replication
+        if db != DEFAULT_DB_ALIAS and db == getattr(settings, 'READ_REPLICA_ALIAS', 'replica'):
+            return False
+        return None
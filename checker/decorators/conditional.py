@@ -0,0 +1,64 @@
+"""
+Conditional GET for data pages and APIs.
+
+The ETag is derived from the dataset generation, the release, the viewer and
+their paid-access state, the URL (which carries the entity id) and its query
+parameters - no dataset queries - so a repeat request from a crawler or
+returning user gets a 304 before the view runs. Data only changes when a new generation is activated, so the ETag
+changes exactly when the content can.
+"""
+import hashlib
+from functools import wraps
+
+from django.conf import settings
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import quote_etag
+
+from ..services.dataset_generation import current_generation
+
+# Must be identical in every worker and dyno of a release; empty when none is configured
+_RELEASE = getattr(settings, 'RELEASE_VERSION', '')
+
+
+def _viewer(request):
+    """Who the page is rendered for - pages show paid features per account_status_processor"""
+    user = getattr(request, 'user', None)
+    if user is None or not user.is_authenticated:
+        return 'anon'
+    profile = getattr(user, 'profile', None)
+    paid = 'p' if profile is not None and profile.is_paid_access_active else 'f'
+    return f"u{user.pk}{paid}"
+
+
+def compute_etag(request):
+    viewer = _viewer(request)
+    params = '&'.join(f"{key}={'|'.join(sorted(values))}" for key, values in sorted(request.GET.lists()))
+    raw = f"{current_generation()}:{_RELEASE}:{viewer}:{request.path}?{params}"
+    return quote_etag(hashlib.blake2b(raw.encode('utf-8'), digest_size=12).hexdigest())
+
+
+def generation_etag(view_func):
+    """Answer If-None-Match with 304 when the generation-derived ETag still matches"""
+    @wraps(view_func)
+    def wrapper(request, *args, **kwargs):
+        if request.method not in ('GET', 'HEAD'):
+            return view_func(request, *args, **kwargs)
+
+        etag = compute_etag(request)
+        not_modified = get_conditional_response(request, etag=etag)
+        if not_modified is not None:
+            not_modified['ETag'] = etag
+            return not_modified
+
+        response = view_func(request, *args, **kwargs)
+        if response.status_code == 200 and not response.has_header('ETag'):
+            response['ETag'] = etag
+            if not response.has_header('Cache-Control'):
+                # Always revalidate - cheap now that it usually ends in a 304
+                user = getattr(request, 'user', None)
+                if user is not None and user.is_authenticated:
+                    patch_cache_control(response, no_cache=True, private=True)
+                else:
+                    patch_cache_control(response, no_cache=True)
+        return response
+    return wrapper
@@ -0,0 +1,129 @@
+"""
+Response cache that stores final, already-compressed bodies.
+
+The first request for a given set of parameters runs the view, serializes its
+JSON once, compresses it once per encoding (brotli when installed, gzip,
+identity) and caches each body under `response_body:`. Later requests get the
+bytes for their Accept-Encoding copied straight into the response with
+Content-Encoding set - no dict re-serialization, no per-hit compression.
+Keys carry the dataset generation like every other data-derived key, and the
+`response_body:` namespace has its own Redis budget.
+"""
+import gzip
+import hashlib
+import logging
+from functools import wraps
+
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.utils.cache import patch_vary_headers
+from django.utils.regex_helper import _lazy_re_compile
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = 'response_body:'
+re_accepts_gzip = _lazy_re_compile(r"\bgzip\b")
+re_accepts_br = _lazy_re_compile(r"\bbr\b")
+
+# Stored bodies are compressed once and served many times, so they get the slow, dense setting;
+# per-request (uncacheable) bodies pay compression on every hit and use a cheap one
+BROTLI_STORED_QUALITY = 9
+BROTLI_PER_REQUEST_QUALITY = 4
+
+
+def _compress(body, encoding, stored=True):
+    if encoding == 'br':
+        return brotli.compress(body, quality=BROTLI_STORED_QUALITY if stored else BROTLI_PER_REQUEST_QUALITY)
+    if encoding == 'gzip':
+        return gzip.compress(body, compresslevel=6, mtime=0)
+    return body
+
+
+def available_encodings():
+    return (('br',) if brotli is not None else ()) + ('gzip', 'identity')
+
+
+def negotiate_encoding(request):
+    accept = request.META.get('HTTP_ACCEPT_ENCODING', '')
+    if brotli is not None and re_accepts_br.search(accept):
+        return 'br'
+    if re_accepts_gzip.search(accept):
+        return 'gzip'
+    return 'identity'
+
+
+def response_cache_key(name, request, encoding, params=None):
+    params = '&'.join(
+        f"{key}={'|'.join(sorted(values))}" for key, values in sorted(request.GET.lists())
+        if params is None or key in params
+    )
+    digest = hashlib.blake2b(params.encode('utf-8'), digest_size=12).hexdigest()
+    return f"{KEY_PREFIX}{name}:{digest}:{encoding}"
+
+
+def _body_response(body, content_type, encoding):
+    response = HttpResponse(body, content_type=content_type)
+    if encoding != 'identity':
+        response['Content-Encoding'] = encoding
+    response['Content-Length'] = str(len(body))
+    patch_vary_headers(response, ('Accept-Encoding',))
+    return response
+
+
+def precompressed_response(name, timeout=300, cacheable=None, params=None, content_type='application/json'):
+    """
+    Cache the view's 200 responses as compressed bodies, one per encoding.
+
+    name: key namespace for the view
+    content_type: Content-Type of cached responses (only responses of this type are cached)
+    cacheable: optional predicate(request); requests it rejects (e.g. viewport
+        queries with unbounded key space) are compressed per request, like gzip_page
+    params: query parameters that change the response (default: all of them)
+    """
+    def decorator(view_func):
+        @wraps(view_func)
+        def wrapper(request, *args, **kwargs):
+            encoding = negotiate_encoding(request)
+            use_cache = request.method == 'GET' and (cacheable is None or cacheable(request))
+
+            if use_cache:
+                try:
+                    body = cache.get(response_cache_key(name, request, encoding, params))
+                except Exception as e:
+                    logger.warning(f"Response cache read failed for {name}: {e}")
+                    body = None
+                if body is not None:
+                    response = _body_response(body, content_type, encoding)
+                    response['X-Response-Cache'] = 'HIT'
+                    return response
+
+            response = view_func(request, *args, **kwargs)
+            if response.status_code != 200 or response.streaming or response.has_header('Content-Encoding'):
+                return response
+
+            use_cache = use_cache and response['Content-Type'] == content_type
+            encodings = available_encodings() if use_cache else (encoding,)
+            bodies = {each: _compress(response.content, each, stored=use_cache) for each in encodings}
+            if use_cache:
+                try:
+                    cache.set_many(
+                        {response_cache_key(name, request, each, params): body for each, body in bodies.items()},
+                        timeout,
+                    )
+                except Exception as e:
+                    logger.warning(f"Response cache write failed for {name}: {e}")
+
+            compressed = _body_response(bodies[encoding], response['Content-Type'], encoding)
+            for header, value in response.items():
+                if header.lower() not in ('content-type', 'content-length', 'content-encoding', 'vary'):
+                    compressed[header] = value
+            if use_cache:
+                compressed['X-Response-Cache'] = 'MISS'
+            return compressed
+        return wrapper
+    return decorator
@@ -0,0 +1,28 @@
+"""
+View-level read-intent marker for the read replica (checker.db_router).
+
+Put @read_replica on read-only endpoints - search, GeoJSON, lists, API - so
+their queries can be served by the replica. Writes they make still go to
+the primary, and later reads in the same request follow them there.
+"""
+from functools import wraps
+
+from ..db_router import read_intent
+
+
+def _streamed_with_read_intent(content):
+    # Streaming bodies run their queries after the view has returned
+    with read_intent():
+        yield from content
+
+
+def read_replica(view_func):
+    """Run the view (and any streamed body) with read intent"""
+    @wraps(view_func)
+    def wrapper(request, *args, **kwargs):
+        with read_intent():
+            response = view_func(request, *args, **kwargs)
+        if getattr(response, 'streaming', False):
+            response.streaming_content = _streamed_with_read_intent(response.streaming_content)
+        return response
+    return wrapper
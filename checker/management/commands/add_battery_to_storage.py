@@ -4,6 +4,7 @@ Management command to add Battery technology to all storage-related technologies
 from django.core.management.base import BaseCommand
 from django.db.models import Q
 from checker.models import LocationGroup
+from checker.services.map_points import build_map_points
 from collections import defaultdict
 
 
@@ -61,6 +62,7 @@ class Command(BaseCommand):
         
         self.stdout.write(f"🔍 Processing {target_qs.count()} LocationGroups with storage technologies...")
         
+        updated_locations = []
         for location_group in target_qs:
             # Check if already has Battery technology
             has_battery = 'Battery' in location_group.technologies
@@ -79,6 +81,7 @@ class Command(BaseCommand):
                     location_group.technologies = technologies
                     location_group.save(update_fields=['technologies'])
                     results['updated'] += 1
+                    updated_locations.append(location_group.location)
                 
                 # Track by storage type
                 for tech in storage_techs:
@@ -95,6 +98,10 @@ class Command(BaseCommand):
                 
             results['processed'] += 1
         
+        if updated_locations:
+            # Map filtering reads tech_mask/primary_* from LocationMapPoint, not the group
+            self.stdout.write(f"🗺️  Refreshed {build_map_points(updated_locations)} map points")
+
         # Summary
         self.stdout.write("="*60)
         self.stdout.write(f"📊 Summary:")
@@ -4,6 +4,7 @@ Management command to add EV Charging technology to records with EV charging des
 from django.core.management.base import BaseCommand
 from django.db.models import Q
 from checker.models import LocationGroup
+from checker.services.map_points import build_map_points
 from collections import defaultdict
 
 
@@ -68,6 +69,7 @@ class Command(BaseCommand):
         total_count = target_qs.count()
         self.stdout.write(f"🔍 Processing {total_count} LocationGroups with EV charging patterns...")
         
+        updated_locations = []
         for location_group in target_qs:
             # Check if already has EV Charging technology
             has_ev_charging = 'EV Charging' in location_group.technologies
@@ -90,6 +92,7 @@ class Command(BaseCommand):
                     location_group.technologies = technologies
                     location_group.save(update_fields=['technologies'])
                     results['updated'] += 1
+                    updated_locations.append(location_group.location)
                 
                 # Track by pattern and company
                 for pattern in matched_patterns:
@@ -111,6 +114,10 @@ class Command(BaseCommand):
                 
             results['processed'] += 1
         
+        if updated_locations:
+            # Map filtering reads tech_mask/primary_* from LocationMapPoint, not the group
+            self.stdout.write(f"🗺️  Refreshed {build_map_points(updated_locations)} map points")
+
         # Summary
         self.stdout.write("="*60)
         self.stdout.write(f"📊 Summary:")
@@ -0,0 +1,55 @@
+"""
+Archive historical components: flag components for delivery years before the
+cutoff so Component.objects.hot() leaves them out. History pages still show
+them.
+
+Run after each year's register rolls over (the cutoff defaults to
+ACTIVE_DELIVERY_YEAR).
+
+Usage:
+    python manage.py archive_components --dry-run
+    python manage.py archive_components
+    python manage.py archive_components --before 2025
+    python manage.py archive_components --restore
+    python manage.py archive_components --restore --since 2023
+"""
+import time
+from django.core.management.base import BaseCommand
+
+from checker.models import ACTIVE_DELIVERY_YEAR, Component
+from checker.services.component_archive import archive_candidates, archive_components, restore_components
+
+
+class Command(BaseCommand):
+    help = 'Move historical components out of the hot search set (or restore them)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--before', type=int, default=ACTIVE_DELIVERY_YEAR, help='Archive delivery years before this one')
+        parser.add_argument('--dry-run', action='store_true', help='Report what would be archived without changing anything')
+        parser.add_argument('--restore', action='store_true', help='Move archived components back into the hot set')
+        parser.add_argument('--since', type=int, help='With --restore: only restore delivery years from this one on')
+        parser.add_argument('--batch-size', type=int, default=2000, help='Components per transaction')
+
+    def handle(self, *args, **options):
+        start_time = time.time()
+
+        if options['restore']:
+            self.stdout.write('♻️ Restoring archived components...')
+            restored = restore_components(options['since'], batch_size=options['batch_size'])
+            self.stdout.write(self.style.SUCCESS(
+                f"✅ Restored {restored} components in {time.time() - start_time:.1f}s"
+            ))
+            return
+
+        candidates = archive_candidates(options['before'])
+        if options['dry_run']:
+            self.stdout.write(f"🔍 {candidates.count()} components before {options['before']} would be archived")
+            self.stdout.write(f"   {Component.objects.archived().count()} already archived, {Component.objects.hot().count()} in the hot set")
+            return
+
+        self.stdout.write(f"🗄️ Archiving components before {options['before']}...")
+        archived = archive_components(options['before'], batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(
+            f"✅ Archived {archived} components in {time.time() - start_time:.1f}s "
+            f"({Component.objects.hot().count()} left in the hot set)"
+        ))
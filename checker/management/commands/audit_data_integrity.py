@@ -18,7 +18,7 @@ class Command(BaseCommand):
         suspicious_cmu_ids = ['hull road', 'church road', 'TS16', 'lime', 'Drax']
         
         for cmu_id in suspicious_cmu_ids:
-            components = Component.objects.filter(cmu_id=cmu_id)[:10]
+            components = Component.objects.filter(cmu_id=cmu_id).select_related('raw_payload')[:10]
             
             for comp in components:
                 if comp.additional_data and comp.additional_data.get('CMU ID'):
@@ -0,0 +1,142 @@
+import io
+import tempfile
+import time
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test.utils import override_settings
+
+from checker.services.neso_api_standin import (
+    NesoApiStandIn,
+    load_recorded_dataset,
+    synthetic_dataset,
+)
+
+WRITE_PREFIXES = ('INSERT', 'UPDATE', 'DELETE')
+
+
+class QueryTimer:
+    """connection.execute_wrapper hook that splits DB time into reads and writes"""
+
+    def __init__(self):
+        self.read_time = 0.0
+        self.write_time = 0.0
+        self.reads = 0
+        self.writes = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            elapsed = time.perf_counter() - start
+            if sql.lstrip().upper().startswith(WRITE_PREFIXES):
+                self.write_time += elapsed
+                self.writes += 1
+            else:
+                self.read_time += elapsed
+                self.reads += 1
+
+
+class Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = 'Benchmark crawl_to_database against a local NESO API stand-in (no network needed)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--cmus', type=int, default=200, help='Synthetic CMU records to serve (default: 200)')
+        parser.add_argument('--components-per-cmu', type=int, default=5, help='Synthetic components per CMU (default: 5)')
+        parser.add_argument('--recorded', type=str, help='Serve a recorded {"cmus": [...], "components": [...]} JSON file instead')
+        parser.add_argument('--latency-ms', type=float, default=0, help='Added latency per request in ms (default: 0)')
+        parser.add_argument('--error-rate', type=float, default=0.0, help='Fraction of requests answered with HTTP 500 (default: 0)')
+        parser.add_argument('--page-size', type=int, help='Cap on records per page, like the real datastore limit')
+        parser.add_argument('--batch-size', type=int, default=100, help='crawl_to_database --batch-size (default: 100)')
+        parser.add_argument('--component-sample', type=int, default=20,
+                            help='CMUs re-crawled one at a time with --cmu to time the component crawler (default: 20)')
+        parser.add_argument('--seed', type=int, default=42, help='Random seed for data and error injection')
+        parser.add_argument('--keep', action='store_true', help='Keep crawled rows instead of rolling back')
+
+    def handle(self, *args, **options):
+        if options['recorded']:
+            dataset = load_recorded_dataset(options['recorded'])
+        else:
+            dataset = synthetic_dataset(options['cmus'], options['components_per_cmu'], seed=options['seed'])
+        if not dataset['cmus']:
+            raise CommandError("Dataset has no CMU records")
+
+        self.stdout.write(
+            f"Serving {len(dataset['cmus'])} CMUs / {len(dataset['components'])} components "
+            f"(latency {options['latency_ms']}ms, error rate {options['error_rate']:.1%}, "
+            f"page size {options['page_size'] or 'unlimited'})"
+        )
+
+        standin = NesoApiStandIn(
+            dataset,
+            latency_ms=options['latency_ms'],
+            error_rate=options['error_rate'],
+            page_size=options['page_size'],
+            seed=options['seed'],
+        )
+
+        results = []
+        with standin, override_settings(NESO_API_URL=standin.datastore_url), \
+                tempfile.TemporaryDirectory() as checkpoint_dir:
+            try:
+                with transaction.atomic():
+                    results.append(self.run_phase(
+                        'crawl_to_database (full crawl)', standin,
+                        batch_size=options['batch_size'], sleep=0, force=True, checkpoint_dir=checkpoint_dir,
+                    ))
+                    sample = [c['CMU ID'] for c in dataset['cmus'][:options['component_sample']]]
+                    if sample:
+                        results.append(self.run_phase(
+                            f'crawl_to_database --cmu (x{len(sample)})', standin,
+                            cmu_ids=sample, sleep=0, force=True, checkpoint_dir=checkpoint_dir,
+                        ))
+                    if not options['keep']:
+                        raise Rollback()
+            except Rollback:
+                self.stdout.write("Rolled back benchmark rows")
+
+        for result in results:
+            self.report(result)
+
+    def run_phase(self, name, standin, cmu_ids=None, **crawl_options):
+        requests_before = standin.stats['requests']
+        records_before = standin.stats['records_served']
+        errors_before = standin.stats['errors_injected']
+        timer = QueryTimer()
+
+        start = time.perf_counter()
+        with connection.execute_wrapper(timer):
+            for cmu_id in (cmu_ids if cmu_ids is not None else [None]):
+                call_command(
+                    'crawl_to_database',
+                    cmu=cmu_id,
+                    stdout=io.StringIO(),
+                    stderr=io.StringIO(),
+                    **crawl_options
+                )
+        elapsed = time.perf_counter() - start
+
+        return {
+            'name': name,
+            'elapsed': elapsed,
+            'requests': standin.stats['requests'] - requests_before,
+            'records': standin.stats['records_served'] - records_before,
+            'errors': standin.stats['errors_injected'] - errors_before,
+            'timer': timer,
+        }
+
+    def report(self, result):
+        elapsed = result['elapsed'] or 1e-9
+        timer = result['timer']
+        self.stdout.write(self.style.SUCCESS(f"\n{result['name']}"))
+        self.stdout.write(f"  Wall time:     {result['elapsed']:.2f}s")
+        self.stdout.write(f"  Records:       {result['records']} ({result['records'] / elapsed:.1f} records/s)")
+        self.stdout.write(f"  Requests:      {result['requests']} ({result['requests'] / elapsed:.1f} requests/s)")
+        self.stdout.write(f"  Injected errs: {result['errors']}")
+        self.stdout.write(f"  DB writes:     {timer.writes} queries, {timer.write_time:.2f}s")
+        self.stdout.write(f"  DB reads:      {timer.reads} queries, {timer.read_time:.2f}s")
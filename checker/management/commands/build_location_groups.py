@@ -1,10 +1,213 @@
 from django.core.management.base import BaseCommand
-from django.db import models, transaction
-from django.db.models import Count, Sum, Min, Max, Q
-from checker.models import Component, LocationGroup
+from django.db import connections, models, transaction
+from django.db.models import Count, Sum, Min, Max, Q, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+from checker.models import ACTIVE_DELIVERY_YEAR, Component, LocationGroup, auction_sort_key
+from checker.services.cmu_summary import build_cmu_summaries
+from checker.services.map_points import build_map_points
 from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor, as_completed
 import json
 import time
+import zlib
+
+# Fields written by the bulk upsert used in parallel mode
+UPSERT_FIELDS = [
+    'component_count',
+    'displayed_capacity_mw',
+    'normalized_capacity_mw',
+    'capacity_confidence',
+    'capacity_source',
+    'auction_years',
+    'technologies',
+    'companies',
+    'descriptions',
+    'cmu_ids',
+    'is_active',
+    'latest_delivery_year',
+    'representative_component',
+    'latitude',
+    'longitude',
+    'county',
+    'outward_code',
+    'full_postcode',
+    'business_name',
+    'business_type',
+    'major_retailers',
+    'updated_at',
+]
+
+
+def valid_locations_queryset():
+    """Distinct component locations that should get a LocationGroup"""
+    return Component.objects.exclude(
+        Q(location__isnull=True) |
+        Q(location='') |
+        Q(location='None') |
+        Q(location='N/A') |
+        Q(location='NA') |
+        Q(location__icontains='TBC') |
+        Q(location__icontains='to be confirmed')
+    ).values_list('location', flat=True).distinct()
+
+
+def link_components(locations=None):
+    """
+    Point Component.location_group at the group for its location string, in one
+    correlated UPDATE (NULL where the location has no group). Returns rows updated.
+    """
+    components = Component.objects.all()
+    if locations is not None:
+        components = components.filter(location__in=locations)
+    return components.update(location_group=Subquery(
+        LocationGroup.objects.filter(location=OuterRef('location')).values('pk')[:1]
+    ))
+
+
+def count_colocations():
+    """
+    Set LocationGroup.colocation_count to the number of groups sharing its
+    full_postcode, in one correlated UPDATE (0 without a postcode). Returns rows updated.
+    """
+    return LocationGroup.objects.update(colocation_count=Coalesce(Subquery(
+        LocationGroup.objects.filter(full_postcode=OuterRef('full_postcode'))
+        .values('full_postcode').annotate(n=Count('pk')).values('n')[:1]
+    ), 0))
+
+
+def business_fields(component):
+    """LocationGroup business badge values copied from its representative component"""
+    if component is None:
+        return {'business_name': None, 'business_type': None, 'major_retailers': []}
+    return {
+        'business_name': component.places_api_business_name,
+        'business_type': component.places_api_business_type,
+        'major_retailers': component.places_api_major_retailers or [],
+    }
+
+
+def partition_locations(locations, workers):
+    """
+    Split locations into `workers` buckets by a stable hash.
+    crc32 is used instead of hash() because string hashing is randomised per process.
+    """
+    partitions = [[] for _ in range(workers)]
+    for location in locations:
+        partitions[zlib.crc32(location.encode('utf-8')) % workers].append(location)
+    return [p for p in partitions if p]
+
+
+def aggregate_location(location):
+    """Aggregate all components at a location into LocationGroup field values (no writes)"""
+    # Get all components at this location
+    components = Component.objects.filter(location=location)
+    
+    if not components.exists():
+        return None
+    
+    # Aggregate data
+    component_count = components.count()
+    
+    # Get unique descriptions - ONLY STORE FIRST 3 FOR DISPLAY
+    descriptions = list(components.values_list('description', flat=True).distinct())
+    descriptions = [d for d in descriptions if d]  # Remove None/empty
+    descriptions = descriptions[:3]  # Only store what's displayed in template
+    
+    # Count by technology
+    tech_counts = components.values('technology').annotate(
+        count=Count('id')
+    ).order_by('-count')
+    technologies = {t['technology']: t['count'] for t in tech_counts if t['technology']}
+    
+    # Count by company
+    company_counts = components.values('company_name').annotate(
+        count=Count('id')
+    ).order_by('-count')
+    companies = {c['company_name']: c['count'] for c in company_counts if c['company_name']}
+    
+    # Get unique auction years - ONLY STORE FIRST 5 FOR EGRESS REDUCTION
+    auction_years = list(components.values_list('auction_name', flat=True).distinct())
+    auction_years = [a for a in auction_years if a]
+    # Sort auction years descending (newest first)
+    auction_years.sort(key=auction_sort_key, reverse=True)
+    auction_years = auction_years[:5]  # Only store 5 most recent (template shows 3)
+    
+    # Get unique CMU IDs - STORE ALL FOR FULL SEARCHABILITY
+    all_cmu_ids = list(set(components.values_list('cmu_id', flat=True)))
+    all_cmu_ids = [c for c in all_cmu_ids if c]
+    all_cmu_ids.sort()  # Sort alphabetically
+    
+    # Store as list (was dict with samples, but that made most CMUs unsearchable)
+    cmu_ids = all_cmu_ids
+    
+    # Calculate capacity
+    total_capacity = components.aggregate(Sum('derated_capacity_mw'))['derated_capacity_mw__sum'] or 0.0
+    
+    # For now, displayed = normalized. We'll handle aggregation later
+    displayed_capacity = total_capacity
+    normalized_capacity = total_capacity
+    
+    # Determine capacity confidence
+    components_with_capacity = components.filter(derated_capacity_mw__isnull=False).count()
+    if components_with_capacity == 0:
+        capacity_confidence = 'none'
+    elif components_with_capacity == component_count:
+        capacity_confidence = 'high'
+    elif components_with_capacity >= component_count * 0.5:
+        capacity_confidence = 'medium'
+    else:
+        capacity_confidence = 'low'
+    
+    # Determine active status - True if any component delivers in 2024-25 or later
+    latest_delivery_year = components.aggregate(Max('delivery_year_start'))['delivery_year_start__max']
+    is_active = latest_delivery_year is not None and latest_delivery_year >= ACTIVE_DELIVERY_YEAR
+    
+    # Get representative component (one with most data)
+    rep_component = components.exclude(
+        Q(latitude__isnull=True) | Q(longitude__isnull=True)
+    ).first() or components.first()
+
+    return {
+        'component_count': component_count,
+        'displayed_capacity_mw': displayed_capacity,
+        'normalized_capacity_mw': normalized_capacity,
+        'capacity_confidence': capacity_confidence,
+        'capacity_source': 'derated_capacity_mw',
+        'auction_years': auction_years,
+        'technologies': technologies,
+        'companies': companies,
+        'descriptions': descriptions,
+        'cmu_ids': cmu_ids,
+        'is_active': is_active,
+        'latest_delivery_year': latest_delivery_year,
+        'representative_component_id': rep_component.id if rep_component else None,
+        'latitude': rep_component.latitude if rep_component else None,
+        'longitude': rep_component.longitude if rep_component else None,
+        'county': rep_component.county if rep_component else None,
+        'outward_code': rep_component.outward_code if rep_component else None,
+        'full_postcode': rep_component.full_postcode if rep_component else None,
+        **business_fields(rep_component),
+    }
+
+
+def _init_worker():
+    """Give each worker process its own database connection"""
+    import django
+    django.setup()
+    # Forked workers inherit the parent's connection objects - never share sockets
+    connections.close_all()
+
+
+def aggregate_partition(locations):
+    """Worker entry point: aggregate one partition and return plain dicts for the parent to upsert"""
+    results = []
+    for location in locations:
+        defaults = aggregate_location(location)
+        if defaults is not None:
+            results.append((location, defaults))
+    connections.close_all()
+    return results
+
 
 class Command(BaseCommand):
     help = 'Build LocationGroup records from existing components'
@@ -25,6 +228,12 @@ class Command(BaseCommand):
             type=int,
             help='Limit number of locations to process',
         )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=1,
+            help='Aggregate hash partitions of locations in N worker processes (default: 1, serial)',
+        )
 
     def handle(self, *args, **options):
         start_time = time.time()
@@ -36,20 +245,15 @@ class Command(BaseCommand):
         if options['test']:
             # Test mode - process only one location
             self.process_single_location(options['test'])
+            link_components([options['test']])
+            count_colocations()
+            build_map_points([options['test']])
             return
         
         self.stdout.write("Building LocationGroup records...")
         
         # Get all unique locations with valid data
-        locations = list(Component.objects.exclude(
-            Q(location__isnull=True) |
-            Q(location='') |
-            Q(location='None') |
-            Q(location='N/A') |
-            Q(location='NA') |
-            Q(location__icontains='TBC') |
-            Q(location__icontains='to be confirmed')
-        ).values_list('location', flat=True).distinct())
+        locations = list(valid_locations_queryset())
         
         # Apply limit if specified
         if options.get('limit'):
@@ -61,6 +265,15 @@ class Command(BaseCommand):
         created_count = 0
         updated_count = 0
         
+        if options['workers'] > 1:
+            created_count, updated_count = self.build_parallel(locations, options['workers'])
+            self.report(start_time, created_count, updated_count)
+            self.link_components()
+            self.count_colocations()
+            self.build_map_points()
+            self.summarise_cmus(options)
+            return
+        
         # Process in batches
         batch_size = 100
         for i in range(0, total_locations, batch_size):
@@ -77,6 +290,71 @@ class Command(BaseCommand):
                     if (created_count + updated_count) % 10 == 0:
                         self.stdout.write(f"Processed {created_count + updated_count}/{total_locations} locations...")
         
+        self.report(start_time, created_count, updated_count)
+        self.link_components()
+        self.count_colocations()
+        self.build_map_points()
+        self.summarise_cmus(options)
+
+    def build_parallel(self, locations, workers):
+        """Aggregate hash partitions in worker processes and merge them with bulk upserts"""
+        # Several partitions per worker keeps cores busy when partitions are uneven
+        partitions = partition_locations(locations, workers * 4)
+        existing = set(LocationGroup.objects.values_list('location', flat=True))
+        self.stdout.write(f"Aggregating {len(partitions)} partitions across {workers} workers...")
+        
+        # Close the parent's connections so forked workers don't inherit open sockets
+        connections.close_all()
+        
+        created_count = 0
+        updated_count = 0
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as executor:
+            futures = [executor.submit(aggregate_partition, partition) for partition in partitions]
+            for future in as_completed(futures):
+                rows = future.result()
+                groups = [LocationGroup(location=location, **defaults) for location, defaults in rows]
+                with transaction.atomic():
+                    LocationGroup.objects.bulk_create(
+                        groups,
+                        batch_size=500,
+                        update_conflicts=True,
+                        unique_fields=['location'],
+                        update_fields=UPSERT_FIELDS,
+                    )
+                for location, _ in rows:
+                    if location in existing:
+                        updated_count += 1
+                    else:
+                        created_count += 1
+                self.stdout.write(f"Merged partition: {len(rows)} locations ({created_count + updated_count}/{len(locations)})")
+        
+        return created_count, updated_count
+
+    def link_components(self):
+        start_time = time.time()
+        linked = link_components()
+        self.stdout.write(f"Updated LocationGroup links on {linked} components in {time.time() - start_time:.2f}s")
+
+    def count_colocations(self):
+        start_time = time.time()
+        counted = count_colocations()
+        self.stdout.write(f"Updated postcode co-location counts on {counted} LocationGroups in {time.time() - start_time:.2f}s")
+
+    def build_map_points(self):
+        start_time = time.time()
+        built = build_map_points()
+        self.stdout.write(f"Built {built} map points in {time.time() - start_time:.2f}s")
+
+    def summarise_cmus(self, options):
+        """Rebuild CMUSummary rows - only after a full build, since they span every location"""
+        if options.get('limit'):
+            return
+        start_time = time.time()
+        self.stdout.write("Building CMU summaries...")
+        count = build_cmu_summaries()
+        self.stdout.write(self.style.SUCCESS(f"Built {count} CMU summaries in {time.time() - start_time:.2f}s"))
+
+    def report(self, start_time, created_count, updated_count):
         elapsed = time.time() - start_time
         self.stdout.write(
             self.style.SUCCESS(
@@ -107,98 +385,14 @@ class Command(BaseCommand):
 
     def process_location(self, location):
         """Process a single location and create/update LocationGroup"""
-        # Get all components at this location
-        components = Component.objects.filter(location=location)
-        
-        if not components.exists():
+        defaults = aggregate_location(location)
+        if defaults is None:
             return None
-        
-        # Aggregate data
-        component_count = components.count()
-        
-        # Get unique descriptions - ONLY STORE FIRST 3 FOR DISPLAY
-        descriptions = list(components.values_list('description', flat=True).distinct())
-        descriptions = [d for d in descriptions if d]  # Remove None/empty
-        descriptions = descriptions[:3]  # Only store what's displayed in template
-        
-        # Count by technology
-        tech_counts = components.values('technology').annotate(
-            count=Count('id')
-        ).order_by('-count')
-        technologies = {t['technology']: t['count'] for t in tech_counts if t['technology']}
-        
-        # Count by company
-        company_counts = components.values('company_name').annotate(
-            count=Count('id')
-        ).order_by('-count')
-        companies = {c['company_name']: c['count'] for c in company_counts if c['company_name']}
-        
-        # Get unique auction years - ONLY STORE FIRST 5 FOR EGRESS REDUCTION
-        auction_years = list(components.values_list('auction_name', flat=True).distinct())
-        auction_years = [a for a in auction_years if a]
-        # Sort auction years descending (newest first)
-        auction_years.sort(reverse=True)
-        auction_years = auction_years[:5]  # Only store 5 most recent (template shows 3)
-        
-        # Get unique CMU IDs - STORE ALL FOR FULL SEARCHABILITY
-        all_cmu_ids = list(set(components.values_list('cmu_id', flat=True)))
-        all_cmu_ids = [c for c in all_cmu_ids if c]
-        all_cmu_ids.sort()  # Sort alphabetically
-        
-        # Store as list (was dict with samples, but that made most CMUs unsearchable)
-        cmu_ids = all_cmu_ids
-        
-        # Calculate capacity
-        total_capacity = components.aggregate(Sum('derated_capacity_mw'))['derated_capacity_mw__sum'] or 0.0
-        
-        # For now, displayed = normalized. We'll handle aggregation later
-        displayed_capacity = total_capacity
-        normalized_capacity = total_capacity
-        
-        # Determine capacity confidence
-        components_with_capacity = components.filter(derated_capacity_mw__isnull=False).count()
-        if components_with_capacity == 0:
-            capacity_confidence = 'none'
-        elif components_with_capacity == component_count:
-            capacity_confidence = 'high'
-        elif components_with_capacity >= component_count * 0.5:
-            capacity_confidence = 'medium'
-        else:
-            capacity_confidence = 'low'
-        
-        # Determine active status - True if any component has auction year 2024-25 or later
-        is_active = False
-        for auction_year in auction_years:
-            if auction_year and any(year in auction_year for year in ['2024-25', '2025-26', '2026-27', '2027-28', '2028-29', '2029-30']):
-                is_active = True
-                break
-        
-        # Get representative component (one with most data)
-        rep_component = components.exclude(
-            Q(latitude__isnull=True) | Q(longitude__isnull=True)
-        ).first() or components.first()
-        
+
         # Create or update LocationGroup
         location_group, created = LocationGroup.objects.update_or_create(
             location=location,
-            defaults={
-                'component_count': component_count,
-                'displayed_capacity_mw': displayed_capacity,
-                'normalized_capacity_mw': normalized_capacity,
-                'capacity_confidence': capacity_confidence,
-                'capacity_source': 'derated_capacity_mw',
-                'auction_years': auction_years,
-                'technologies': technologies,
-                'companies': companies,
-                'descriptions': descriptions,
-                'cmu_ids': cmu_ids,
-                'is_active': is_active,  # ADD THIS!
-                'representative_component': rep_component,
-                'latitude': rep_component.latitude if rep_component else None,
-                'longitude': rep_component.longitude if rep_component else None,
-                'county': rep_component.county if rep_component else None,
-                'outward_code': rep_component.outward_code if rep_component else None,
-            }
+            defaults=defaults,
         )
         
         return 'created' if created else 'updated'
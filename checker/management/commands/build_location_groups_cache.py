@@ -8,7 +8,7 @@ from django.core.management.base import BaseCommand
 from django.core.cache import cache
 from django.db.models import F
 
-from checker.models import Component
+from checker.models import Component, RawPayload
 # from checker.utils import normalize_location # Ideal: Move normalize_location here
 # For now, we'll define normalize_location and is_auction_year_active locally
 
@@ -107,7 +107,7 @@ class Command(BaseCommand):
         # to optimize memory usage and speed.
         components_qs = Component.objects.all().values(
             'id', 'location', 'description', 'cmu_id', 'auction_name', 'delivery_year',
-            'company_name', 'technology', 'status', 'type', 'component_id', 'additional_data', 'derated_capacity_mw'
+            'company_name', 'technology', 'status', 'type', 'component_id', 'raw_payload_id', 'derated_capacity_mw'
         ).order_by('id')  # Consistent order for processing
 
         total_components = components_qs.count()
@@ -125,6 +125,7 @@ class Command(BaseCommand):
             
             # Get components for this batch
             batch_components = list(components_qs[i:batch_end])
+            records = RawPayload.objects.records(comp_dict['raw_payload_id'] for comp_dict in batch_components)
 
             for comp_dict in batch_components:
                 # Create component dict with defaults for missing values
@@ -140,7 +141,7 @@ class Command(BaseCommand):
                     'status': comp_dict['status'] or '',
                     'type': comp_dict['type'] or '',
                     'component_id_str': comp_dict['component_id'] or '',
-                    'additional_data': comp_dict['additional_data'] or {},
+                    'additional_data': records.get(comp_dict['raw_payload_id'], {}),
                     'derated_capacity_mw': comp_dict['derated_capacity_mw']
                 }
 
@@ -1,7 +1,9 @@
 from django.core.management.base import BaseCommand
 from django.db import models, transaction
 from django.db.models import Count, Sum, Min, Max, Q
-from checker.models import Component, LocationGroup
+from checker.models import ACTIVE_DELIVERY_YEAR, Component, LocationGroup, auction_sort_key
+from checker.management.commands.build_location_groups import business_fields, count_colocations, link_components
+from checker.services.map_points import build_map_points
 import time
 
 class Command(BaseCommand):
@@ -65,6 +67,10 @@ class Command(BaseCommand):
                     if created_count % 10 == 0:
                         self.stdout.write(f"Created {created_count} LocationGroups...")
         
+        link_components(locations_to_process)
+        count_colocations()
+        build_map_points(locations_to_process)
+        
         # Final statistics
         new_total = LocationGroup.objects.count()
         total_components_covered = sum(LocationGroup.objects.values_list('component_count', flat=True))
@@ -120,26 +126,11 @@ class Command(BaseCommand):
         # Get unique auction years
         auction_years = list(components.values_list('auction_name', flat=True).distinct())
         auction_years = [a for a in auction_years if a]
-        auction_years.sort(reverse=True)  # Newest first
-        
-        # Determine if active (any auction year >= 2024-25)
-        is_active = False
-        for year_str in auction_years:
-            import re
-            # Match auction year format like "2024-25" and extract the first year
-            match = re.search(r'(\d{4})-(\d{2})', str(year_str))
-            if match:
-                first_year = int(match.group(1))
-                # Active if 2024-25 or later (first year >= 2024)
-                if first_year >= 2024:
-                    is_active = True
-                    break
-            else:
-                # Fallback for simple year format
-                simple_match = re.search(r'(\d{4})', str(year_str))
-                if simple_match and int(simple_match.group(1)) >= 2024:
-                    is_active = True
-                    break
+        auction_years.sort(key=auction_sort_key, reverse=True)  # Newest first
+        
+        # Determine if active (any delivery year >= 2024-25)
+        latest_delivery_year = components.aggregate(Max('delivery_year_start'))['delivery_year_start__max']
+        is_active = latest_delivery_year is not None and latest_delivery_year >= ACTIVE_DELIVERY_YEAR
         
         # Get unique CMU IDs
         cmu_ids = list(set(components.values_list('cmu_id', flat=True)))
@@ -169,11 +160,14 @@ class Command(BaseCommand):
                 capacity_confidence='low' if total_capacity == 0 else 'medium',
                 capacity_source='derated_capacity_mw',
                 is_active=is_active,
+                latest_delivery_year=latest_delivery_year,
                 representative_component=rep_component,
                 latitude=rep_component.latitude if rep_component else None,
                 longitude=rep_component.longitude if rep_component else None,
                 county=rep_component.county if rep_component else None,
                 outward_code=rep_component.outward_code if rep_component else None,
+                full_postcode=rep_component.full_postcode if rep_component else None,
+                **business_fields(rep_component),
             )
             return True
         except Exception as e:
@@ -0,0 +1,31 @@
+"""
+Rebuild the narrow LocationMapPoint rows the map endpoints filter on.
+
+build_location_groups (and the incremental build) already does this after
+each run; use this after changing LocationGroup coordinates or technologies
+outside a build, or once after migrating to create the first points.
+
+Usage:
+    python manage.py build_map_points
+    python manage.py build_map_points --location "Example Site"
+"""
+import time
+from django.core.management.base import BaseCommand
+
+from checker.services.map_points import build_map_points
+
+
+class Command(BaseCommand):
+    help = 'Rebuild LocationMapPoint rows from geocoded LocationGroups'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--location', action='append', help='Only rebuild the point for this location (repeatable)')
+
+    def handle(self, *args, **options):
+        start_time = time.time()
+        self.stdout.write('🗺️ Building map points...')
+
+        built = build_map_points(options['location'])
+
+        elapsed = time.time() - start_time
+        self.stdout.write(self.style.SUCCESS(f"✅ Built {built} map points in {elapsed:.1f}s"))
@@ -0,0 +1,70 @@
+import os
+import time
+from django.core.management.base import BaseCommand, CommandError
+
+from checker.services.postcode_centroids import (
+    build_centroid_table,
+    get_table_path,
+    PostcodeCentroidTable,
+)
+
+
+class Command(BaseCommand):
+    help = 'Build the memory-mapped postcode centroid table used for offline geocoding'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'csv_path',
+            type=str,
+            help='ONS-style postcode CSV (e.g. ONSPD or NSPL export)',
+        )
+        parser.add_argument(
+            '--output',
+            type=str,
+            help='Where to write the table (default: settings.POSTCODE_CENTROID_TABLE or checker/data/postcodes/)',
+        )
+        parser.add_argument('--postcode-column', type=str, default='pcds', help='Postcode column (default: pcds)')
+        parser.add_argument('--lat-column', type=str, default='lat', help='Latitude column (default: lat)')
+        parser.add_argument('--lng-column', type=str, default='long', help='Longitude column (default: long)')
+        parser.add_argument('--county-column', type=str, default='county', help='County column (default: county)')
+        parser.add_argument(
+            '--test-postcode',
+            type=str,
+            help='Look up a postcode in the finished table',
+        )
+
+    def handle(self, *args, **options):
+        csv_path = options['csv_path']
+        if not os.path.exists(csv_path):
+            raise CommandError(f"CSV not found: {csv_path}")
+
+        out_path = options.get('output') or get_table_path()
+        start_time = time.time()
+
+        self.stdout.write(f"Building postcode centroid table from {csv_path}...")
+        count = build_centroid_table(
+            csv_path,
+            out_path,
+            postcode_column=options['postcode_column'],
+            lat_column=options['lat_column'],
+            lng_column=options['lng_column'],
+            county_column=options['county_column'],
+        )
+
+        elapsed = time.time() - start_time
+        size_mb = os.path.getsize(out_path) / (1024 * 1024)
+        self.stdout.write(self.style.SUCCESS(
+            f"Wrote {count} postcodes to {out_path} ({size_mb:.1f} MB) in {elapsed:.2f}s"
+        ))
+
+        if options.get('test_postcode'):
+            table = PostcodeCentroidTable(out_path)
+            try:
+                result = table.lookup(options['test_postcode'])
+            finally:
+                table.close()
+            if result:
+                self.stdout.write(f"  {result['postcode']}: {result['latitude']:.6f}, {result['longitude']:.6f} "
+                                  f"({result['outward_code']}, {result['county'] or 'no county'})")
+            else:
+                self.stdout.write(self.style.WARNING(f"  {options['test_postcode']} not found"))
@@ -0,0 +1,71 @@
+"""
+Start a new dataset generation, pre-warm its caches, then activate it.
+
+Every data-derived cache key carries the generation, so activating a new one
+invalidates all of them at once - without a cold-cache window, because the
+heavy caches were already built for it. Replaces clearing map/DSR/search caches
+by hand after a data change.
+
+Usage:
+    python manage.py bump_dataset_generation
+    python manage.py bump_dataset_generation --skip-warm
+    python manage.py bump_dataset_generation --show
+"""
+import time
+from django.core.management import call_command
+from django.core.management.base import BaseCommand
+
+from checker.db_router import wait_for_replica
+from checker.models import DatasetGeneration
+from checker.services.dataset_generation import (
+    activate_generation,
+    begin_generation,
+    current_generation,
+    warming,
+)
+
+# Caches built for the new generation before it goes live
+WARM_STEPS = [
+    ("Refreshing statistics rollups", 'refresh_statistics_rollups'),
+    ("Rebuilding statistics cache", 'build_statistics_cache'),
+    ("Building CMU dataframe, search dictionary and company index", 'warm_heavy_caches'),
+    ("Warming search cache", 'warm_search_cache'),
+    ("Warming static page cache", 'warm_static_cache'),
+    ("Warming most requested URLs", 'warm_from_traffic'),
+    ("Pre-rendering detail pages", 'prerender_pages'),
+]
+
+
+class Command(BaseCommand):
+    help = 'Create, pre-warm and activate a new dataset generation for cache keys'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--skip-warm', action='store_true', help='Activate without pre-warming (first requests build caches)')
+        parser.add_argument('--note', type=str, default='', help='Note stored with the generation')
+        parser.add_argument('--show', action='store_true', help='Show recent generations and exit')
+
+    def handle(self, *args, **options):
+        if options['show']:
+            self.stdout.write(f"Active generation: {current_generation()}")
+            for generation in DatasetGeneration.objects.order_by('-number')[:10]:
+                self.stdout.write(f"  {generation}{' - ' + generation.note if generation.note else ''}")
+            return
+
+        previous = current_generation()
+        generation = begin_generation(note=options['note'])
+        self.stdout.write(f"🔢 Dataset generation {previous} -> {generation}")
+
+        if not options['skip_warm']:
+            with warming(generation):
+                for label, command in WARM_STEPS:
+                    self.stdout.write(f"\n▶ {label} ({command}) for generation {generation}...")
+                    step_start = time.time()
+                    call_command(command, stdout=self.stdout, stderr=self.stderr)
+                    self.stdout.write(f"  done in {time.time() - step_start:.1f}s")
+
+        # Live requests read from the replica; let it catch up with the rebuild before they cache anything
+        if not wait_for_replica():
+            self.stdout.write(self.style.WARNING("⚠️ Read replica is still behind the primary - activating anyway"))
+
+        activate_generation(generation)
+        self.stdout.write(self.style.SUCCESS(f"✅ Generation {generation} is live"))
@@ -16,7 +16,8 @@ from django.core.management.base import BaseCommand
 from django.core.management import call_command
 from django.core.mail import send_mail
 from django.conf import settings
-from checker.models import Component
+from checker.models import Component, DatasetSnapshot
+from checker.services.dataset_freshness import check_freshness, record_snapshots
 
 class Command(BaseCommand):
     help = 'Check for new CMU/component data without crawling'
@@ -30,10 +31,22 @@ class Command(BaseCommand):
                           help='Automatically run update pipeline if needed (DANGEROUS)')
         parser.add_argument('--dry-run', action='store_true',
                           help='Show what would be done without taking action')
+        parser.add_argument('--skip-probe', action='store_true',
+                          help='Always compare counts, even if the freshness probe reports no change')
 
     def handle(self, *args, **options):
         self.stdout.write(self.style.SUCCESS('=== CMR Data Freshness Check ==='))
         
+        # Cheap probe first - skip the count comparisons when nothing changed since the last pipeline run
+        probes = {}
+        if not options['skip_probe']:
+            crawl_needed, reasons, probes = check_freshness()
+            if not crawl_needed:
+                self.stdout.write(self.style.SUCCESS('✅ Data is up to date (dataset unchanged since last pipeline run)'))
+                return
+            for reason in reasons:
+                self.stdout.write(f"🔍 {reason}")
+        
         # Get current status
         status = self.check_data_status()
         
@@ -57,6 +70,11 @@ class Command(BaseCommand):
                 
         else:
             self.stdout.write(self.style.SUCCESS('✅ Data is up to date'))
+            # Without any snapshot the probe can never report "unchanged"; once the counts
+            # agree, take this probe as the baseline (later changes still need the pipeline)
+            if probes and not options['dry_run'] and not DatasetSnapshot.objects.exists():
+                record_snapshots(probes)
+                self.stdout.write('📋 Recorded first dataset snapshot as the freshness baseline')
             
         # Return exit code for scripts
         return 1 if new_cmus > options['threshold'] else 0
@@ -68,6 +68,19 @@ class Command(BaseCommand):
         for pattern, count in sorted(patterns.items(), key=lambda x: x[1], reverse=True)[:10]:
             self.stdout.write(f"  {pattern}: {count} keys")
         
+        # Per key family accounting from the cache backend
+        if hasattr(cache, 'namespace_stats'):
+            self.stdout.write(self.style.WARNING("\nKEY FAMILIES (today):"))
+            namespace_stats = cache.namespace_stats()
+            for prefix, row in sorted(namespace_stats.items(), key=lambda x: x[1]['live_bytes'], reverse=True):
+                hit_rate = f"{row['hit_rate']}%" if row['hit_rate'] is not None else 'N/A'
+                budget = f" / budget {row['budget'] / 1024:.0f}KB" if row['budget'] else ''
+                self.stdout.write(
+                    f"  {prefix}: {row['live_bytes'] / 1024:.0f}KB live in {row['live_keys']} keys{budget}, "
+                    f"hit rate {hit_rate} ({row['hits']:,} hits, {row['misses']:,} misses), "
+                    f"{row['bytes_read'] / 1024:.0f}KB read, {row['bytes_written'] / 1024:.0f}KB written"
+                )
+        
         # Check for large keys
         self.stdout.write(self.style.WARNING("\nLARGEST KEYS:"))
         large_keys = []
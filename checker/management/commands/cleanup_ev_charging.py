@@ -5,6 +5,7 @@ Management command to remove EV Charging technology from records that only have
 from django.core.management.base import BaseCommand
 from django.db.models import Q
 from checker.models import LocationGroup
+from checker.services.map_points import build_map_points
 from collections import defaultdict
 
 
@@ -44,6 +45,7 @@ class Command(BaseCommand):
         total_count = target_qs.count()
         self.stdout.write(f"🔍 Processing {total_count} LocationGroups with EV Charging technology...")
         
+        updated_locations = []
         for location_group in target_qs:
             all_descriptions = ' '.join(location_group.descriptions).lower()
             
@@ -66,6 +68,7 @@ class Command(BaseCommand):
                         location_group.technologies = technologies
                         location_group.save(update_fields=['technologies'])
                         results['updated'] += 1
+                        updated_locations.append(location_group.location)
                 
                 # Show the change
                 self.stdout.write(f"❌ REMOVING EV Charging from: {location_group.location[:50]}")
@@ -87,6 +90,10 @@ class Command(BaseCommand):
             results['by_company'][company_name] += 1
             results['processed'] += 1
         
+        if updated_locations:
+            # Map filtering reads tech_mask/primary_* from LocationMapPoint, not the group
+            self.stdout.write(f"🗺️  Refreshed {build_map_points(updated_locations)} map points")
+
         # Summary
         self.stdout.write("="*60)
         self.stdout.write(f"📊 Summary:")
@@ -8,6 +8,8 @@ from django.db import transaction
 from django.conf import settings
 from checker.models import Component
 from checker.models import CMURegistry
+from checker.models import RawPayload
+from checker.services.neso_api import get_api_url, CMU_RESOURCE_ID, COMPONENT_RESOURCE_ID
 
 class Command(BaseCommand):
     help = 'Crawl component data directly into the database with resume capabilities'
@@ -21,6 +23,7 @@ class Command(BaseCommand):
         parser.add_argument('--force', action='store_true', help='Process all CMUs even if they already have components')
         parser.add_argument('--company', type=str, help='Process only CMUs for this company')
         parser.add_argument('--sleep', type=float, default=1.0, help='Sleep time between batches to avoid rate limiting')
+        parser.add_argument('--checkpoint-dir', type=str, help='Directory for the resume checkpoint (default: BASE_DIR/checkpoints)')
 
     def handle(self, *args, **options):
         # Start the crawl
@@ -38,7 +41,7 @@ class Command(BaseCommand):
         self.sleep_time = options['sleep']
         
         # Setup checkpoint directory
-        self.checkpoint_dir = os.path.join(settings.BASE_DIR, 'checkpoints')
+        self.checkpoint_dir = options.get('checkpoint_dir') or os.path.join(settings.BASE_DIR, 'checkpoints')
         os.makedirs(self.checkpoint_dir, exist_ok=True)
         self.checkpoint_file = os.path.join(self.checkpoint_dir, 'crawler_checkpoint.json')
         
@@ -51,6 +54,7 @@ class Command(BaseCommand):
             'cmu_ids_with_components': 0,
             'components_found': 0,
             'components_added': 0,
+            'components_updated': 0,
             'components_skipped': 0,
             'errors': 0,
             'total_cmus': total_cmus,
@@ -78,6 +82,7 @@ class Command(BaseCommand):
         self.stdout.write(f"  CMU IDs with components: {self.stats['cmu_ids_with_components']}")
         self.stdout.write(f"  Components found: {self.stats['components_found']}")
         self.stdout.write(f"  Components added to database: {self.stats['components_added']}")
+        self.stdout.write(f"  Components updated (record changed): {self.stats.get('components_updated', 0)}")
         self.stdout.write(f"  Components skipped: {self.stats.get('components_skipped', 0)}")
         self.stdout.write(f"  Errors encountered: {self.stats['errors']}")
     
@@ -124,8 +129,8 @@ class Command(BaseCommand):
     
     def get_total_cmus(self):
         """Get total number of CMUs available."""
-        cmu_api_url = "https://api.neso.energy/api/3/action/datastore_search"
-        cmu_resource_id = "25a5fa2e-873d-41c5-8aaf-fbc2b06d79e6"
+        cmu_api_url = get_api_url()
+        cmu_resource_id = CMU_RESOURCE_ID
         
         try:
             # Make a request with limit=0 to get total
@@ -153,8 +158,8 @@ class Command(BaseCommand):
     def crawl_all_cmus(self):
         """Crawl all CMU IDs from the API with a simple spinner animation."""
         # CMU API endpoint
-        cmu_api_url = "https://api.neso.energy/api/3/action/datastore_search"
-        cmu_resource_id = "25a5fa2e-873d-41c5-8aaf-fbc2b06d79e6"
+        cmu_api_url = get_api_url()
+        cmu_resource_id = CMU_RESOURCE_ID
         
         # Process CMUs in batches
         continue_crawl = True
@@ -281,6 +286,7 @@ class Command(BaseCommand):
         self.stdout.write(
             f"Final stats: {self.stats['components_found']} components found, "
             f"{self.stats['components_added']} added, "
+            f"{self.stats.get('components_updated', 0)} updated, "
             f"{self.stats.get('components_skipped', 0)} skipped, "
             f"{self.stats.get('errors', 0)} errors"
         )
@@ -292,8 +298,8 @@ class Command(BaseCommand):
     def crawl_single_cmu(self, cmu_id, cmu_record=None):
         """Crawl components for a single CMU ID (silent version)."""
         # Components API endpoint
-        component_api_url = "https://api.neso.energy/api/3/action/datastore_search"
-        component_resource_id = "790f5fa0-f8eb-4d82-b98d-0d34d3e404e8"
+        component_api_url = get_api_url()
+        component_resource_id = COMPONENT_RESOURCE_ID
         
         self.stats['cmu_ids_processed'] = self.stats.get('cmu_ids_processed', 0) + 1
         
@@ -337,18 +343,27 @@ class Command(BaseCommand):
             self.stats['errors'] = self.stats.get('errors', 0) + 1
             
     def save_components_to_db(self, cmu_id, component_records, company_name):
-        """Save component records to the database (silent version)."""
+        """
+        Save component records to the database (silent version).
+        Components already in the database are updated only when their raw
+        record changed (RawPayload digest differs), otherwise skipped.
+        """
+        ids = [component.get("_id") for component in component_records if component.get("_id")]
+        existing = {c.component_id: c for c in Component.objects.filter(component_id__in=ids)}
+
         # Use a transaction for better performance and atomicity
         with transaction.atomic():
             components_added = 0
+            components_updated = 0
             components_skipped = 0
             
             for component in component_records:
                 # Get component ID if available
                 component_id = component.get("_id", "")
                 
-                # Skip if we already have this component in the database
-                if component_id and Component.objects.filter(component_id=component_id).exists():
+                # Skip components we already have with exactly this record
+                current = existing.get(component_id) if component_id else None
+                if current is not None and current.raw_payload_id == RawPayload.for_record(component).digest:
                     components_skipped += 1
                     continue
                 
@@ -377,10 +392,7 @@ class Command(BaseCommand):
                             pass # Keep as None if conversion fails
                     # --- End calculation ---
                     
-                    # Create new component in database
-                    Component.objects.create(
-                        component_id=component_id,
-                        cmu_id=cmu_id,
+                    fields = dict(
                         location=location,
                         description=description,
                         technology=technology,
@@ -392,11 +404,21 @@ class Command(BaseCommand):
                         additional_data=component,  # Store all data as JSON
                         derated_capacity_mw=derated_capacity_mw # Set the new field
                     )
-                    components_added += 1
+                    if current is not None:
+                        # The record changed upstream - apply the edit in place (the CMU it belongs to stays)
+                        for name, value in fields.items():
+                            setattr(current, name, value)
+                        current.save()
+                        components_updated += 1
+                    else:
+                        # Create new component in database
+                        Component.objects.create(component_id=component_id, cmu_id=cmu_id, **fields)
+                        components_added += 1
                     
                 except Exception as e:
                     self.stats['errors'] = self.stats.get('errors', 0) + 1
             
             # Update global statistics safely
             self.stats['components_added'] = self.stats.get('components_added', 0) + components_added
+            self.stats['components_updated'] = self.stats.get('components_updated', 0) + components_updated
             self.stats['components_skipped'] = self.stats.get('components_skipped', 0) + components_skipped
\ No newline at end of file
@@ -53,8 +53,8 @@ class Command(BaseCommand):
         
         # Priority cleanup order (least important first)
         cleanup_patterns = [
-            # 1. Old GeoJSON cache (shortest TTL, most numerous)
-            ('geojson_static:*', 'GeoJSON cache entries'),
+            # 1. Old GeoJSON cache (shortest TTL, most numerous) - stored as :1:g<gen>:response_body:...
+            ('*response_body:*', 'Compressed GeoJSON/API responses'),
             # 2. Map data cache (medium importance)
             ('map_data_*', 'Map data cache'),
             # 3. Map cluster cache 
@@ -111,6 +111,11 @@ class Command(BaseCommand):
                         self.stdout.write(self.style.SUCCESS("Memory usage reduced sufficiently"))
                         break
 
+        # Keys deleted behind the cache's back still count against its namespace budgets
+        if not options['dry_run'] and hasattr(cache, 'reconcile_namespace'):
+            released = cache.reconcile_namespace('response_body:')
+            self.stdout.write(f"Released {released} tracked bytes from response_body:")
+
         if options['dry_run']:
             self.stdout.write(self.style.WARNING(f"DRY RUN: Would have deleted {total_deleted} cache entries"))
         else:
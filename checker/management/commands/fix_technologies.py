@@ -4,6 +4,7 @@ Management command to fix Unknown/empty technologies and enhance DSR with specif
 from django.core.management.base import BaseCommand
 from django.db.models import Q
 from checker.models import LocationGroup
+from checker.services.map_points import build_map_points
 from collections import defaultdict
 import re
 
@@ -113,6 +114,7 @@ class Command(BaseCommand):
         
         self.stdout.write(f"🔍 Processing {target_qs.count()} LocationGroups...")
         
+        updated_locations = []
         for location_group in target_qs:
             detection_result = self.detect_technology(location_group, tech_patterns)
             
@@ -122,6 +124,7 @@ class Command(BaseCommand):
                 if not options['dry_run']:
                     self.update_location_group(location_group, detection_result)
                     results['updated'] += 1
+                    updated_locations.append(location_group.location)
                     
                     # Track type of update
                     if not location_group.technologies:  # Was empty
@@ -141,6 +144,10 @@ class Command(BaseCommand):
                 
             results['processed'] += 1
         
+        if updated_locations:
+            # Map filtering reads tech_mask/primary_* from LocationMapPoint, not the group
+            self.stdout.write(f"🗺️  Refreshed {build_map_points(updated_locations)} map points")
+
         # Summary
         self.stdout.write("="*60)
         self.stdout.write(f"📊 Summary:")
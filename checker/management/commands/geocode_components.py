@@ -1,8 +1,7 @@
 from django.core.management.base import BaseCommand
-import requests
-import time
 from django.conf import settings
 from checker.models import Component
+from checker.services.geocode_cache import normalize_address, resolve_addresses
 
 class Command(BaseCommand):
     help = 'Geocode component locations using Google Maps API'
@@ -13,7 +12,7 @@ class Command(BaseCommand):
         parser.add_argument('--force', action='store_true', 
                           help='Re-geocode already processed locations')
         parser.add_argument('--batch', type=int, default=50, 
-                          help='Batch size for status updates (default: 50)')
+                          help='Components per lookup/write batch (default: 50)')
         parser.add_argument(
             '--exclude-companies',
             nargs='+',  # Allows specifying multiple company names
@@ -54,57 +53,60 @@ class Command(BaseCommand):
         processed = 0
         success = 0
         errors = 0
+        totals = {'cache': 0, 'offline': 0, 'google': 0, 'failed': 0}
         
-        for idx, component in enumerate(query, 1):
-            if not component.location:
-                self.stdout.write(f'Skipping component {component.id}: No location data')
-                component.geocoded = True  # Mark as processed even though we can't geocode it
-                component.save(update_fields=['geocoded'])
-                processed += 1
-                continue
-
-            # Use the location field directly as the address string
-            address_string = component.location
-
-            try:
-                # Log the address being used BEFORE the API call
-                self.stdout.write(self.style.NOTICE(f"  -> Geocoding address: '{address_string}'"))
-
-                # Call Google Geocoding API using the constructed address_string
-                response = requests.get(
-                    'https://maps.googleapis.com/maps/api/geocode/json',
-                    params={
-                        'address': address_string, # USE THE CONSTRUCTED STRING
-                        'key': api_key,
-                        'region': 'uk'  # Focus on UK
-                    }
-                )
-                
-                data = response.json()
-                
-                if data['status'] == 'OK' and data['results']:
-                    location = data['results'][0]['geometry']['location']
-                    component.latitude = location['lat']
-                    component.longitude = location['lng']
+        components = list(query)
+        for start in range(0, len(components), batch_size):
+            batch = components[start:start + batch_size]
+            
+            # Group the batch by normalized address so each distinct address is looked up once
+            addresses = {}
+            for component in batch:
+                normalized = normalize_address(component.location)
+                if normalized:
+                    addresses.setdefault(normalized, component.location)
+            
+            results, stats = resolve_addresses(addresses, api_key=api_key)
+            for key, value in stats.items():
+                totals[key] += value
+            
+            to_update = []
+            for component in batch:
+                normalized = normalize_address(component.location)
+                if not normalized:
+                    self.stdout.write(f'Skipping component {component.id}: No location data')
+                    component.geocoded = True  # Mark as processed even though we can't geocode it
+                    to_update.append(component)
+                elif normalized in results:
+                    result = results[normalized]
+                    component.latitude = result['latitude']
+                    component.longitude = result['longitude']
+                    # Fill blank location fields from the postcode centroid, never overwrite them
+                    component.full_postcode = component.full_postcode or result.get('postcode')
+                    component.outward_code = component.outward_code or result.get('outward_code')
+                    component.county = component.county or result.get('county')
                     component.geocoded = True
-                    component.save()
+                    to_update.append(component)
                     success += 1
-                    
-                    if idx % batch_size == 0:
-                        self.stdout.write(f'Progress: {idx}/{total} components processed')
                 else:
-                    self.stdout.write(f'Error geocoding {component.location}: {data.get("status", "Unknown error")}')
                     errors += 1
-                
-                # Sleep to avoid hitting API rate limits
-                time.sleep(0.2)
-                
-            except Exception as e:
-                self.stderr.write(f'Error processing component {component.id}: {str(e)}')
-                errors += 1
-                
-            processed += 1
+                processed += 1
+            
+            # One write round trip per batch
+            if to_update:
+                Component.objects.bulk_update(
+                    to_update,
+                    ['latitude', 'longitude', 'full_postcode', 'outward_code', 'county', 'geocoded'],
+                    batch_size=len(to_update),
+                )
+            
+            self.stdout.write(
+                f'Progress: {processed}/{total} components, {len(addresses)} distinct addresses '
+                f'(cache {stats["cache"]}, offline {stats["offline"]}, google {stats["google"]})'
+            )
                 
         self.stdout.write(self.style.SUCCESS(
-            f'Geocoding completed: {processed} processed, {success} successful, {errors} errors'
-        )) 
\ No newline at end of file
+            f'Geocoding completed: {processed} processed, {success} successful, {errors} errors\n'
+            f'Lookups: {totals["cache"]} cached, {totals["offline"]} offline postcode table, '
+            f'{totals["google"]} Google API calls'
+        ))
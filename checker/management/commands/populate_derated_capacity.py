@@ -18,7 +18,9 @@ class Command(BaseCommand):
         batch_size = 500 # Process in batches to manage memory
 
         # Use iterator to process components in batches
-        component_iterator = Component.objects.only('id', 'additional_data').iterator(chunk_size=batch_size)
+        component_iterator = Component.objects.select_related('raw_payload').only(
+            'id', 'derated_capacity_mw', 'raw_payload'
+        ).iterator(chunk_size=batch_size)
 
         components_to_update = []
 
@@ -2,6 +2,7 @@ import re
 import logging
 from django.core.management.base import BaseCommand
 from checker.models import Component
+from checker.services.postcode_centroids import geocode_location
 
 logger = logging.getLogger(__name__)
 
@@ -56,11 +57,18 @@ class Command(BaseCommand):
         for component in components_query.iterator():
             location = component.location or ""
             
+            # Offline postcode table confirms the postcode really exists
+            centroid = geocode_location(location)
+            
             # Extract full postcode using regex
-            postcode_match = re.search(postcode_pattern, location, re.IGNORECASE)
+            postcode_match = None if centroid else re.search(postcode_pattern, location, re.IGNORECASE)
             full_postcode = None
             
-            if postcode_match:
+            if centroid:
+                component.full_postcode = centroid['postcode']
+                updates_to_make.append(component)
+                updated += 1
+            elif postcode_match:
                 # Get the full postcode and normalize it
                 full_postcode = postcode_match.group(1).strip().upper()
                 
@@ -2,6 +2,7 @@ import re
 import logging
 from django.core.management.base import BaseCommand
 from checker.models import Component
+from checker.services.postcode_centroids import geocode_location
 
 logger = logging.getLogger(__name__)
 
@@ -80,10 +81,15 @@ class Command(BaseCommand):
         for component in components_query.iterator():
             location = component.location or ""
             
+            # Offline postcode table gives an exact outward code and county when the postcode is known
+            centroid = geocode_location(location)
+            
             # Extract postcode using regex
             postcode_match = re.search(postcode_pattern, location, re.IGNORECASE)
             outward_code = None
-            if postcode_match:
+            if centroid:
+                outward_code = centroid['outward_code']
+            elif postcode_match:
                 postcode = postcode_match.group(0).strip().upper()
                 # Extract outward code (first part of postcode)
                 if ' ' in postcode:
@@ -100,9 +106,9 @@ class Command(BaseCommand):
                         outward_code = postcode[:min(3, len(postcode))]
             
             # Extract county by looking for county names in the location
-            county = None
+            county = centroid['county'] if centroid else None
             location_upper = location.upper()
-            for potential_county in uk_counties:
+            for potential_county in ([] if county else uk_counties):
                 if potential_county.upper() in location_upper:
                     county = potential_county
                     break
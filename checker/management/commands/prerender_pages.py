@@ -0,0 +1,96 @@
+"""
+Pre-render every location, company, technology and CMU page for anonymous visitors.
+
+Pages are rendered through the normal view stack in worker processes, gzipped
+and upserted into PrerenderedPage for the generation being warmed (or the live
+one), where PrerenderedPageMiddleware serves them without touching the view.
+Run by bump_dataset_generation inside warming(); run it on its own after a
+deploy, since rows are only served for the release they were rendered with.
+
+Usage:
+    python manage.py prerender_pages
+    python manage.py prerender_pages --workers 8
+    python manage.py prerender_pages --kinds company technology
+"""
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+from checker.services.dataset_generation import current_generation
+from checker.services.page_prerender import (
+    PAGE_KINDS,
+    page_paths,
+    prune_pages,
+    render_pages,
+    render_partition,
+    store_pages,
+)
+
+
+def _init_worker():
+    """Give each worker process its own database connection"""
+    import django
+    django.setup()
+    connections.close_all()
+
+
+class Command(BaseCommand):
+    help = 'Pre-render location, company, technology and CMU pages to compressed HTML'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--kinds', nargs='+', choices=PAGE_KINDS, default=list(PAGE_KINDS), help='Page kinds to render (default: all)')
+        parser.add_argument('--workers', type=int, default=4, help='Render in N worker processes (default: 4, 1 = serial)')
+        parser.add_argument('--batch-size', type=int, default=200, help='Pages per worker task (default: 200)')
+        parser.add_argument('--limit', type=int, help='Render at most N pages per kind')
+
+    def handle(self, *args, **options):
+        start_time = time.time()
+        # Inside bump_dataset_generation this is the generation being warmed
+        generation = current_generation()
+
+        paths = []
+        for kind, kind_paths in page_paths(options['kinds']).items():
+            if options['limit']:
+                kind_paths = kind_paths[:options['limit']]
+            self.stdout.write(f"  {kind}: {len(kind_paths)} pages")
+            paths.extend(kind_paths)
+
+        self.stdout.write(f"🖨️ Pre-rendering {len(paths)} pages for generation {generation} with {options['workers']} workers...")
+        batch_size = options['batch_size']
+        batches = [paths[i:i + batch_size] for i in range(0, len(paths), batch_size)]
+        stored = 0
+        failed = []
+
+        if options['workers'] > 1:
+            # Close the parent's connections so forked workers don't inherit open sockets
+            connections.close_all()
+            with ProcessPoolExecutor(max_workers=options['workers'], initializer=_init_worker) as executor:
+                futures = [executor.submit(render_partition, batch, generation) for batch in batches]
+                for future in as_completed(futures):
+                    rendered, batch_failed = future.result()
+                    store_pages(rendered, generation)
+                    stored += len(rendered)
+                    failed.extend(batch_failed)
+                    self.stdout.write(f"Stored {stored}/{len(paths)} pages...")
+        else:
+            for batch in batches:
+                rendered, batch_failed = render_pages(batch, generation)
+                store_pages(rendered, generation)
+                stored += len(rendered)
+                failed.extend(batch_failed)
+                self.stdout.write(f"Stored {stored}/{len(paths)} pages...")
+
+        for path in failed[:20]:
+            self.stdout.write(self.style.WARNING(f"  not rendered: {path}"))
+
+        # Only a complete run knows which pages no longer exist
+        if set(options['kinds']) == set(PAGE_KINDS) and not options['limit']:
+            pruned = prune_pages(generation)
+            if pruned:
+                self.stdout.write(f"🗑️ Removed {pruned} pages that were not re-rendered")
+
+        elapsed = time.time() - start_time
+        self.stdout.write(self.style.SUCCESS(
+            f"✅ Pre-rendered {stored} pages in {elapsed:.1f}s ({len(failed)} not rendered)"
+        ))
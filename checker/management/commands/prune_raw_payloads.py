@@ -0,0 +1,35 @@
+"""
+Delete raw payloads that no Component or CMURegistry row uses any more -
+records replaced by a re-crawl or belonging to deleted rows.
+
+Run after a crawl finishes, not during one: a crawl stores a payload just
+before saving the row that points at it.
+
+Usage:
+    python manage.py prune_raw_payloads --dry-run
+    python manage.py prune_raw_payloads
+"""
+import time
+from django.core.management.base import BaseCommand
+
+from checker.models import RawPayload
+
+
+class Command(BaseCommand):
+    help = 'Delete RawPayload rows no component or CMU registry entry references'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dry-run', action='store_true', help='Only count unreferenced payloads')
+
+    def handle(self, *args, **options):
+        start_time = time.time()
+        unreferenced = RawPayload.objects.unreferenced()
+
+        if options['dry_run']:
+            self.stdout.write(f"🔍 {unreferenced.count()} of {RawPayload.objects.count()} raw payloads are unreferenced")
+            return
+
+        deleted, _ = unreferenced.delete()
+        self.stdout.write(self.style.SUCCESS(
+            f"✅ Deleted {deleted} unreferenced raw payloads in {time.time() - start_time:.1f}s"
+        ))
@@ -0,0 +1,34 @@
+"""
+Recompute the statistics rollups (counts and capacity per company, technology,
+delivery year and auction) for the current dataset generation.
+
+Run by bump_dataset_generation inside warming(), before the statistics cache
+is rebuilt from the new rows.
+
+Usage:
+    python manage.py refresh_statistics_rollups
+"""
+import time
+from django.core.management.base import BaseCommand
+
+from checker.models import StatisticsRollup
+from checker.services.statistics_rollups import refresh_rollups
+
+
+class Command(BaseCommand):
+    help = 'Recompute statistics rollup rows for the current dataset generation'
+
+    def handle(self, *args, **options):
+        start_time = time.time()
+        self.stdout.write('📊 Refreshing statistics rollups...')
+
+        generation = refresh_rollups()
+
+        rows = StatisticsRollup.objects.filter(generation=generation)
+        for dimension in StatisticsRollup.DIMENSIONS:
+            self.stdout.write(f"  {dimension}: {rows.filter(dimension=dimension).count()} rows")
+
+        elapsed = time.time() - start_time
+        self.stdout.write(self.style.SUCCESS(
+            f"✅ Refreshed statistics rollups for generation {generation} in {elapsed:.1f}s"
+        ))
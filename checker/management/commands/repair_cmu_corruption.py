@@ -43,7 +43,7 @@ class Command(BaseCommand):
         self.stdout.write('-' * 40)
         
         for corrupted_cmu in corrupted_cmu_ids:
-            components = Component.objects.filter(cmu_id=corrupted_cmu)
+            components = Component.objects.filter(cmu_id=corrupted_cmu).select_related('raw_payload')
             
             for comp in components:
                 if comp.additional_data and comp.additional_data.get('CMU ID'):
@@ -0,0 +1,72 @@
+"""
+Scheduled data pipeline: crawl -> LocationGroup rebuild -> cache warm -> generation flip.
+
+A freshness probe runs first; when the NESO resources are unchanged since the
+last successful run the whole pipeline is skipped. Caches are warmed for a new
+dataset generation before it is activated, so no request sees a cold cache.
+
+Usage:
+    python manage.py run_data_pipeline
+    python manage.py run_data_pipeline --check-only
+    python manage.py run_data_pipeline --force --workers 4
+"""
+import time
+from django.core.management import call_command
+from django.core.management.base import BaseCommand
+
+from checker.services.dataset_freshness import check_freshness, record_snapshots
+
+
+class Command(BaseCommand):
+    help = 'Run the crawl/rebuild/cache-warm pipeline only when the NESO dataset has changed'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--force', action='store_true', help='Run the pipeline even if nothing changed')
+        parser.add_argument('--check-only', action='store_true', help='Only report whether a crawl is needed')
+        parser.add_argument('--workers', type=int, default=1, help='Worker processes for build_location_groups')
+        parser.add_argument('--crawl-sleep', type=float, default=1.0, help='crawl_to_database --sleep (default: 1.0)')
+        parser.add_argument('--skip-warm', action='store_true', help='Skip cache warming after the rebuild')
+
+    def handle(self, *args, **options):
+        start_time = time.time()
+
+        self.stdout.write("🔍 Probing NESO dataset freshness...")
+        crawl_needed, reasons, probes = check_freshness()
+
+        for name, probe in probes.items():
+            self.stdout.write(
+                f"  {name}: {probe['record_total']:,} records, modified {probe['last_modified'] or 'unknown'}"
+            )
+        for reason in reasons:
+            self.stdout.write(self.style.WARNING(f"  changed - {reason}"))
+
+        if not crawl_needed and not options['force']:
+            self.stdout.write(self.style.SUCCESS("✅ Dataset unchanged since last run - skipping crawl, rebuild and cache warm"))
+            return
+
+        if options['check_only']:
+            self.stdout.write(self.style.WARNING("🚨 Crawl needed"))
+            return
+
+        # The probe only says the dataset changed, not which CMUs, so re-crawl existing ones too;
+        # the crawl updates components whose record changed before the snapshot below marks them fresh
+        self.run_step("Crawling new data", 'crawl_to_database', force=True, sleep=options['crawl_sleep'])
+        self.run_step("Rebuilding LocationGroups", 'build_location_groups', workers=options['workers'])
+        self.run_step(
+            "Warming and activating new dataset generation", 'bump_dataset_generation',
+            skip_warm=options['skip_warm'], note='run_data_pipeline',
+        )
+
+        # Only a completed pipeline moves the baseline forward
+        if probes:
+            record_snapshots(probes)
+            self.stdout.write("📋 Recorded dataset snapshot")
+
+        elapsed = time.time() - start_time
+        self.stdout.write(self.style.SUCCESS(f"🎉 Pipeline completed in {elapsed:.1f}s"))
+
+    def run_step(self, label, command, **kwargs):
+        self.stdout.write(f"\n▶ {label} ({command})...")
+        step_start = time.time()
+        call_command(command, stdout=self.stdout, stderr=self.stderr, **kwargs)
+        self.stdout.write(f"  done in {time.time() - step_start:.1f}s")
@@ -7,7 +7,8 @@ import requests
 from django.core.management.base import BaseCommand
 from django.conf import settings
 from django.utils import timezone
-from checker.models import Component
+from checker.models import Component, LocationGroup
+from checker.management.commands.build_location_groups import business_fields
 from django.db.models import Q
 import re
 
@@ -280,6 +281,7 @@ class Command(BaseCommand):
                 rep_comp.places_api_confidence = business_info['confidence']
                 rep_comp.places_api_last_checked = timezone.now()
                 rep_comp.save()
+                LocationGroup.objects.filter(pk=location_group.pk).update(**business_fields(rep_comp))
                 
                 # Check for major retailers
                 retailer = self.identify_major_retailer(business_info['name'])
@@ -349,6 +351,7 @@ class Command(BaseCommand):
                 
                 rep_comp.places_api_last_checked = timezone.now()
                 rep_comp.save()
+                LocationGroup.objects.filter(pk=location_group.pk).update(**business_fields(rep_comp))
                 
             else:
                 # Still mark as checked
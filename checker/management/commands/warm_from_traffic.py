@@ -0,0 +1,70 @@
+"""
+Pre-build caches for the most requested search/map/list URLs.
+
+Replays the top-N request keys recorded by the traffic sketch through the
+normal view stack, so every cache those views use (search IDs, GeoJSON,
+filter options, static pages) is filled exactly as a real request would.
+Run by bump_dataset_generation inside warming(), i.e. before the flip.
+
+Usage:
+    python manage.py warm_from_traffic
+    python manage.py warm_from_traffic --top 50 --days 3
+    python manage.py warm_from_traffic --dry-run
+"""
+import time
+from django.core.management.base import BaseCommand
+from django.test import Client
+
+from checker.services.traffic_sketch import WARMER_USER_AGENT, top_requests
+
+
+class Command(BaseCommand):
+    help = 'Warm caches for the most requested search/map/list URLs recorded by the traffic sketch'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--top', type=int, default=200, help='Number of request keys to warm (default: 200)')
+        parser.add_argument('--days', type=int, default=7, help='Traffic window in days (default: 7)')
+        parser.add_argument('--dry-run', action='store_true', help='List the keys without requesting them')
+
+    def handle(self, *args, **options):
+        try:
+            requests = top_requests(options['top'], options['days'])
+        except Exception as e:
+            self.stdout.write(self.style.WARNING(f"⚠️ Traffic sketch unavailable ({e}) - nothing to warm"))
+            return
+
+        if not requests:
+            self.stdout.write("No recorded traffic yet - nothing to warm")
+            return
+
+        self.stdout.write(f"🔥 Warming top {len(requests)} request keys from the last {options['days']} days...")
+        if options['dry_run']:
+            for url, count in requests:
+                self.stdout.write(f"  {count:>7,}  {url}")
+            return
+
+        client = Client(HTTP_USER_AGENT=WARMER_USER_AGENT, HTTP_HOST='localhost')
+        start_time = time.time()
+        warmed = failed = 0
+
+        for url, count in requests:
+            request_start = time.time()
+            try:
+                response = client.get(url)
+                status = response.status_code
+            except Exception as e:
+                status = f"error: {e}"
+
+            elapsed = time.time() - request_start
+            if status == 200:
+                warmed += 1
+            else:
+                failed += 1
+                self.stdout.write(self.style.WARNING(f"  {url} -> {status}"))
+            if options['verbosity'] > 1:
+                self.stdout.write(f"  {count:>7,}  {url} ({elapsed:.2f}s)")
+
+        elapsed = time.time() - start_time
+        self.stdout.write(self.style.SUCCESS(
+            f"✅ Warmed {warmed} URLs in {elapsed:.1f}s ({failed} failed)"
+        ))
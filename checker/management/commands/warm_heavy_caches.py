@@ -0,0 +1,54 @@
+"""
+Build the heavy single-flight cache entries - the CMU dataframe, the search
+dictionary and the company index - for the current dataset generation.
+
+Run by bump_dataset_generation inside warming(), so a generation flip doesn't
+leave the first requests after activation to build them.
+
+Usage:
+    python manage.py warm_heavy_caches
+"""
+import time
+from django.core.management.base import BaseCommand
+
+from checker.services.company_index import get_company_index
+from checker.services.data_access import get_cmu_dataframe
+from checker.services.search_suggestions import get_search_dictionary
+
+
+class Command(BaseCommand):
+    help = 'Build the CMU dataframe, search dictionary and company index cache entries'
+
+    def handle(self, *args, **options):
+        start_time = time.time()
+
+        # A failed build only means the first request builds it, so it never blocks activation
+        for label, warm in (
+            ("CMU dataframe", self.warm_cmu_dataframe),
+            ("Search dictionary", self.warm_search_dictionary),
+            ("Company index", self.warm_company_index),
+        ):
+            step_start = time.time()
+            try:
+                self.stdout.write(f"  {label}: {warm()} in {time.time() - step_start:.1f}s")
+            except Exception as e:
+                self.stdout.write(self.style.WARNING(f"  ⚠️ {label} could not be built: {e}"))
+
+        self.stdout.write(self.style.SUCCESS(
+            f"✅ Warmed heavy caches in {time.time() - start_time:.1f}s"
+        ))
+
+    def warm_cmu_dataframe(self):
+        cmu_df, _ = get_cmu_dataframe(force_rebuild=True)
+        if cmu_df is None:
+            raise RuntimeError("no dataframe returned")
+        return f"{len(cmu_df):,} records"
+
+    def warm_search_dictionary(self):
+        return f"{len(get_search_dictionary(force=True)):,} terms"
+
+    def warm_company_index(self):
+        company_index, _, loaded = get_company_index()
+        if not loaded:
+            raise RuntimeError("index build failed (see log)")
+        return f"{len(company_index):,} companies"
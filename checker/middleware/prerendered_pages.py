@@ -0,0 +1,80 @@
+"""
+Serve pre-rendered detail pages to anonymous visitors.
+
+Answers GETs for location, company, technology and CMU pages from the gzipped
+HTML stored by `prerender_pages`, with the same ETag/Cache-Control the live
+views get from generation_etag. Anything without a current row (other
+generation or release, query strings, logged-in users, bots) goes to the view.
+Bots always reach the view so @bot_protected_view can rate-limit them and
+serve its lightweight responses. Sits after AccessControlMiddleware so its rules still apply first.
+"""
+import gzip
+import logging
+
+from django.conf import settings
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response, patch_cache_control, patch_vary_headers
+from django.utils.http import http_date
+from django.utils.regex_helper import _lazy_re_compile
+
+from ..bot_detection import is_bot_request
+from ..decorators.conditional import compute_etag
+from ..services.page_prerender import lookup
+from ..services.traffic_sketch import WARMER_USER_AGENT
+
+logger = logging.getLogger(__name__)
+
+PRERENDERED_PREFIXES = ('/location/', '/locations/', '/companies/', '/technologies/', '/cmus/')
+re_accepts_gzip = _lazy_re_compile(r"\bgzip\b")
+
+
+class PrerenderedPageMiddleware:
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.enabled = getattr(settings, 'PRERENDER_ENABLED', True)
+
+    def __call__(self, request):
+        if self.enabled and self._eligible(request):
+            try:
+                page = lookup(request.path)
+            except Exception as e:
+                logger.warning(f"Pre-rendered page lookup failed for {request.path}: {e}")
+                page = None
+            if page is not None:
+                return self._serve(request, *page)
+        return self.get_response(request)
+
+    def _eligible(self, request):
+        return (
+            request.method == 'GET'
+            and not request.META.get('QUERY_STRING')
+            and request.path.startswith(PRERENDERED_PREFIXES)
+            and not request.user.is_authenticated
+            # Pending flash messages have to be rendered by the view
+            and 'messages' not in request.COOKIES
+            and request.META.get('HTTP_USER_AGENT') != WARMER_USER_AGENT
+            # Bot rate limits and lightweight responses live on the views
+            and not is_bot_request(request)[0]
+        )
+
+    def _serve(self, request, body, rendered_at):
+        etag = compute_etag(request)
+        not_modified = get_conditional_response(request, etag=etag)
+        if not_modified is not None:
+            not_modified['ETag'] = etag
+            return not_modified
+
+        body = bytes(body)
+        response = HttpResponse(content_type='text/html; charset=utf-8')
+        if re_accepts_gzip.search(request.META.get('HTTP_ACCEPT_ENCODING', '')):
+            response['Content-Encoding'] = 'gzip'
+        else:
+            body = gzip.decompress(body)
+        response.content = body
+        response['Content-Length'] = str(len(body))
+        response['ETag'] = etag
+        response['Last-Modified'] = http_date(rendered_at.timestamp())
+        response['X-Prerendered'] = '1'
+        patch_vary_headers(response, ('Accept-Encoding', 'Cookie'))
+        patch_cache_control(response, no_cache=True)
+        return response
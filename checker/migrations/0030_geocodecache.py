@@ -0,0 +1,39 @@
+# Generated by Django 5.1.6 on 2026-10-19 03:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("checker", "0029_add_search_vector_index"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="GeocodeCache",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "normalized_address",
+                    models.CharField(db_index=True, max_length=255, unique=True),
+                ),
+                ("latitude", models.FloatField(blank=True, null=True)),
+                ("longitude", models.FloatField(blank=True, null=True)),
+                ("status", models.CharField(default="OK", max_length=20)),
+                ("source", models.CharField(default="google", max_length=20)),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                "verbose_name_plural": "Geocode cache",
+            },
+        ),
+    ]
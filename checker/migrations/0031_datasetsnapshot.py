@@ -0,0 +1,38 @@
+# Generated by Django 5.1.6 on 2026-10-19 03:04
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("checker", "0030_geocodecache"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="DatasetSnapshot",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("resource_id", models.CharField(max_length=100, unique=True)),
+                ("name", models.CharField(max_length=50)),
+                (
+                    "last_modified",
+                    models.CharField(blank=True, max_length=50, null=True),
+                ),
+                ("record_total", models.IntegerField(default=0)),
+                (
+                    "sample_checksum",
+                    models.CharField(blank=True, default="", max_length=64),
+                ),
+                ("recorded_at", models.DateTimeField(auto_now=True)),
+            ],
+        ),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 5.1.6 on 2026-10-19 03:18
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("checker", "0032_datasetgeneration"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="PrerenderedPage",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("path", models.CharField(max_length=500, unique=True)),
+                ("generation", models.PositiveIntegerField()),
+                ("release", models.CharField(blank=True, default="", max_length=100)),
+                ("body", models.BinaryField()),
+                ("rendered_at", models.DateTimeField()),
+            ],
+        ),
+    ]
@@ -0,0 +1,47 @@
+# Generated by Django 5.1.6 on 2026-10-19 03:27
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("checker", "0033_prerenderedpage"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="StatisticsRollup",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("generation", models.PositiveIntegerField()),
+                ("dimension", models.CharField(max_length=20)),
+                ("key", models.CharField(max_length=255)),
+                ("component_count", models.PositiveIntegerField(default=0)),
+                ("capacity_component_count", models.PositiveIntegerField(default=0)),
+                ("derated_capacity_mw", models.FloatField(default=0)),
+                ("cmu_count", models.PositiveIntegerField(default=0)),
+                ("location_count", models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                "indexes": [
+                    models.Index(
+                        fields=["generation", "dimension", "-component_count"],
+                        name="rollup_count_idx",
+                    ),
+                    models.Index(
+                        fields=["generation", "dimension", "-derated_capacity_mw"],
+                        name="rollup_capacity_idx",
+                    ),
+                ],
+                "unique_together": {("generation", "dimension", "key")},
+            },
+        ),
+    ]
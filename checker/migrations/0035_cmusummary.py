@@ -0,0 +1,42 @@
+# Generated by Django 5.1.6 on 2026-10-19 03:31
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("checker", "0034_statisticsrollup"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="CMUSummary",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("cmu_id", models.CharField(max_length=100, unique=True)),
+                (
+                    "company_name",
+                    models.CharField(blank=True, default="", max_length=255),
+                ),
+                ("location_count", models.PositiveIntegerField(default=0)),
+                ("component_count", models.PositiveIntegerField(default=0)),
+                ("total_capacity_mw", models.FloatField(default=0)),
+                ("derated_capacity_mw", models.FloatField(blank=True, null=True)),
+                ("delivery_years", models.JSONField(default=list)),
+                ("auction_names", models.JSONField(default=list)),
+                ("is_aggregated", models.BooleanField(default=False)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                "verbose_name_plural": "CMU summaries",
+            },
+        ),
+    ]
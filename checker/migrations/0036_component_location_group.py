@@ -0,0 +1,24 @@
+# Generated by Django 5.1.6 on 2026-10-19 03:33
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("checker", "0035_cmusummary"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="component",
+            name="location_group",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                related_name="components",
+                to="checker.locationgroup",
+            ),
+        ),
+    ]
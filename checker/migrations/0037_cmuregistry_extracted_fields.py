@@ -0,0 +1,83 @@
+# Generated by Django 5.1.6 on 2026-10-19 03:35
+
+from django.db import migrations, models
+
+
+def _parse_mw(value):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def populate_extracted_fields(apps, schema_editor):
+    """
+    Copy the displayed registry values out of raw_data for existing rows
+    (new rows get them from CMURegistry.save)
+    """
+    CMURegistry = apps.get_model('checker', 'CMURegistry')
+    batch = []
+    for registry in CMURegistry.objects.iterator(chunk_size=2000):
+        data = registry.raw_data if isinstance(registry.raw_data, dict) else {}
+        registry.derated_capacity_mw = _parse_mw(data.get("De-Rated Capacity"))
+        registry.anticipated_derated_capacity_mw = _parse_mw(data.get("Anticipated De-Rated Capacity"))
+        registry.connection_capacity_mw = _parse_mw(data.get("Connection / DSR Capacity"))
+        registry.parent_company = str(data.get("Parent Company") or '')[:255]
+        registry.trading_contact_email = str(data.get("Secondary Trading Contact - Email") or '')[:255]
+        registry.trading_contact_phone = str(data.get("Secondary Trading Contact - Telephone") or '')[:100]
+        batch.append(registry)
+        if len(batch) >= 2000:
+            CMURegistry.objects.bulk_update(batch, EXTRACTED_FIELDS)
+            batch = []
+    if batch:
+        CMURegistry.objects.bulk_update(batch, EXTRACTED_FIELDS)
+
+
+EXTRACTED_FIELDS = [
+    "derated_capacity_mw",
+    "anticipated_derated_capacity_mw",
+    "connection_capacity_mw",
+    "parent_company",
+    "trading_contact_email",
+    "trading_contact_phone",
+]
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("checker", "0036_component_location_group"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="cmuregistry",
+            name="anticipated_derated_capacity_mw",
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="cmuregistry",
+            name="connection_capacity_mw",
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="cmuregistry",
+            name="derated_capacity_mw",
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="cmuregistry",
+            name="parent_company",
+            field=models.CharField(blank=True, default="", max_length=255),
+        ),
+        migrations.AddField(
+            model_name="cmuregistry",
+            name="trading_contact_email",
+            field=models.CharField(blank=True, default="", max_length=255),
+        ),
+        migrations.AddField(
+            model_name="cmuregistry",
+            name="trading_contact_phone",
+            field=models.CharField(blank=True, default="", max_length=100),
+        ),
+        migrations.RunPython(populate_extracted_fields, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,73 @@
+# Generated by Django 5.1.6 on 2026-10-19 03:36
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def populate_postcode_business(apps, schema_editor):
+    """
+    Copy postcode and business badge data from each group's representative
+    component and count the groups at each postcode
+    """
+    Component = apps.get_model('checker', 'Component')
+    LocationGroup = apps.get_model('checker', 'LocationGroup')
+
+    def representative(field):
+        return Subquery(
+            Component.objects.filter(pk=OuterRef('representative_component_id')).values(field)[:1]
+        )
+
+    LocationGroup.objects.update(
+        full_postcode=representative('full_postcode'),
+        business_name=representative('places_api_business_name'),
+        business_type=representative('places_api_business_type'),
+    )
+    # JSON subquery values come back as text on some backends - copy retailers in Python
+    retailer_groups = []
+    for group in LocationGroup.objects.filter(
+        representative_component__places_api_business_name__isnull=False
+    ).select_related('representative_component').iterator(chunk_size=2000):
+        group.major_retailers = group.representative_component.places_api_major_retailers or []
+        retailer_groups.append(group)
+    LocationGroup.objects.bulk_update(retailer_groups, ['major_retailers'], batch_size=2000)
+
+    LocationGroup.objects.update(colocation_count=Coalesce(Subquery(
+        LocationGroup.objects.filter(full_postcode=OuterRef('full_postcode'))
+        .values('full_postcode').annotate(n=Count('pk')).values('n')[:1]
+    ), 0))
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("checker", "0037_cmuregistry_extracted_fields"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="locationgroup",
+            name="business_name",
+            field=models.CharField(blank=True, max_length=255, null=True),
+        ),
+        migrations.AddField(
+            model_name="locationgroup",
+            name="business_type",
+            field=models.CharField(blank=True, max_length=100, null=True),
+        ),
+        migrations.AddField(
+            model_name="locationgroup",
+            name="colocation_count",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="locationgroup",
+            name="full_postcode",
+            field=models.CharField(blank=True, db_index=True, max_length=10, null=True),
+        ),
+        migrations.AddField(
+            model_name="locationgroup",
+            name="major_retailers",
+            field=models.JSONField(blank=True, default=list),
+        ),
+        migrations.RunPython(populate_postcode_business, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,90 @@
+# Generated by Django 5.1.6 on 2026-10-19 03:39
+
+import re
+
+from django.db import migrations, models
+from django.db.models import Max, OuterRef, Subquery
+
+YEAR_RE = re.compile(r'(?<!\d)(\d{4})(?!\d)')
+
+
+def _parse_year(value):
+    match = YEAR_RE.search(str(value or ''))
+    return int(match.group(1)) if match else None
+
+
+def _auction_type(auction_name):
+    name = auction_name or ''
+    if 'T-1' in name or 'T1' in name:
+        return 'T-1'
+    if 'T-3' in name or 'T3' in name:
+        return 'T-3'
+    if 'T-4' in name or 'T4' in name:
+        return 'T-4'
+    if 'TR' in name or 'transitional' in name.lower():
+        return 'TR'
+    return ''
+
+
+def populate_auction_fields(apps, schema_editor):
+    """
+    Parse delivery_year_start and auction_type for existing components (new ones
+    get them on save) and each LocationGroup's latest delivery year
+    """
+    Component = apps.get_model('checker', 'Component')
+    batch = []
+    for component in Component.objects.only('id', 'delivery_year', 'auction_name').iterator(chunk_size=5000):
+        component.delivery_year_start = _parse_year(component.delivery_year) or _parse_year(component.auction_name)
+        component.auction_type = _auction_type(component.auction_name)
+        batch.append(component)
+        if len(batch) >= 5000:
+            Component.objects.bulk_update(batch, ['delivery_year_start', 'auction_type'])
+            batch = []
+    if batch:
+        Component.objects.bulk_update(batch, ['delivery_year_start', 'auction_type'])
+
+    LocationGroup = apps.get_model('checker', 'LocationGroup')
+    LocationGroup.objects.update(latest_delivery_year=Subquery(
+        Component.objects.filter(location=OuterRef('location'))
+        .values('location').annotate(latest=Max('delivery_year_start')).values('latest')[:1]
+    ))
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("checker", "0038_location_group_postcode_business"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="component",
+            name="auction_type",
+            field=models.CharField(
+                blank=True,
+                choices=[
+                    ("T-1", "T-1"),
+                    ("T-3", "T-3"),
+                    ("T-4", "T-4"),
+                    ("TR", "Transitional"),
+                ],
+                db_index=True,
+                default="",
+                max_length=4,
+            ),
+        ),
+        migrations.AddField(
+            model_name="component",
+            name="delivery_year_start",
+            field=models.PositiveSmallIntegerField(
+                blank=True, db_index=True, null=True
+            ),
+        ),
+        migrations.AddField(
+            model_name="locationgroup",
+            name="latest_delivery_year",
+            field=models.PositiveSmallIntegerField(
+                blank=True, db_index=True, null=True
+            ),
+        ),
+        migrations.RunPython(populate_auction_fields, migrations.RunPython.noop),
+    ]
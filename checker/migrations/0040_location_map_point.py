@@ -0,0 +1,55 @@
+# Generated by Django 5.1.6 on 2026-10-19 03:42
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("checker", "0039_component_delivery_year_start_auction_type"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="LocationMapPoint",
+            fields=[
+                (
+                    "location_group",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="map_point",
+                        serialize=False,
+                        to="checker.locationgroup",
+                    ),
+                ),
+                ("latitude", models.FloatField()),
+                ("longitude", models.FloatField()),
+                ("spatial_key", models.PositiveIntegerField(db_index=True)),
+                ("tech_mask", models.PositiveIntegerField(default=0)),
+                (
+                    "primary_technology",
+                    models.CharField(blank=True, default="", max_length=100),
+                ),
+                (
+                    "primary_company",
+                    models.CharField(blank=True, default="", max_length=255),
+                ),
+                ("capacity_mw", models.FloatField(default=0)),
+                ("component_count", models.PositiveIntegerField(default=0)),
+                ("is_active", models.BooleanField(default=False)),
+                ("is_residential", models.BooleanField(default=False)),
+            ],
+            options={
+                "indexes": [
+                    models.Index(
+                        fields=["latitude", "longitude"], name="map_point_spatial_idx"
+                    ),
+                    models.Index(
+                        fields=["is_active", "is_residential"],
+                        name="map_point_flags_idx",
+                    ),
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.1.6 on 2026-10-19 03:48
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("checker", "0040_location_map_point"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="component",
+            name="is_archived",
+            field=models.BooleanField(default=False),
+        ),
+    ]
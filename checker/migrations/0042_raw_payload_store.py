@@ -0,0 +1,149 @@
+# Generated by Django 5.1.6 on 2026-10-19 03:51
+
+import hashlib
+import json
+import zlib
+
+import django.db.models.deletion
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import migrations, models
+
+BATCH_SIZE = 2000
+VOLATILE_KEYS = ("rank",)
+
+
+def _payload(RawPayload, record):
+    record = {key: value for key, value in record.items() if key not in VOLATILE_KEYS}
+    text = json.dumps(record, cls=DjangoJSONEncoder, sort_keys=True, separators=(",", ":")).encode("utf-8")
+    return RawPayload(digest=hashlib.sha256(text).hexdigest(), data=zlib.compress(text, 6), size=len(text))
+
+
+def _store(RawPayload, rows, json_field, extra=None):
+    """Point each row's raw_payload at its record from json_field; returns rows to update"""
+    payloads = {}
+    for row in rows:
+        record = getattr(row, json_field)
+        if isinstance(record, dict) and record:
+            payload = _payload(RawPayload, record)
+            payloads.setdefault(payload.digest, payload)
+            row.raw_payload_id = payload.digest
+        if extra:
+            extra(row, record if isinstance(record, dict) else {})
+    RawPayload.objects.bulk_create(payloads.values(), batch_size=500, ignore_conflicts=True)
+    return rows
+
+
+def move_payloads(apps, schema_editor):
+    """
+    Copy Component.additional_data and CMURegistry.raw_data into RawPayload
+    before the JSON columns are dropped; fill CMURegistry.applicant_name on the way
+    """
+    RawPayload = apps.get_model("checker", "RawPayload")
+    Component = apps.get_model("checker", "Component")
+    CMURegistry = apps.get_model("checker", "CMURegistry")
+
+    last_pk = 0
+    while True:
+        components = list(
+            Component.objects.filter(pk__gt=last_pk).order_by("pk").only("id", "additional_data")[:BATCH_SIZE]
+        )
+        if not components:
+            break
+        last_pk = components[-1].pk
+        _store(RawPayload, components, "additional_data")
+        Component.objects.bulk_update(components, ["raw_payload"])
+
+    def set_applicant(registry, record):
+        registry.applicant_name = str(record.get("Name of Applicant") or "")[:255]
+
+    last_pk = ""
+    while True:
+        entries = list(
+            CMURegistry.objects.filter(pk__gt=last_pk).order_by("pk").only("cmu_id", "raw_data")[:BATCH_SIZE]
+        )
+        if not entries:
+            break
+        last_pk = entries[-1].pk
+        _store(RawPayload, entries, "raw_data", extra=set_applicant)
+        CMURegistry.objects.bulk_update(entries, ["raw_payload", "applicant_name"])
+
+
+def restore_payloads(apps, schema_editor):
+    """Reverse: decode RawPayload back into the re-added JSON columns"""
+    RawPayload = apps.get_model("checker", "RawPayload")
+    Component = apps.get_model("checker", "Component")
+    CMURegistry = apps.get_model("checker", "CMURegistry")
+
+    for model, json_field in ((Component, "additional_data"), (CMURegistry, "raw_data")):
+        rows = model.objects.exclude(raw_payload__isnull=True).only("pk", "raw_payload")
+        batch = []
+        for row in rows.iterator(chunk_size=BATCH_SIZE):
+            batch.append(row)
+            if len(batch) >= BATCH_SIZE:
+                _decode_into(RawPayload, model, batch, json_field)
+                batch = []
+        if batch:
+            _decode_into(RawPayload, model, batch, json_field)
+
+
+def _decode_into(RawPayload, model, rows, json_field):
+    data = dict(RawPayload.objects.filter(pk__in={row.raw_payload_id for row in rows}).values_list("pk", "data"))
+    for row in rows:
+        setattr(row, json_field, json.loads(zlib.decompress(data[row.raw_payload_id])))
+    model.objects.bulk_update(rows, [json_field])
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("checker", "0041_component_archive"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="RawPayload",
+            fields=[
+                (
+                    "digest",
+                    models.CharField(max_length=64, primary_key=True, serialize=False),
+                ),
+                ("data", models.BinaryField()),
+                ("size", models.PositiveIntegerField(default=0)),
+            ],
+        ),
+        migrations.AddField(
+            model_name="cmuregistry",
+            name="applicant_name",
+            field=models.CharField(blank=True, default="", max_length=255),
+        ),
+        migrations.AddField(
+            model_name="cmuregistry",
+            name="raw_payload",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.PROTECT,
+                related_name="+",
+                to="checker.rawpayload",
+            ),
+        ),
+        migrations.AddField(
+            model_name="component",
+            name="raw_payload",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.PROTECT,
+                related_name="+",
+                to="checker.rawpayload",
+            ),
+        ),
+        migrations.RunPython(move_payloads, restore_payloads),
+        migrations.RemoveField(
+            model_name="cmuregistry",
+            name="raw_data",
+        ),
+        migrations.RemoveField(
+            model_name="component",
+            name="additional_data",
+        ),
+    ]
@@ -3,14 +3,183 @@ from django.core.serializers.json import DjangoJSONEncoder
 from django.utils.text import slugify
 from django.urls import reverse
 from django.contrib.postgres.search import SearchVectorField
+import hashlib
+import json
 import re
+import zlib
 
 # Import Company model for PostgreSQL-based company search
 from .models_company import Company
 
 # Create your models here.
 
-class Component(models.Model):
+# Delivery years from this one on are in the current capacity market
+ACTIVE_DELIVERY_YEAR = 2024
+
+_YEAR_RE = re.compile(r'(?<!\d)(\d{4})(?!\d)')
+
+
+def auction_sort_key(auction_name):
+    """Sort key putting auction names in delivery year order"""
+    return (parse_year(auction_name) or 0, auction_name or '')
+
+
+def parse_year(value):
+    """First four-digit year in a delivery year or auction name ('2024-25' -> 2024), or None"""
+    if isinstance(value, int):
+        return value
+    match = _YEAR_RE.search(str(value or ''))
+    return int(match.group(1)) if match else None
+
+
+class AuctionType(models.TextChoices):
+    T1 = 'T-1', 'T-1'
+    T3 = 'T-3', 'T-3'
+    T4 = 'T-4', 'T-4'
+    TR = 'TR', 'Transitional'
+
+    @classmethod
+    def from_auction_name(cls, auction_name):
+        """Auction type named in an auction name, or '' when it names none"""
+        name = auction_name or ''
+        if 'T-1' in name or 'T1' in name:
+            return cls.T1
+        if 'T-3' in name or 'T3' in name:
+            return cls.T3
+        if 'T-4' in name or 'T4' in name:
+            return cls.T4
+        if 'TR' in name or 'transitional' in name.lower():
+            return cls.TR
+        return ''
+
+
+class RawPayloadQuerySet(models.QuerySet):
+    def store(self, records):
+        """Store each record once (existing content is left alone); returns the digests in order, None for empty records"""
+        payloads = {}
+        digests = []
+        for record in records:
+            if not record:
+                digests.append(None)
+                continue
+            payload = RawPayload.for_record(record)
+            payloads.setdefault(payload.digest, payload)
+            digests.append(payload.digest)
+        if payloads:
+            self.bulk_create(payloads.values(), batch_size=500, ignore_conflicts=True)
+        return digests
+
+    def records(self, digests):
+        """{digest: decoded record} for the given digests in one query"""
+        digests = {digest for digest in digests if digest}
+        return {payload.digest: payload.record() for payload in self.filter(digest__in=digests)}
+
+    def unreferenced(self):
+        """Payloads no Component or CMURegistry row points at any more (replaced or deleted records)"""
+        return self.exclude(
+            digest__in=Component.objects.filter(raw_payload__isnull=False).values('raw_payload')
+        ).exclude(
+            digest__in=CMURegistry.objects.filter(raw_payload__isnull=False).values('raw_payload')
+        )
+
+
+class RawPayload(models.Model):
+    """
+    Raw API records stored once per distinct content: SHA-256 of the canonical
+    JSON -> zlib-compressed JSON. Component and CMURegistry rows keep only the
+    digest, so the JSON stays out of their rows and identical records (repeat
+    crawls, duplicate registry entries) share one row.
+    """
+    digest = models.CharField(max_length=64, primary_key=True)
+    data = models.BinaryField()
+    size = models.PositiveIntegerField(default=0)  # Uncompressed JSON bytes
+
+    # Search relevance the crawl query attached to each record - not part of the record
+    VOLATILE_KEYS = ('rank',)
+
+    objects = RawPayloadQuerySet.as_manager()
+
+    @classmethod
+    def for_record(cls, record):
+        record = {key: value for key, value in record.items() if key not in cls.VOLATILE_KEYS}
+        text = json.dumps(record, cls=DjangoJSONEncoder, sort_keys=True, separators=(',', ':')).encode('utf-8')
+        return cls(digest=hashlib.sha256(text).hexdigest(), data=zlib.compress(text, 6), size=len(text))
+
+    def record(self):
+        return json.loads(zlib.decompress(self.data))
+
+    def __str__(self):
+        return f"{self.digest[:12]} ({self.size} bytes)"
+
+
+class RawPayloadModel(models.Model):
+    """
+    Base for models whose raw API record lives in RawPayload. Subclasses expose
+    the record through payload_property(); it is decoded on first access and
+    stored (if new) on save or ComponentQuerySet/CMURegistry bulk_create.
+    """
+    raw_payload = models.ForeignKey(
+        RawPayload,
+        on_delete=models.PROTECT,
+        null=True,
+        blank=True,
+        related_name='+'
+    )
+
+    _payload_record = None
+
+    class Meta:
+        abstract = True
+
+    def store_payload(self):
+        """Point raw_payload at the stored record, when it was loaded or assigned"""
+        if self._payload_record is not None:
+            self.raw_payload_id = RawPayload.objects.store([self._payload_record])[0]
+
+    def save(self, *args, **kwargs):
+        self.store_payload()
+        super().save(*args, **kwargs)
+
+
+def payload_property(doc):
+    """Property reading and assigning a RawPayloadModel's raw record (select_related('raw_payload') for lists)"""
+    def get(self):
+        if self._payload_record is None:
+            self._payload_record = self.raw_payload.record() if self.raw_payload_id else {}
+        return self._payload_record
+
+    def set(self, record):
+        self._payload_record = record or {}
+
+    return property(get, set, doc=doc)
+
+
+def store_payloads(objs):
+    """Store the records of many RawPayloadModel instances at once, ahead of bulk_create"""
+    pending = [obj for obj in objs if obj._payload_record is not None]
+    digests = RawPayload.objects.store([obj._payload_record for obj in pending])
+    for obj, digest in zip(pending, digests):
+        obj.raw_payload_id = digest
+
+
+class ComponentQuerySet(models.QuerySet):
+    def bulk_create(self, objs, *args, **kwargs):
+        # bulk_create skips save(), so fill the parsed auction columns here for bulk ingest
+        objs = list(objs)
+        for component in objs:
+            component.extract_auction_fields()
+        store_payloads(objs)
+        return super().bulk_create(objs, *args, **kwargs)
+
+    def hot(self):
+        """Components not archived (see services.component_archive)"""
+        return self.filter(is_archived=False)
+
+    def archived(self):
+        return self.filter(is_archived=True)
+
+
+class Component(RawPayloadModel):
     """
     Model for storing components data
     """
@@ -24,9 +193,14 @@ class Component(models.Model):
     delivery_year = models.CharField(max_length=50, db_index=True, null=True, blank=True)  # Already indexed
     status = models.CharField(max_length=50, null=True, blank=True)
     type = models.CharField(max_length=50, null=True, blank=True)
-    additional_data = models.JSONField(default=dict, encoder=DjangoJSONEncoder)
+    additional_data = payload_property("Full raw NESO record for the component")
     # New field for numeric de-rated capacity
     derated_capacity_mw = models.FloatField(null=True, blank=True, db_index=True) 
+    # Parsed from delivery_year / auction_name on save so year ranges and sorting run in SQL
+    delivery_year_start = models.PositiveSmallIntegerField(null=True, blank=True, db_index=True)
+    auction_type = models.CharField(max_length=4, choices=AuctionType.choices, blank=True, default='', db_index=True)
+    # Historical component left out of the hot indexes (services.component_archive)
+    is_archived = models.BooleanField(default=False)
     
     # Add these new fields for maps
     latitude = models.FloatField(null=True, blank=True, db_index=True)
@@ -45,6 +219,15 @@ class Component(models.Model):
     places_api_search_strategy = models.CharField(max_length=50, null=True, blank=True)  # e.g., asda_specific, full_address
     places_api_major_retailers = models.JSONField(default=list, blank=True)  # List of major retailers found at location
     places_api_last_checked = models.DateTimeField(null=True, blank=True)
+
+    # LocationGroup for this component's location, set by build_location_groups
+    location_group = models.ForeignKey(
+        'LocationGroup',
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='components'
+    )
     
     # SEO-friendly slug (commented out until migration is run)
     # slug = models.SlugField(max_length=300, blank=True, db_index=True)
@@ -82,9 +265,48 @@ class Component(models.Model):
         # Add database optimizations
         ordering = ['-delivery_year']  # Default ordering
 
+    objects = ComponentQuerySet.as_manager()
+
     def __str__(self):
         return f"{self.cmu_id} - {self.component_id} ({self.location[:30]})"
     
+    def extract_auction_fields(self):
+        """Parse delivery_year_start and auction_type from the delivery year and auction name strings"""
+        self.delivery_year_start = parse_year(self.delivery_year) or parse_year(self.auction_name)
+        self.auction_type = AuctionType.from_auction_name(self.auction_name)
+    
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_location = instance.__dict__.get('location')
+        return instance
+
+    def sync_location_group(self):
+        """
+        Re-point location_group at the group for a changed location (NULL until
+        build_location_groups creates one). Returns True if it was recomputed.
+        New components are linked by the build.
+        """
+        if self._state.adding or 'location' not in self.__dict__:
+            return False
+        if self.location == getattr(self, '_loaded_location', self.location):
+            return False
+        self.location_group_id = (
+            LocationGroup.objects.filter(location=self.location).values_list('pk', flat=True).first()
+            if self.location else None
+        )
+        return True
+
+    def save(self, *args, **kwargs):
+        self.extract_auction_fields()
+        update_fields = kwargs.get('update_fields')
+        saves_location = update_fields is None or 'location' in update_fields
+        if saves_location and self.sync_location_group() and update_fields is not None:
+            kwargs['update_fields'] = [*update_fields, 'location_group']
+        super().save(*args, **kwargs)
+        if saves_location:
+            self._loaded_location = self.__dict__.get('location')
+    
     # def save(self, *args, **kwargs):
     #     if not self.slug:
     #         # Create slug from location, technology, and CMU ID
@@ -160,9 +382,12 @@ class LocationGroup(models.Model):
     # Store unique CMU IDs at this location  
     cmu_ids = models.JSONField(default=list)  # e.g., ["VIT304", "VIT305", "VIT306"]
     
-    # Active status - True if any component has auction year 2024 or later
+    # Active status - True if any component has delivery year 2024 or later
     is_active = models.BooleanField(default=False, db_index=True)
     
+    # Newest Component.delivery_year_start at this location, for sorting by date
+    latest_delivery_year = models.PositiveSmallIntegerField(null=True, blank=True, db_index=True)
+    
     # Full-text search vector for fast searching across all text fields
     search_vector = SearchVectorField(null=True, blank=True)  # Will be populated by trigger/migration
     
@@ -180,6 +405,15 @@ class LocationGroup(models.Model):
     longitude = models.FloatField(null=True, blank=True, db_index=True)
     county = models.CharField(max_length=100, null=True, blank=True, db_index=True)
     outward_code = models.CharField(max_length=5, null=True, blank=True, db_index=True)
+    full_postcode = models.CharField(max_length=10, null=True, blank=True, db_index=True)
+    
+    # Number of LocationGroups sharing full_postcode (including this one), maintained by build_location_groups
+    colocation_count = models.PositiveIntegerField(default=0)
+    
+    # Places API business badge data (copied from representative component)
+    business_name = models.CharField(max_length=255, null=True, blank=True)
+    business_type = models.CharField(max_length=100, null=True, blank=True)
+    major_retailers = models.JSONField(default=list, blank=True)
     
     # Tracking
     created_at = models.DateTimeField(auto_now_add=True)
@@ -286,43 +520,25 @@ class LocationGroup(models.Model):
     
     def get_colocation_info(self):
         """Check if there are other LocationGroups at the same exact postcode OR multiple components within this LocationGroup"""
-        if not self.representative_component:
-            return None
-        
-        # Get the full postcode from representative component
-        full_postcode = self.representative_component.full_postcode
-        if not full_postcode:
+        if not self.full_postcode:
             return None
         
-        # Count total LocationGroups at same postcode
-        total_location_groups = LocationGroup.objects.filter(
-            representative_component__full_postcode=full_postcode
-        ).count()
-        
         # Only show co-location if there are multiple LocationGroups at this postcode
-        if total_location_groups > 1:
-            return {'postcode': full_postcode, 'count': total_location_groups}
+        if self.colocation_count > 1:
+            return {'postcode': self.full_postcode, 'count': self.colocation_count}
         
         return None
     
     def get_business_info(self):
-        """Get enhanced business information from representative component"""
-        if not self.representative_component:
-            return None
-        
-        rep_comp = self.representative_component
-        
+        """Get business badge information (copied from the representative component by the builder)"""
         # Return None if no business data available
-        if not rep_comp.places_api_business_name:
+        if not self.business_name:
             return None
         
         return {
-            'business_name': rep_comp.places_api_business_name,
-            'business_type': rep_comp.places_api_business_type,
-            'confidence': rep_comp.places_api_confidence,
-            'search_strategy': rep_comp.places_api_search_strategy,
-            'major_retailers': rep_comp.places_api_major_retailers or [],
-            'last_checked': rep_comp.places_api_last_checked
+            'business_name': self.business_name,
+            'business_type': self.business_type,
+            'major_retailers': self.major_retailers or [],
         }
     
     def get_display_business_name(self):
@@ -416,11 +632,212 @@ class CompanyLinks(models.Model):
         return ' | '.join(links)
 
 
-class CMURegistry(models.Model):
+def _parse_mw(value):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+class CMURegistryQuerySet(models.QuerySet):
+    def details(self, cmu_ids):
+        """{cmu_id: CMURegistry} with only the extracted columns loaded - one query, no raw_data"""
+        return self.only(*CMURegistry.DETAIL_FIELDS).in_bulk(list(cmu_ids))
+
+
+class CMURegistry(RawPayloadModel):
     cmu_id = models.CharField(max_length=100, primary_key=True, unique=True)
-    raw_data = models.JSONField(default=dict, encoder=DjangoJSONEncoder)
+    raw_data = payload_property("Full raw NESO registry record for the CMU")
     last_updated = models.DateTimeField(auto_now=True)
 
+    # Extracted from raw_data on save so pages don't parse the registry JSON
+    applicant_name = models.CharField(max_length=255, blank=True, default='')
+    derated_capacity_mw = models.FloatField(null=True, blank=True)
+    anticipated_derated_capacity_mw = models.FloatField(null=True, blank=True)
+    connection_capacity_mw = models.FloatField(null=True, blank=True)
+    parent_company = models.CharField(max_length=255, blank=True, default='')
+    trading_contact_email = models.CharField(max_length=255, blank=True, default='')
+    trading_contact_phone = models.CharField(max_length=100, blank=True, default='')
+
+    DETAIL_FIELDS = (
+        'cmu_id',
+        'derated_capacity_mw',
+        'anticipated_derated_capacity_mw',
+        'connection_capacity_mw',
+        'parent_company',
+        'trading_contact_email',
+        'trading_contact_phone',
+    )
+
+    objects = CMURegistryQuerySet.as_manager()
+
+    def extract_fields(self):
+        """Copy the registry values pages display from raw_data into typed columns"""
+        data = self.raw_data if isinstance(self.raw_data, dict) else {}
+        self.applicant_name = str(data.get("Name of Applicant") or '')[:255]
+        self.derated_capacity_mw = _parse_mw(data.get("De-Rated Capacity"))
+        self.anticipated_derated_capacity_mw = _parse_mw(data.get("Anticipated De-Rated Capacity"))
+        self.connection_capacity_mw = _parse_mw(data.get("Connection / DSR Capacity"))
+        self.parent_company = str(data.get("Parent Company") or '')[:255]
+        self.trading_contact_email = str(data.get("Secondary Trading Contact - Email") or '')[:255]
+        self.trading_contact_phone = str(data.get("Secondary Trading Contact - Telephone") or '')[:100]
+
+    def save(self, *args, **kwargs):
+        self.extract_fields()
+        super().save(*args, **kwargs)
+
+    def __str__(self):
+        return f"{self.cmu_id} ({self.applicant_name or 'Unknown'})"
+
+
+class GeocodeCache(models.Model):
+    """
+    Persistent geocode results keyed by normalized address string.
+    Lets geocode_components resolve each distinct address once, ever.
+    """
+    normalized_address = models.CharField(max_length=255, unique=True, db_index=True)
+    latitude = models.FloatField(null=True, blank=True)
+    longitude = models.FloatField(null=True, blank=True)
+    status = models.CharField(max_length=20, default='OK')  # OK / ZERO_RESULTS (negative cache)
+    source = models.CharField(max_length=20, default='google')  # offline / google
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name_plural = "Geocode cache"
+
+    def __str__(self):
+        return f"{self.normalized_address} ({self.status})"
+
+
+class DatasetSnapshot(models.Model):
+    """
+    NESO resource metadata as of the last successful crawl pipeline.
+    The freshness probe compares the live API against these rows to skip no-op crawls.
+    """
+    resource_id = models.CharField(max_length=100, unique=True)
+    name = models.CharField(max_length=50)  # cmus / components
+    last_modified = models.CharField(max_length=50, null=True, blank=True)  # CKAN resource_show timestamp
+    record_total = models.IntegerField(default=0)
+    sample_checksum = models.CharField(max_length=64, blank=True, default='')  # sha256 of sampled pages
+    recorded_at = models.DateTimeField(auto_now=True)
+
     def __str__(self):
-        applicant = self.raw_data.get('Name of Applicant', 'Unknown')
-        return f"{self.cmu_id} ({applicant})"
+        return f"{self.name}: {self.record_total} records (modified {self.last_modified})"
+
+
+class DatasetGeneration(models.Model):
+    """
+    Monotonic dataset version mixed into data-derived cache keys.
+    A new generation is created after each crawl/rebuild, warmed, then activated,
+    so invalidating every cache is a single counter flip.
+    """
+    number = models.PositiveIntegerField(unique=True)
+    note = models.CharField(max_length=255, blank=True, default='')
+    created_at = models.DateTimeField(auto_now_add=True)
+    activated_at = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        state = f"active since {self.activated_at}" if self.activated_at else "not activated"
+        return f"Generation {self.number} ({state})"
+
+
+class PrerenderedPage(models.Model):
+    """
+    Anonymous HTML for a detail page, rendered after a rebuild and stored gzipped.
+    Served by PrerenderedPageMiddleware while generation and release still match.
+    """
+    path = models.CharField(max_length=500, unique=True)
+    generation = models.PositiveIntegerField()
+    release = models.CharField(max_length=100, blank=True, default='')
+    body = models.BinaryField()  # gzip-compressed HTML
+    rendered_at = models.DateTimeField()
+
+    def __str__(self):
+        return f"{self.path} (generation {self.generation})"
+
+
+class StatisticsRollup(models.Model):
+    """
+    Component totals per company, technology, delivery year and auction, plus one
+    'total' row, precomputed once per dataset generation by refresh_statistics_rollups.
+    The statistics pages read these rows instead of aggregating Component.
+    """
+    DIMENSIONS = ('company', 'technology', 'delivery_year', 'auction', 'total')
+
+    generation = models.PositiveIntegerField()
+    dimension = models.CharField(max_length=20)
+    key = models.CharField(max_length=255)  # Company/technology/year/auction; '' for the total row
+    component_count = models.PositiveIntegerField(default=0)
+    capacity_component_count = models.PositiveIntegerField(default=0)  # Components with a de-rated capacity
+    derated_capacity_mw = models.FloatField(default=0)
+    cmu_count = models.PositiveIntegerField(default=0)
+    location_count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        unique_together = [('generation', 'dimension', 'key')]
+        indexes = [
+            models.Index(fields=['generation', 'dimension', '-component_count'], name='rollup_count_idx'),
+            models.Index(fields=['generation', 'dimension', '-derated_capacity_mw'], name='rollup_capacity_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.dimension}={self.key} (generation {self.generation})"
+
+
+class CMUSummary(models.Model):
+    """
+    Per-CMU facts precomputed with the LocationGroup build (build_location_groups),
+    so aggregation checks and CMU pages are a single lookup by cmu_id.
+    """
+    cmu_id = models.CharField(max_length=100, unique=True)
+    company_name = models.CharField(max_length=255, blank=True, default='')
+    location_count = models.PositiveIntegerField(default=0)
+    component_count = models.PositiveIntegerField(default=0)
+    total_capacity_mw = models.FloatField(default=0)  # Sum over the CMU's component records, like LocationGroup
+    derated_capacity_mw = models.FloatField(null=True, blank=True)  # CMU Registry "De-Rated Capacity"
+    delivery_years = models.JSONField(default=list)  # Sorted ascending
+    auction_names = models.JSONField(default=list)  # Sorted newest first
+    is_aggregated = models.BooleanField(default=False)  # Spans more than one location
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name_plural = "CMU summaries"
+
+    def __str__(self):
+        return f"{self.cmu_id} ({self.location_count} locations, {self.component_count} components)"
+
+
+class LocationMapPoint(models.Model):
+    """
+    Narrow copy of each geocoded LocationGroup with only what map markers filter
+    and draw on, rebuilt with the LocationGroups (services.map_points). Map
+    endpoints scan this instead of LocationGroup's wide JSON rows and fetch
+    those only for the page of markers they return.
+    """
+    location_group = models.OneToOneField(
+        LocationGroup,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='map_point'
+    )
+    latitude = models.FloatField()
+    longitude = models.FloatField()
+    spatial_key = models.PositiveIntegerField(db_index=True)  # 0.1 degree grid cell, row-major
+    tech_mask = models.PositiveIntegerField(default=0)  # Bit per canonical map technology
+    primary_technology = models.CharField(max_length=100, blank=True, default='')
+    primary_company = models.CharField(max_length=255, blank=True, default='')
+    capacity_mw = models.FloatField(default=0)
+    component_count = models.PositiveIntegerField(default=0)
+    is_active = models.BooleanField(default=False)
+    is_residential = models.BooleanField(default=False)  # Has a residential DSR aggregator (Octopus, Axle)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['latitude', 'longitude'], name='map_point_spatial_idx'),
+            models.Index(fields=['is_active', 'is_residential'], name='map_point_flags_idx'),
+        ]
+
+    def __str__(self):
+        return f"Map point {self.pk} ({self.latitude:.4f}, {self.longitude:.4f})"
+
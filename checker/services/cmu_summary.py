@@ -0,0 +1,108 @@
+"""
+CMU summaries.
+
+Built after the LocationGroups from one pass over Component (plus the CMU
+Registry for applicant and registered de-rated capacity) and upserted into
+CMUSummary. Location and CMU pages then read how many locations and components
+a CMU has, its capacity, years and auctions with one indexed lookup instead of
+counting distinct locations and loading the CMU dataframe per request.
+"""
+import logging
+from collections import Counter, defaultdict
+
+from django.db import transaction
+from django.utils import timezone
+
+from ..models import CMURegistry, CMUSummary, Component
+
+logger = logging.getLogger(__name__)
+
+UPSERT_FIELDS = [
+    'company_name',
+    'location_count',
+    'component_count',
+    'total_capacity_mw',
+    'derated_capacity_mw',
+    'delivery_years',
+    'auction_names',
+    'is_aggregated',
+    'updated_at',
+]
+
+
+def _new_facts():
+    return {
+        'locations': set(),
+        'components': 0,
+        'capacity': 0.0,
+        'years': set(),
+        'auctions': set(),
+        'companies': Counter(),
+    }
+
+
+def build_cmu_summaries():
+    """Recompute every CMUSummary row from Component; returns the number of CMUs summarised"""
+    started = timezone.now()
+    facts = defaultdict(_new_facts)
+    rows = (
+        Component.objects.exclude(cmu_id='')
+        .values_list('cmu_id', 'location', 'company_name', 'delivery_year', 'auction_name', 'derated_capacity_mw')
+        .order_by()
+    )
+    for cmu_id, location, company_name, delivery_year, auction_name, capacity in rows.iterator(chunk_size=5000):
+        cmu = facts[cmu_id]
+        cmu['components'] += 1
+        if location:
+            cmu['locations'].add(location)
+        if capacity:
+            cmu['capacity'] += capacity
+        if delivery_year:
+            cmu['years'].add(delivery_year)
+        if auction_name:
+            cmu['auctions'].add(auction_name)
+        if company_name:
+            cmu['companies'][company_name] += 1
+
+    registry = {
+        cmu_id: (applicant, capacity)
+        for cmu_id, applicant, capacity in CMURegistry.objects.values_list(
+            'cmu_id', 'applicant_name', 'derated_capacity_mw'
+        ).iterator(chunk_size=5000)
+    }
+
+    summaries = []
+    for cmu_id, cmu in facts.items():
+        applicant, registry_capacity = registry.get(cmu_id, (None, None))
+        top_company = cmu['companies'].most_common(1)
+        summaries.append(CMUSummary(
+            cmu_id=cmu_id,
+            company_name=(applicant or (top_company[0][0] if top_company else ''))[:255],
+            location_count=len(cmu['locations']),
+            component_count=cmu['components'],
+            total_capacity_mw=cmu['capacity'],
+            derated_capacity_mw=registry_capacity,
+            delivery_years=sorted(cmu['years']),
+            auction_names=sorted(cmu['auctions'], reverse=True),
+            is_aggregated=len(cmu['locations']) > 1,
+            updated_at=started,
+        ))
+
+    with transaction.atomic():
+        CMUSummary.objects.bulk_create(
+            summaries,
+            batch_size=1000,
+            update_conflicts=True,
+            unique_fields=['cmu_id'],
+            update_fields=UPSERT_FIELDS,
+        )
+        # CMUs that no longer have components
+        CMUSummary.objects.filter(updated_at__lt=started).delete()
+
+    logger.info(f"Built {len(summaries)} CMU summaries")
+    return len(summaries)
+
+
+def get_cmu_summary(cmu_id):
+    """CMUSummary for cmu_id, or None if it has not been built"""
+    return CMUSummary.objects.filter(cmu_id=cmu_id).first()
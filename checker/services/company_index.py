@@ -5,12 +5,26 @@ import time
 from django.core.cache import cache
 from rapidfuzz import fuzz
 from ..utils import normalize
+from .single_flight import get_or_build
 
 logger = logging.getLogger(__name__)
 
 # Redis keys - must match the ones in build_company_index.py
 COMPANY_INDEX_KEY = "company_index_v1"
 COMPANY_INDEX_UPDATE_KEY = "company_index_last_updated"
+COMPANY_INDEX_TTL = 3600 * 4
+
+
+def _rebuild_company_index():
+    """Run the index build command and return the serialized index it stored"""
+    from django.core.management import call_command
+    logger.warning("Company index not found in Redis - attempting auto-rebuild")
+    call_command('build_company_index', '--force')
+    serialized_index = cache.get(COMPANY_INDEX_KEY)
+    if serialized_index is None:
+        raise RuntimeError("build_company_index did not store an index")
+    logger.info("Successfully auto-rebuilt company index")
+    return serialized_index
 
 def get_company_index():
     """
@@ -23,27 +37,21 @@ def get_company_index():
     """
     start_time = time.time()
     
-    # Try to get from Redis cache
-    serialized_index = cache.get(COMPANY_INDEX_KEY)
-    if serialized_index is None:
-        logger.warning("Company index not found in Redis - attempting auto-rebuild")
-        # Auto-rebuild the company index if missing
-        from django.core.management import call_command
-        try:
-            call_command('build_company_index', '--force')
-            # Try to load again after rebuild
-            serialized_index = cache.get(COMPANY_INDEX_KEY)
-            if serialized_index is None:
-                logger.error("Failed to auto-rebuild company index")
-                return {}, time.time() - start_time, False
-            logger.info("Successfully auto-rebuilt company index")
-        except Exception as e:
-            logger.error(f"Error auto-rebuilding company index: {e}")
-            return {}, time.time() - start_time, False
+    # Single-flight: a missing index is rebuilt by one worker while the others wait for it
+    try:
+        serialized_index = get_or_build(
+            COMPANY_INDEX_KEY, _rebuild_company_index, COMPANY_INDEX_TTL, COMPANY_INDEX_TTL * 2
+        )
+    except Exception as e:
+        logger.error(f"Error auto-rebuilding company index: {e}")
+        return {}, time.time() - start_time, False
     
     try:
-        # Deserialize the index from Redis
-        company_index = pickle.loads(base64.b64decode(serialized_index))
+        # Deserialize the index from Redis (older builders stored it base64-pickled)
+        if isinstance(serialized_index, dict):
+            company_index = serialized_index
+        else:
+            company_index = pickle.loads(base64.b64decode(serialized_index))
         load_time = time.time() - start_time
         num_companies = len(company_index)
         
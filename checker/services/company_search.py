@@ -40,13 +40,14 @@ from .data_access import (
     save_component_data_to_json,
 )
 from .search_logic import analyze_query
+from .cmu_summary import get_cmu_summary
 
 logger = logging.getLogger(__name__)
 
 # --- Moved imports here ---
 from django.db.models import Q, Count, Value
 from django.core.paginator import Paginator, EmptyPage, PageNotAnInteger
-from ..models import Component
+from ..models import Component, parse_year
 from ..utils import normalize # Ensure utils are imported too
 # --- End moved imports ---
 
@@ -655,7 +656,7 @@ def auction_components(request, company_id, year, auction_name):
             year_number_match = re.search(r"(\d{4})", year)
             if year_number_match:
                 year_number = year_number_match.group(1)
-                year_query |= Q(delivery_year__icontains=year_number)
+                year_query |= Q(delivery_year_start=int(year_number))
                 logger.info(f"Added Year filter: {year_number}")
 
             query &= year_query
@@ -858,40 +859,6 @@ def auction_components(request, company_id, year, auction_name):
         return HttpResponse(error_html)
 
 
-def try_parse_year(year_str):
-    """Try to parse a year string to an integer for sorting."""
-    if not year_str:
-        return 0
-
-    try:
-        # First try direct conversion
-        if isinstance(year_str, (int, float)):
-            return int(year_str)
-
-        # For strings, check different formats
-        if isinstance(year_str, str):
-            # Look for 4-digit years like "2024"
-            import re
-
-            year_matches = re.findall(r"20\d\d", year_str)
-            if year_matches:
-                return int(year_matches[0])
-
-            # Look for year ranges like "2024/25" or "2024-25"
-            range_matches = re.findall(r"(20\d\d)[/-]\d\d", year_str)
-            if range_matches:
-                return int(range_matches[0])
-
-            # Last try: just convert any numbers
-            numeric_matches = re.findall(r"\d+", year_str)
-            if numeric_matches:
-                return int(numeric_matches[0])
-
-        return 0
-    except:
-        return 0
-
-
 def get_company_years(company_id, year, auction_name=None):
     """
     Get year details for a company.
@@ -1083,9 +1050,14 @@ def get_cmu_details(cmu_id):
         if location:
             locations.add(location)
 
+    # Full counts come from the precomputed summary; the fetched components are one page
+    summary = get_cmu_summary(cmu_id)
+    component_count = summary.component_count if summary else len(components)
+    location_count = summary.location_count if summary else len(locations)
+
     html = f"""
     <div id="cmu-content-{cmu_id}">
-        <p><strong>Components:</strong> {len(components)}</p>
+        <p><strong>Components:</strong> {component_count} across {location_count} location{'s' if location_count != 1 else ''}</p>
         {format_location_list(locations, components)}
     </div>
     """
@@ -1361,6 +1333,10 @@ def cmu_detail(request, cmu_id):
     start_time = time.time()
 
     try:
+        # Counts, years and auctions for the header, precomputed with the LocationGroups
+        summary = get_cmu_summary(cmu_id)
+        context["cmu_summary"] = summary
+
         # Fetch components for the given CMU ID
         components_query = Component.objects.filter(cmu_id__iexact=cmu_id)
 
@@ -1372,8 +1348,9 @@ def cmu_detail(request, cmu_id):
             f"{order_direction}{sort_field}"
         )
 
-        total_count = components_query.count()
+        total_count = summary.component_count if summary else components_query.count()
         paginator = Paginator(components_query, per_page)
+        paginator.count = total_count
         try:
             page_obj = paginator.page(page)
         except PageNotAnInteger:
@@ -1508,7 +1485,7 @@ def _organize_year_data(company_records, sort_order):
 
     # Sort by year
     ascending = sort_order == "asc"
-    year_data.sort(key=lambda x: try_parse_year(x["year"]), reverse=not ascending)
+    year_data.sort(key=lambda x: parse_year(x["year"]) or 0, reverse=not ascending)
 
     return year_data
 
@@ -0,0 +1,53 @@
+"""
+Component archive.
+
+Components for delivery years before ACTIVE_DELIVERY_YEAR are history: they
+stay in Component (location, CMU and component pages still list them) but
+are flagged is_archived, and Component.objects.hot() / archived() select
+either side. Search and the map filter on LocationGroup.is_active instead (a
+location stays active while any of its components is current), so the flag
+carries no indexes of its own. Raw records already live outside the row, in
+RawPayload.
+
+Archiving is explicit (the archive_components command) and reversible with
+restore_components.
+"""
+import logging
+
+from ..models import ACTIVE_DELIVERY_YEAR, Component
+
+logger = logging.getLogger(__name__)
+
+BATCH_SIZE = 2000
+
+
+def archive_candidates(before_year=ACTIVE_DELIVERY_YEAR):
+    """Unarchived components whose delivery year is before before_year"""
+    return Component.objects.hot().filter(delivery_year_start__lt=before_year)
+
+
+def _flag_in_batches(components, is_archived, batch_size):
+    flagged = 0
+    while True:
+        ids = list(components.order_by('pk').values_list('pk', flat=True)[:batch_size])
+        if not ids:
+            return flagged
+        Component.objects.filter(pk__in=ids).update(is_archived=is_archived)
+        flagged += len(ids)
+        logger.info(f"{'Archived' if is_archived else 'Restored'} {flagged} components")
+
+
+def archive_components(before_year=ACTIVE_DELIVERY_YEAR, batch_size=BATCH_SIZE):
+    """Move candidates out of the hot set; returns components archived"""
+    return _flag_in_batches(archive_candidates(before_year), True, batch_size)
+
+
+def restore_components(since_year=None, batch_size=BATCH_SIZE):
+    """
+    Bring archived components (only those from since_year on, when given) back
+    into the hot set; returns components restored
+    """
+    archived = Component.objects.archived()
+    if since_year is not None:
+        archived = archived.filter(delivery_year_start__gte=since_year)
+    return _flag_in_batches(archived, False, batch_size)
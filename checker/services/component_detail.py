@@ -13,6 +13,18 @@ from ..bot_detection import is_bot_request, get_bot_response_type
 logger = logging.getLogger(__name__)
 
 
+def _linked_group_id(component):
+    """
+    location_group_id, but only while the group is still for the component's
+    location - bulk location rewrites (.update(location=...)) bypass save()
+    and leave the old link until the next build_location_groups.
+    """
+    group = component.location_group
+    if group is not None and group.location == component.location:
+        return group.pk
+    return None
+
+
 def get_component_details(request, pk, location_id=None):
     """
     View function for component details page.
@@ -27,7 +39,8 @@ def get_component_details(request, pk, location_id=None):
         logger.info(f"Looking up component with database ID (pk): {pk}")
 
         # DATABASE FIRST: Get the component directly using primary key
-        target_component_obj = Component.objects.get(pk=pk)
+        target_component_obj = Component.objects.select_related('location_group').get(pk=pk)
+        linked_group_id = _linked_group_id(target_component_obj)
         api_time = 0 # Assume fetched from DB initially
 
         if not target_component_obj:
@@ -40,22 +53,18 @@ def get_component_details(request, pk, location_id=None):
         
         # If location_id is provided (hierarchical URL), validate component belongs to that location
         if location_id:
-            try:
-                location_group = LocationGroup.objects.get(id=location_id)
-                # Check if the component's location matches the location group
-                component_locations = LocationGroup.objects.filter(
-                    location__icontains=target_component_obj.location.split(',')[0].strip()
-                )
-                if location_group not in component_locations:
-                    logger.warning(f"Component {pk} does not belong to location {location_id}")
-                    # Redirect to the flat URL instead of showing error
-                    from django.shortcuts import redirect
-                    from django.urls import reverse
-                    return redirect('component_detail', pk=pk)
-            except LocationGroup.DoesNotExist:
-                logger.warning(f"Location {location_id} not found")
+            if linked_group_id is not None:
+                belongs = linked_group_id == int(location_id)
+            else:
+                # Not linked by build_location_groups yet (or the link is stale) - match the location name
+                belongs = LocationGroup.objects.filter(
+                    id=location_id,
+                    location__icontains=(target_component_obj.location or '').split(',')[0].strip(),
+                ).exists()
+            if not belongs:
+                logger.warning(f"Component {pk} does not belong to location {location_id}")
+                # Redirect to the flat URL instead of showing error
                 from django.shortcuts import redirect
-                from django.urls import reverse
                 return redirect('component_detail', pk=pk)
         
         # Convert the database object to the dictionary format needed by the template
@@ -72,14 +81,15 @@ def get_component_details(request, pk, location_id=None):
             "_id": target_component_obj.component_id # Keep original ID if needed
         }
         
-        # Ensure raw_component_data is a dictionary
-        if isinstance(target_component_obj.additional_data, dict):
-            raw_component_data = target_component_obj.additional_data
+        # Ensure raw_component_data is a dictionary (decoded from its RawPayload)
+        payload = target_component_obj.additional_data
+        if isinstance(payload, dict):
+            raw_component_data = payload
             logger.info(f"Using additional_data (dict) for component {target_component_obj.id}")
         else:
             raw_component_data = {} # Default to empty dict if not a dict
-            if target_component_obj.additional_data is not None:
-                 logger.warning(f"Component {target_component_obj.id} additional_data is not a dictionary (Type: {type(target_component_obj.additional_data)}). Using empty dict.")
+            if payload is not None:
+                 logger.warning(f"Component {target_component_obj.id} additional_data is not a dictionary (Type: {type(payload)}). Using empty dict.")
             else:
                 logger.info(f"Component {target_component_obj.id} additional_data is None. Using empty dict.")
 
@@ -195,8 +205,8 @@ def get_component_details(request, pk, location_id=None):
         primary_fuel = raw_component_data.get("Primary Fuel of Component") if raw_component_data else None
         
         # Try to find the LocationGroup for this component's location
-        location_id = None
-        if target_component_obj.location:
+        location_id = linked_group_id
+        if location_id is None and target_component_obj.location:
             try:
                 # First try exact match
                 location_group = LocationGroup.objects.filter(location=target_component_obj.location).first()
@@ -8,7 +8,7 @@ from django.urls import reverse
 from django.core.paginator import Paginator, EmptyPage, PageNotAnInteger
 from django.template.loader import render_to_string
 from django.http import JsonResponse
-from ..models import Component, CMURegistry
+from ..models import Component, CMURegistry, parse_year
 import json
 from django.db.models import Q
 import re
@@ -1713,7 +1713,7 @@ def company_detail(request, company_id):
             })
 
         # Sort by year (most recent first by default)
-        year_auction_data.sort(key=lambda x: try_parse_year(x['year']), reverse=True)
+        year_auction_data.sort(key=lambda x: parse_year(x['year']) or -1, reverse=True)
 
         return render(request, "checker/company_detail.html", {
             "company_name": company_name,
@@ -1730,10 +1730,3 @@ def company_detail(request, company_id):
             "company_name": None,
             "traceback": traceback.format_exc() if request.GET.get("debug") else None
         })
-
-# Helper function to safely parse year (moved from company_detail)
-def try_parse_year(year_str):
-    try:
-        return int(year_str)
-    except (ValueError, TypeError):
-        return -1 # Treat non-numeric years as oldest
\ No newline at end of file
@@ -7,7 +7,7 @@ from django.conf import settings
 from django.core.cache import cache
 import logging
 import glob
-from django.db.models import Q, Count
+from django.db.models import F, Q, Count
 from django.db import connection
 import re
 import traceback
@@ -16,7 +16,8 @@ import pickle
 import base64
 
 from ..utils import normalize, get_cache_key, get_json_path, ensure_directory_exists
-from ..models import Component
+from ..models import Component, RawPayload
+from .single_flight import get_or_build, store
 
 # Import the postcode/area helper functions (try fast version first)
 try:
@@ -107,6 +108,45 @@ def fetch_all_cmu_records(limit=None):
     return all_records, total_time
 
 
+def _build_cmu_dataframe():
+    """Build the CMU dataframe from the database"""
+    logger.info("Building CMU dataframe from database")
+    
+    # Get data from database
+    cmu_records = Component.objects.values(
+        'cmu_id', 'company_name', 'delivery_year', 'auction_name'
+    ).distinct()
+    
+    # Convert to a DataFrame for backward compatibility
+    df_data = []
+    for record in cmu_records:
+        df_data.append({
+            "CMU ID": record['cmu_id'],
+            "Name of Applicant": record['company_name'],
+            "Full Name": record['company_name'],
+            "Delivery Year": record['delivery_year'],
+            "Auction Name": record['auction_name']
+        })
+    
+    cmu_df = pd.DataFrame(df_data)
+    
+    # Add normalized fields for searching
+    cmu_df["Normalized Full Name"] = cmu_df["Full Name"].apply(normalize)
+    cmu_df["Normalized CMU ID"] = cmu_df["CMU ID"].apply(normalize)
+    
+    # Cache the mappings for future use
+    cmu_to_company_mapping = {}
+    for _, row in cmu_df.iterrows():
+        cmu_id = row.get("CMU ID", "").strip()
+        if cmu_id and cmu_id != "N/A":
+            cmu_to_company_mapping[cmu_id] = row.get("Full Name", "")
+            
+    # Cache the company mapping with 1-day expiration
+    cache.set("cmu_to_company_mapping", cmu_to_company_mapping, 3600 * 24)
+    
+    return cmu_df
+
+
 def get_cmu_dataframe(force_rebuild=False):
     """
     Get CMU dataframe from Redis cache or build from database.
@@ -127,72 +167,21 @@ def get_cmu_dataframe(force_rebuild=False):
     start_time = time.time()
     
     # Cache keys
-    CACHE_KEY = "cmu_dataframe_v1"  # Version number for cache invalidation
+    CACHE_KEY = "cmu_dataframe_v2"  # Version number for cache invalidation
     CACHE_TTL = 3600 * 24 * 1  # 7 days (to match weekly crawl frequency)
     
     try:
-        # Skip cache if force_rebuild is True
-        if not force_rebuild:
-            # Check if we have Redis cache
-            serialized_df = cache.get(CACHE_KEY)
-            if serialized_df is not None:
-                try:
-                    # Deserialize the dataframe from Redis
-                    cmu_df = pickle.loads(base64.b64decode(serialized_df))
-                    logger.info(f"Loaded CMU dataframe from Redis cache ({len(cmu_df)} records)")
-                    return cmu_df, 0
-                except Exception as e:
-                    logger.error(f"Error deserializing CMU dataframe from Redis: {str(e)}")
-                    # Continue with database load if deserialization fails
-        else:
+        if force_rebuild:
             logger.info("Forced rebuild of CMU dataframe")
         
-        # Not in cache or forced rebuild - load from database
-        logger.info("Building CMU dataframe from database")
-        
-        # Get data from database
-        cmu_records = Component.objects.values(
-            'cmu_id', 'company_name', 'delivery_year', 'auction_name'
-        ).distinct()
-        
-        # Convert to a DataFrame for backward compatibility
-        df_data = []
-        for record in cmu_records:
-            df_data.append({
-                "CMU ID": record['cmu_id'],
-                "Name of Applicant": record['company_name'],
-                "Full Name": record['company_name'],
-                "Delivery Year": record['delivery_year'],
-                "Auction Name": record['auction_name']
-            })
-        
-        cmu_df = pd.DataFrame(df_data)
-        
-        # Add normalized fields for searching
-        cmu_df["Normalized Full Name"] = cmu_df["Full Name"].apply(normalize)
-        cmu_df["Normalized CMU ID"] = cmu_df["CMU ID"].apply(normalize)
-        
-        # Cache the mappings for future use
-        cmu_to_company_mapping = {}
-        for _, row in cmu_df.iterrows():
-            cmu_id = row.get("CMU ID", "").strip()
-            if cmu_id and cmu_id != "N/A":
-                cmu_to_company_mapping[cmu_id] = row.get("Full Name", "")
-                
-        # Cache the company mapping with 1-day expiration
-        cache.set("cmu_to_company_mapping", cmu_to_company_mapping, 3600 * 24)
-        
-        # Serialize and cache the dataframe with Redis for 1 week
-        try:
-            serialized_df = base64.b64encode(pickle.dumps(cmu_df)).decode('utf-8')
-            cache.set(CACHE_KEY, serialized_df, CACHE_TTL)
-            logger.info(f"Cached CMU dataframe in Redis ({len(cmu_df)} records, expires in 7 days)")
-        except Exception as e:
-            logger.error(f"Error serializing CMU dataframe for Redis: {str(e)}")
-            # Still return the dataframe even if caching fails
+        # Single-flight: one worker rebuilds an expired dataframe, the rest get the stale copy
+        # The cache serializer pickles and compresses the dataframe itself (no base64 wrapping)
+        cmu_df = get_or_build(
+            CACHE_KEY, _build_cmu_dataframe, CACHE_TTL, CACHE_TTL * 2, force=force_rebuild
+        )
         
         api_time = time.time() - start_time
-        logger.info(f"Built CMU dataframe from database in {api_time:.4f}s")
+        logger.info(f"Loaded CMU dataframe ({len(cmu_df)} records) in {api_time:.4f}s")
         return cmu_df, api_time
     
     except Exception as e:
@@ -225,8 +214,7 @@ def get_cmu_dataframe(force_rebuild=False):
             
             # Try to cache this fallback dataframe too
             try:
-                serialized_df = base64.b64encode(pickle.dumps(cmu_df)).decode('utf-8')
-                cache.set(CACHE_KEY, serialized_df, CACHE_TTL)
+                store(CACHE_KEY, cmu_df, CACHE_TTL, CACHE_TTL * 2)
                 logger.info(f"Cached fallback CMU dataframe in Redis ({len(cmu_df)} records)")
             except:
                 pass
@@ -518,8 +506,8 @@ def fetch_components_for_cmu_id(cmu_id, limit=None, page=1, per_page=100, sort_o
             queryset = Component.objects.filter(query_filter)
             logger.info(f"Multi-term search for: {cmu_id}")
         
-        # Make the queryset distinct to avoid duplicates
-        queryset = queryset.distinct()
+        # Make the queryset distinct to avoid duplicates (raw payloads joined for the additional data below)
+        queryset = queryset.select_related('raw_payload').distinct()
         
         # Get total count for pagination
         total_count = queryset.count()
@@ -558,11 +546,11 @@ def fetch_components_for_cmu_id(cmu_id, limit=None, page=1, per_page=100, sort_o
         # Apply sorting based on sort_order
         if sort_order == "asc":
             # Oldest first - ascending delivery year
-            queryset = queryset.order_by('delivery_year')
+            queryset = queryset.order_by(F('delivery_year_start').asc(nulls_last=True), 'delivery_year')
             logger.info("Sorting by delivery year (oldest first)")
         else:
             # Newest first - descending delivery year (default)
-            queryset = queryset.order_by('-delivery_year')
+            queryset = queryset.order_by(F('delivery_year_start').desc(nulls_last=True), '-delivery_year')
             logger.info("Sorting by delivery year (newest first)")
         
         # Apply pagination
@@ -1362,7 +1350,7 @@ def get_components_from_database(cmu_id=None, component_id=None, location=None,
     if sort_by == 'relevance' and rank_annotation_exists:
         primary_sort_field = F('rank').desc(nulls_last=True) if sort_order == 'desc' else F('rank').asc(nulls_first=True)
         order_by_fields.append(primary_sort_field)
-        order_by_fields.append('-delivery_year') # Secondary sort: newest first
+        order_by_fields.append(F('delivery_year_start').desc(nulls_last=True)) # Secondary sort: newest first
         logger.info(f"Primary sort: Relevance ({sort_order})")
     elif sort_by == 'location':
         # Enhanced location sorting: 
@@ -1379,20 +1367,20 @@ def get_components_from_database(cmu_id=None, component_id=None, location=None,
             order_by_fields.append(F('location').asc(nulls_last=True))
         
         # Add delivery year as tertiary sort
-        order_by_fields.append('-delivery_year') # Secondary sort: newest first
+        order_by_fields.append(F('delivery_year_start').desc(nulls_last=True)) # Secondary sort: newest first
         logger.info(f"Enhanced location sort: County -> Location -> Date ({sort_order})")
     elif sort_by == 'delivery_year': # Explicitly check for the backend key
-        field = 'delivery_year'
-        primary_sort_field = F(field).desc(nulls_last=True) if sort_order == 'desc' else F(field).asc(nulls_first=True)
+        field = 'delivery_year_start'
+        primary_sort_field = F(field).desc(nulls_last=True) if sort_order == 'desc' else F(field).asc(nulls_last=True)
         order_by_fields.append(primary_sort_field)
         logger.info(f"Primary sort: Date ({sort_order})")
     else: # Default sort if 'sort_by' is unrecognized or missing
         if rank_annotation_exists: # If relevance rank exists, use it as default
              order_by_fields.append(F('rank').desc(nulls_last=True)) # Default relevance: highest first
-             order_by_fields.append('-delivery_year') # Secondary sort: newest first
+             order_by_fields.append(F('delivery_year_start').desc(nulls_last=True)) # Secondary sort: newest first
              logger.warning(f"Unrecognized sort_by ('{sort_by}'), defaulting to relevance descending.")
         else: # Fallback default: date descending
-             order_by_fields.append('-delivery_year')
+             order_by_fields.append(F('delivery_year_start').desc(nulls_last=True))
              logger.warning(f"Unrecognized sort_by ('{sort_by}') and no relevance rank, defaulting to date descending.")
 
     if order_by_fields:
@@ -1446,7 +1434,7 @@ def get_components_from_database(cmu_id=None, component_id=None, location=None,
     fields_to_select = [
         'id', 'cmu_id', 'location', 'description', 'technology',
         'company_name', 'auction_name', 'delivery_year', 'status', 'type',
-        'component_id', 'additional_data', 'derated_capacity_mw'
+        'component_id', 'raw_payload_id', 'derated_capacity_mw'
     ]
     # Conditionally add rank if it was annotated
     if 'rank' in final_query.query.annotations: # Check if rank was added earlier
@@ -1461,6 +1449,10 @@ def get_components_from_database(cmu_id=None, component_id=None, location=None,
         
         # Execute the query and fetch results as dictionaries
         component_dicts = list(final_query.values(*fields_to_select))
+        # Raw records live in RawPayload - decode this page's in one query
+        records = RawPayload.objects.records(row['raw_payload_id'] for row in component_dicts)
+        for row in component_dicts:
+            row['additional_data'] = records.get(row.pop('raw_payload_id'), {})
         
         # Calculate and log the fetch time
         debug_fetch_time = time.time() - debug_fetch_start
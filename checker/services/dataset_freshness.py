@@ -0,0 +1,119 @@
+"""
+Dataset freshness probe.
+
+A handful of cheap API calls per resource (resource_show, a limit=0 total and a
+few sampled pages) tell us whether the NESO data changed since the last
+successful pipeline run. When nothing changed the crawl, LocationGroup
+rebuild and cache warm are skipped entirely.
+"""
+import hashlib
+import json
+import logging
+
+import requests
+
+from ..models import DatasetSnapshot
+from .neso_api import RESOURCES, get_action_url, get_api_url
+
+logger = logging.getLogger(__name__)
+
+SAMPLE_PAGE_SIZE = 100
+
+
+def _get(url, params):
+    response = requests.get(url, params=params, timeout=30)
+    response.raise_for_status()
+    data = response.json()
+    if not data.get('success'):
+        raise ValueError(f"NESO API request unsuccessful: {data.get('error', 'Unknown error')}")
+    return data.get('result', {})
+
+
+def sample_checksum(resource_id, total, page_size=SAMPLE_PAGE_SIZE):
+    """
+    sha256 over the first, middle and last pages of a resource.
+    Catches in-place edits that leave the record total unchanged.
+    """
+    offsets = sorted({0, max(total // 2 - page_size // 2, 0), max(total - page_size, 0)})
+    digest = hashlib.sha256()
+    for offset in offsets:
+        result = _get(get_api_url(), {'resource_id': resource_id, 'limit': page_size, 'offset': offset})
+        for record in result.get('records', []):
+            digest.update(json.dumps(record, sort_keys=True, default=str).encode('utf-8'))
+    return digest.hexdigest()
+
+
+def probe_resource(resource_id):
+    """Current metadata for one resource: last_modified, record_total, sample_checksum"""
+    try:
+        last_modified = _get(get_action_url('resource_show'), {'id': resource_id}).get('last_modified')
+    except Exception as e:
+        # Not every CKAN deployment exposes resource_show - total + checksum still decide
+        logger.warning(f"resource_show failed for {resource_id}: {e}")
+        last_modified = None
+
+    total = _get(get_api_url(), {'resource_id': resource_id, 'limit': 0}).get('total', 0)
+    return {
+        'resource_id': resource_id,
+        'last_modified': last_modified,
+        'record_total': total,
+        'sample_checksum': sample_checksum(resource_id, total),
+    }
+
+
+def probe_all():
+    """Probe every crawled resource: {name: probe dict}"""
+    return {name: probe_resource(resource_id) for name, resource_id in RESOURCES.items()}
+
+
+def compare_with_snapshots(probes):
+    """
+    Compare probes against the recorded snapshots.
+    Returns a list of human-readable change reasons; empty means nothing changed.
+    """
+    snapshots = {s.resource_id: s for s in DatasetSnapshot.objects.filter(
+        resource_id__in=[p['resource_id'] for p in probes.values()]
+    )}
+
+    reasons = []
+    for name, probe in probes.items():
+        snapshot = snapshots.get(probe['resource_id'])
+        if snapshot is None:
+            reasons.append(f"{name}: no snapshot recorded yet")
+            continue
+        if probe['last_modified'] and probe['last_modified'] != snapshot.last_modified:
+            reasons.append(f"{name}: last_modified {snapshot.last_modified} -> {probe['last_modified']}")
+        if probe['record_total'] != snapshot.record_total:
+            reasons.append(f"{name}: total {snapshot.record_total} -> {probe['record_total']}")
+        if probe['sample_checksum'] != snapshot.sample_checksum:
+            reasons.append(f"{name}: sampled pages changed")
+    return reasons
+
+
+def check_freshness():
+    """
+    Probe the API and decide whether a crawl is needed.
+    Returns (crawl_needed, reasons, probes). Probe failures err on the side of crawling.
+    """
+    try:
+        probes = probe_all()
+    except Exception as e:
+        logger.error(f"Freshness probe failed: {e}")
+        return True, [f"probe failed: {e}"], {}
+
+    reasons = compare_with_snapshots(probes)
+    return bool(reasons), reasons, probes
+
+
+def record_snapshots(probes):
+    """Persist probes as the new baseline - call only after the pipeline succeeded"""
+    for name, probe in probes.items():
+        DatasetSnapshot.objects.update_or_create(
+            resource_id=probe['resource_id'],
+            defaults={
+                'name': name,
+                'last_modified': probe['last_modified'],
+                'record_total': probe['record_total'],
+                'sample_checksum': probe['sample_checksum'],
+            },
+        )
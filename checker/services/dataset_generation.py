@@ -0,0 +1,104 @@
+"""
+Dataset generation number for cache keys.
+
+TieredRedisCache prefixes every data-derived key with the active generation
+(`g<N>:`). After a crawl/rebuild a new generation is created, its caches are
+warmed inside `warming(N)`, and only then is it activated - every process
+switches to the pre-warmed keys within GENERATION_CHECK_INTERVAL seconds, and
+the previous generation's keys simply age out. No clear/delete scripts needed.
+"""
+import logging
+import threading
+import time
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DatabaseError
+from django.db.models import Max
+from django.utils import timezone
+
+from ..db_router import primary_reads
+from ..models import DatasetGeneration
+
+logger = logging.getLogger(__name__)
+
+GENERATION_KEY = 'dataset:generation'  # exempt from generation prefixing (see cache_backends)
+GENERATION_CHECK_INTERVAL = getattr(settings, 'DATASET_GENERATION_CHECK_INTERVAL', 5)
+
+_override = threading.local()
+_active = {'generation': None, 'checked_at': 0.0}
+
+
+def _active_generation_from_db():
+    try:
+        number = (
+            DatasetGeneration.objects.filter(activated_at__isnull=False)
+            .aggregate(number=Max('number'))['number']
+        )
+    except DatabaseError:
+        # Table not migrated yet
+        return 0
+    return number or 0
+
+
+def _load_active_generation():
+    try:
+        generation = cache.get(GENERATION_KEY)
+    except Exception as e:
+        logger.warning(f"Could not read dataset generation from cache: {e}")
+        generation = None
+    if generation is None:
+        generation = _active_generation_from_db()
+        try:
+            cache.set(GENERATION_KEY, generation, None)
+        except Exception:
+            pass
+    return generation
+
+
+def current_generation():
+    """Generation used for cache keys in this thread: the warming override or the active one"""
+    override = getattr(_override, 'generation', None)
+    if override is not None:
+        return override
+
+    now = time.monotonic()
+    if _active['generation'] is None or now - _active['checked_at'] >= GENERATION_CHECK_INTERVAL:
+        _active['generation'] = _load_active_generation()
+        _active['checked_at'] = now
+    return _active['generation']
+
+
+@contextmanager
+def warming(generation):
+    """
+    Route this thread's cache reads/writes to `generation` (e.g. to pre-warm it
+    before activation). Database reads stay on the primary meanwhile: a replica
+    may not have the rebuild yet, and whatever is read gets cached for the
+    generation's whole lifetime.
+    """
+    previous = getattr(_override, 'generation', None)
+    _override.generation = generation
+    try:
+        with primary_reads():
+            yield generation
+    finally:
+        _override.generation = previous
+
+
+def begin_generation(note=''):
+    """Create the next (not yet active) generation and return its number"""
+    latest = DatasetGeneration.objects.aggregate(number=Max('number'))['number'] or 0
+    generation = DatasetGeneration.objects.create(number=latest + 1, note=note[:255])
+    logger.info(f"Created dataset generation {generation.number}")
+    return generation.number
+
+
+def activate_generation(number):
+    """Flip every process to `number`; the old generation's keys are left to expire"""
+    DatasetGeneration.objects.filter(number=number).update(activated_at=timezone.now())
+    cache.set(GENERATION_KEY, number, None)
+    _active['generation'] = number
+    _active['checked_at'] = time.monotonic()
+    logger.info(f"Activated dataset generation {number}")
@@ -0,0 +1,151 @@
+"""
+Persistent geocode cache keyed by normalized address.
+
+geocode_components groups each batch of components by normalized address,
+resolves every distinct address once (cache -> offline postcode table -> Google)
+and writes coordinates back with a single bulk update.
+"""
+import logging
+import re
+import time
+
+import requests
+
+from ..models import GeocodeCache
+from .postcode_centroids import geocode_location
+
+logger = logging.getLogger(__name__)
+
+GOOGLE_GEOCODE_URL = 'https://maps.googleapis.com/maps/api/geocode/json'
+
+
+def normalize_address(address):
+    """Case/punctuation/whitespace-insensitive key: 'Asda,  Main St.' -> 'asda main st'"""
+    if not address:
+        return ''
+    normalized = re.sub(r'[^\w\s]', ' ', str(address).lower())
+    return re.sub(r'\s+', ' ', normalized).strip()
+
+
+def _cacheable(normalized):
+    # Truncating to the column would let two long addresses share one cached coordinate
+    return len(normalized) <= GeocodeCache._meta.get_field('normalized_address').max_length
+
+
+def get_cached_geocodes(normalized_addresses):
+    """Bulk fetch cached results: {normalized_address: GeocodeCache}"""
+    return {
+        entry.normalized_address: entry
+        for entry in GeocodeCache.objects.filter(
+            normalized_address__in=[address for address in normalized_addresses if _cacheable(address)]
+        )
+    }
+
+
+def store_geocodes(entries):
+    """Insert new cache entries in one statement; existing keys are left untouched"""
+    entries = [entry for entry in entries if _cacheable(entry.normalized_address)]
+    if entries:
+        GeocodeCache.objects.bulk_create(entries, ignore_conflicts=True)
+
+
+def geocode_with_google(address, api_key):
+    """
+    Call the Google Geocoding API once.
+    Returns (status, lat, lng); status is the API status or 'ERROR' on transport failure.
+    """
+    try:
+        response = requests.get(
+            GOOGLE_GEOCODE_URL,
+            params={
+                'address': address,
+                'key': api_key,
+                'region': 'uk'  # Focus on UK
+            },
+            timeout=10,
+        )
+        data = response.json()
+    except Exception as e:
+        logger.error(f"Error geocoding '{address}': {e}")
+        return 'ERROR', None, None
+
+    if data.get('status') == 'OK' and data.get('results'):
+        location = data['results'][0]['geometry']['location']
+        return 'OK', location['lat'], location['lng']
+    return data.get('status', 'ERROR'), None, None
+
+
+def _centroid_fields(centroid):
+    return {key: centroid[key] for key in ('postcode', 'outward_code', 'county')}
+
+
+def resolve_addresses(addresses, api_key=None, use_google=True):
+    """
+    Resolve a {normalized_address: raw_address} map, one lookup per distinct address.
+
+    Returns (results, stats) where results maps normalized_address -> a dict
+    with 'latitude'/'longitude' for every address that resolved, plus the
+    postcode centroid's 'postcode'/'outward_code'/'county' when the address
+    contains a known postcode; stats counts where answers came from.
+    Definitive misses (ZERO_RESULTS) are cached too so they are never retried;
+    transient API errors are not.
+    """
+    stats = {'cache': 0, 'offline': 0, 'google': 0, 'failed': 0}
+    results = {}
+
+    cached = get_cached_geocodes(addresses.keys())
+    new_entries = []
+
+    for normalized, raw in addresses.items():
+        entry = cached.get(normalized)
+        if entry is not None:
+            stats['cache'] += 1
+            if entry.status == 'OK':
+                results[normalized] = {'latitude': entry.latitude, 'longitude': entry.longitude}
+                if entry.source == 'offline':
+                    # The cache only keeps coordinates; the table lookup is cheap
+                    centroid = geocode_location(raw)
+                    if centroid:
+                        results[normalized].update(_centroid_fields(centroid))
+            else:
+                stats['failed'] += 1
+            continue
+
+        centroid = geocode_location(raw)
+        if centroid:
+            stats['offline'] += 1
+            results[normalized] = {
+                'latitude': centroid['latitude'],
+                'longitude': centroid['longitude'],
+                **_centroid_fields(centroid),
+            }
+            new_entries.append(GeocodeCache(
+                normalized_address=normalized,
+                latitude=centroid['latitude'],
+                longitude=centroid['longitude'],
+                source='offline',
+            ))
+            continue
+
+        if not use_google or not api_key:
+            stats['failed'] += 1
+            continue
+
+        status, lat, lng = geocode_with_google(raw, api_key)
+        stats['google'] += 1
+        # Sleep to avoid hitting API rate limits
+        time.sleep(0.2)
+        if status == 'OK':
+            results[normalized] = {'latitude': lat, 'longitude': lng}
+            new_entries.append(GeocodeCache(
+                normalized_address=normalized, latitude=lat, longitude=lng, source='google',
+            ))
+        else:
+            stats['failed'] += 1
+            if status == 'ZERO_RESULTS':
+                new_entries.append(GeocodeCache(
+                    normalized_address=normalized, status=status, source='google',
+                ))
+
+    store_geocodes(new_entries)
+    return results, stats
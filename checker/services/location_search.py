@@ -9,8 +9,7 @@ from django.db import models
 from django.db.models import Q, F
 from django.core.cache import cache
 
-from ..models import LocationGroup, Component
-from .company_search import get_cmu_dataframe
+from ..models import CMUSummary, LocationGroup, Component
 
 logger = logging.getLogger(__name__)
 
@@ -134,7 +133,7 @@ def get_location_components(location, description=None, cmu_id=None, auction_yea
         components = components.filter(auction_name__icontains=auction_year)
     
     # Order by delivery year descending, then by description
-    components = components.order_by('-delivery_year', 'description')
+    components = components.order_by(F('delivery_year_start').desc(nulls_last=True), 'description')
     
     return components
 
@@ -145,9 +144,17 @@ def prepare_location_display_data(location_group):
     Organizes components by description, CMU, and auction year.
     """
     # Get all components for this location
-    components = Component.objects.filter(location=location_group.location).order_by(
-        'description', 'cmu_id', '-delivery_year'
+    newest_first = F('delivery_year_start').desc(nulls_last=True)
+    # The location filter drops components whose location changed since they were linked
+    components = list(
+        location_group.components.filter(location=location_group.location)
+        .order_by('description', 'cmu_id', newest_first)
     )
+    if not components:
+        # Components not linked by build_location_groups yet
+        components = Component.objects.filter(location=location_group.location).order_by(
+            'description', 'cmu_id', newest_first
+        )
     
     # Organize by description -> CMU -> Auction
     organized_data = {}
@@ -181,33 +188,29 @@ def check_cmu_aggregation(location_group):
     Check if this location is part of an aggregated CMU.
     Returns information about the aggregation if found.
     """
-    # Get a sample component from this location
-    sample_component = Component.objects.filter(location=location_group.location).first()
-    if not sample_component:
+    cmu_ids = location_group.cmu_ids
+    if isinstance(cmu_ids, dict):
+        # Old sampled format
+        cmu_ids = cmu_ids.get('sample', [])
+    if not cmu_ids:
         return None
     
-    # Count how many locations this CMU spans
-    cmu_locations = Component.objects.filter(
-        cmu_id=sample_component.cmu_id
-    ).values('location').distinct().count()
-    
-    if cmu_locations > 1:
-        # This is part of an aggregated CMU
-        # Get the CMU data to find total capacity
-        cmu_df, _ = get_cmu_dataframe()
-        if cmu_df is not None and not cmu_df.empty:
-            # Find the CMU data by filtering
-            cmu_data = cmu_df[cmu_df["CMU ID"] == sample_component.cmu_id]
-            if not cmu_data.empty:
-                cmu_row = cmu_data.iloc[0]
-                total_capacity = cmu_row.get('De-rated Capacity (MW)', 0)
-                
-                return {
-                    'is_aggregated': True,
-                    'cmu_id': sample_component.cmu_id,
-                    'total_locations': cmu_locations,
-                    'total_capacity': total_capacity,
-                    'applicant': cmu_row.get('Name of Applicant', 'Unknown'),
-                }
-    
-    return {'is_aggregated': False}
\ No newline at end of file
+    # CMU summaries are precomputed with the LocationGroups - one indexed lookup
+    summary = (
+        CMUSummary.objects.filter(cmu_id__in=cmu_ids, is_aggregated=True)
+        .order_by('-location_count', 'cmu_id')
+        .first()
+    )
+    if summary is None:
+        return {'is_aggregated': False}
+    
+    total_capacity = summary.derated_capacity_mw
+    if total_capacity is None:
+        total_capacity = summary.total_capacity_mw
+    return {
+        'is_aggregated': True,
+        'cmu_id': summary.cmu_id,
+        'total_locations': summary.location_count,
+        'total_capacity': total_capacity,
+        'applicant': summary.company_name or 'Unknown',
+    }
\ No newline at end of file
@@ -0,0 +1,164 @@
+"""
+Narrow map projection of LocationGroups.
+
+LocationGroup rows carry wide JSON columns (descriptions, cmu_ids, companies,
+technologies), so map queries that scan them drag TOASTed JSON through the
+buffer cache even with .only(). LocationMapPoint keeps one narrow row per
+geocoded group - coordinates, a grid key, a canonical technology bitmask and
+the marker fields - rebuilt after each LocationGroup build. Map endpoints
+filter, count and order on it and read the wide rows only for the page of
+markers whose popups need them.
+"""
+import logging
+import math
+
+from django.db import transaction
+from django.db.models import F, Q
+
+from ..models import LocationGroup, LocationMapPoint
+
+logger = logging.getLogger(__name__)
+
+# Canonical map technologies and the LocationGroup technology names that belong to each
+TECH_VARIATIONS = {
+    'CHP': ['CHP', 'Combined Heat and Power (CHP)', 'CHP and autogeneration'],
+    'DSR': ['DSR', 'Demand Side Response'],
+    'EV Charging': ['EV Charging'],
+    'Battery': ['Battery', 'Battery Storage', 'Battery storage', 'Storage', 'Storage (Duration 0.5h)', 'Storage (Duration 1h)', 'Storage (Duration 1.5h)', 'Storage (Duration 2h)', 'Storage (Duration 2.5h)', 'Storage (Duration 3h)', 'Storage (Duration 3.5h)', 'Storage (Duration 4h)', 'Storage (Duration 4.5h)', 'Storage (Duration 5h)', 'Storage (Duration 5.5h)', 'Storage (Duration 6h)', 'Storage (Duration 7h)', 'Storage (Duration 8h)', 'Storage (Duration 8.5h)', 'Storage (Duration 9h)', 'Storage (Duration 9.5h)', 'Storage (Duration 12h)'],
+    'OCGT': ['Gas', 'Gas - OCGTs and reciprocating engines', 'Gas reciprocating engines', 'OCGT', 'Combined Cycle Gas Turbine (CCGT)', 'Open Cycle Gas Turbine (OCGT)', 'OCGT and Reciprocating Engines', 'OCGT and Reciprocating Engines (Fuel Type - Diesel)', 'OCGT and Reciprocating Engines (Fuel Type - Gas)', 'Reciprocating engines'],
+    'Wind': ['Wind', 'Onshore Wind', 'Offshore Wind'],
+    'Solar': ['Solar', 'Solar Photovoltaic', 'Solar Photovoltaics'],
+    'Nuclear': ['Nuclear'],
+    'Hydro': ['Hydro', 'Hydro Power', 'Pumped Storage Hydro'],
+    'Biomass': ['Biomass', 'Biomass and waste', 'Energy from Waste', 'Coal/biomass'],
+    'Interconnector': ['Interconnector', 'Interconnection', 'BritNED (Netherlands)', 'Eleclink (France)', 'EWIC (Ireland)', 'EWIC (Republic of Ireland)', 'Greenlink (Republic of Ireland)', 'IFA2 (France)', 'IFA (France)', 'Moyle (Northern Ireland)', 'NEMO (Belgium)', 'NeuConnect (Germany)', 'NSL (Norway)', 'VikingLink (Denmark)'],
+    'Coal': ['Coal'],
+}
+TECH_BITS = {tech: 1 << index for index, tech in enumerate(TECH_VARIATIONS)}
+_BITS_BY_NAME = {}
+for _tech, _names in TECH_VARIATIONS.items():
+    for _name in _names:
+        _BITS_BY_NAME[_name] = _BITS_BY_NAME.get(_name, 0) | TECH_BITS[_tech]
+
+RESIDENTIAL_COMPANIES = ('AXLE ENERGY LIMITED', 'OCTOPUS ENERGY LIMITED')
+
+# spatial_key grid: 0.1 degree cells numbered row by row
+GRID_STEP = 0.1
+GRID_COLUMNS = 3601
+# Viewports spanning more rows than this filter on latitude/longitude alone
+MAX_KEY_BANDS = 32
+
+
+def _grid_row(latitude):
+    return int(math.floor((latitude + 90) / GRID_STEP))
+
+
+def _grid_column(longitude):
+    return int(math.floor((longitude + 180) / GRID_STEP))
+
+
+def spatial_key(latitude, longitude):
+    return _grid_row(latitude) * GRID_COLUMNS + _grid_column(longitude)
+
+
+def tech_mask(technologies):
+    """Canonical technology bits for a LocationGroup.technologies dict"""
+    mask = 0
+    for name in (technologies or {}):
+        mask |= _BITS_BY_NAME.get(name, 0)
+    return mask
+
+
+def viewport_q(south, west, north, east):
+    """
+    Q for points inside the bounds. Small viewports also get one spatial_key
+    range per grid row, so the key index narrows the scan before the exact check.
+    """
+    bounds = Q(latitude__gte=south, latitude__lte=north, longitude__gte=west, longitude__lte=east)
+    rows = range(_grid_row(south), _grid_row(north) + 1)
+    if west > east or len(rows) > MAX_KEY_BANDS:
+        return bounds
+    first_column, last_column = _grid_column(west), _grid_column(east)
+    bands = Q()
+    for row in rows:
+        bands |= Q(spatial_key__range=(row * GRID_COLUMNS + first_column, row * GRID_COLUMNS + last_column))
+    return bands & bounds
+
+
+def filter_technology(points, technology):
+    """
+    Restrict points to a canonical technology by its bit; names that are not
+    canonical fall back to the LocationGroup technologies JSON
+    """
+    bit = TECH_BITS.get(technology)
+    if bit is None:
+        return points.filter(location_group__technologies__has_key=technology)
+    return points.alias(tech_bit=F('tech_mask').bitand(bit)).filter(tech_bit=bit)
+
+
+def display_technology(point, technology):
+    """Marker technology: the location's own name for the filtered technology when it has one"""
+    if technology and technology != 'All':
+        if point.primary_technology in TECH_VARIATIONS.get(technology, ()):
+            return point.primary_technology
+        return technology
+    return point.primary_technology or 'Unknown'
+
+
+def popup_rows(point_ids, fields):
+    """{LocationGroup id: {field: value}} for the wide fields a page of markers shows"""
+    return {
+        row['id']: row
+        for row in LocationGroup.objects.filter(pk__in=point_ids).values('id', *fields)
+    }
+
+
+def _map_point(group):
+    companies = group.companies or {}
+    return LocationMapPoint(
+        location_group_id=group.pk,
+        latitude=group.latitude,
+        longitude=group.longitude,
+        spatial_key=spatial_key(group.latitude, group.longitude),
+        tech_mask=tech_mask(group.technologies),
+        primary_technology=group.get_primary_technology()[:100] if group.technologies else '',
+        primary_company=group.get_primary_company()[:255] if companies else '',
+        capacity_mw=group.normalized_capacity_mw or 0,
+        component_count=group.component_count or 0,
+        is_active=group.is_active,
+        is_residential=any(company in companies for company in RESIDENTIAL_COMPANIES),
+    )
+
+
+def build_map_points(locations=None):
+    """
+    Rebuild map points from LocationGroups (only those at `locations` when given)
+    and drop points for groups that lost their coordinates. Returns points written.
+    """
+    groups = LocationGroup.objects.filter(latitude__isnull=False, longitude__isnull=False).only(
+        'id', 'latitude', 'longitude', 'technologies', 'companies',
+        'normalized_capacity_mw', 'component_count', 'is_active',
+    )
+    stale = LocationMapPoint.objects.filter(
+        Q(location_group__latitude__isnull=True) | Q(location_group__longitude__isnull=True)
+    )
+    if locations is not None:
+        groups = groups.filter(location__in=locations)
+        stale = stale.filter(location_group__location__in=locations)
+
+    points = [_map_point(group) for group in groups.iterator(chunk_size=2000)]
+    with transaction.atomic():
+        LocationMapPoint.objects.bulk_create(
+            points,
+            batch_size=1000,
+            update_conflicts=True,
+            unique_fields=['location_group'],
+            update_fields=[
+                'latitude', 'longitude', 'spatial_key', 'tech_mask', 'primary_technology',
+                'primary_company', 'capacity_mw', 'component_count', 'is_active', 'is_residential',
+            ],
+        )
+        stale.delete()
+
+    logger.info(f"Built {len(points)} map points")
+    return len(points)
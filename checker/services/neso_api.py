@@ -0,0 +1,24 @@
+"""
+NESO CKAN endpoint and resource ids shared by the crawlers, the freshness
+probe and the local API stand-in.
+"""
+from django.conf import settings
+
+NESO_API_URL = "https://api.neso.energy/api/3/action/datastore_search"
+CMU_RESOURCE_ID = "25a5fa2e-873d-41c5-8aaf-fbc2b06d79e6"
+COMPONENT_RESOURCE_ID = "790f5fa0-f8eb-4d82-b98d-0d34d3e404e8"
+
+RESOURCES = {
+    'cmus': CMU_RESOURCE_ID,
+    'components': COMPONENT_RESOURCE_ID,
+}
+
+
+def get_api_url():
+    """Datastore endpoint - overridable via settings.NESO_API_URL (e.g. for benchmark_crawl)"""
+    return getattr(settings, 'NESO_API_URL', NESO_API_URL)
+
+
+def get_action_url(action):
+    """Another CKAN action on the same API, e.g. get_action_url('resource_show')"""
+    return get_api_url().rsplit('/', 1)[0] + '/' + action
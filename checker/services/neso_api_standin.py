@@ -0,0 +1,205 @@
+"""
+Local stand-in for the NESO CKAN datastore API.
+
+Serves `datastore_search` (and `resource_show`) for the CMU and component
+resources from recorded or synthetic records, with configurable latency,
+error rate and maximum page size. Used by `benchmark_crawl` so crawler
+performance work is reproducible without touching the real API.
+"""
+import json
+import logging
+import random
+import threading
+import time
+from collections import defaultdict
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from .neso_api import CMU_RESOURCE_ID, COMPONENT_RESOURCE_ID
+
+logger = logging.getLogger(__name__)
+
+_TECHNOLOGIES = ['Battery', 'Gas', 'Solar', 'Wind', 'CHP', 'DSR', 'OCGT']
+_AUCTIONS = ['T-4 2024-25', 'T-4 2025-26', 'T-1 2024-25', 'T-4 2027-28', 'T-3 2026-27']
+
+
+def synthetic_dataset(cmu_count=200, components_per_cmu=5, seed=42):
+    """Deterministic CMU and component records shaped like the real resources"""
+    rng = random.Random(seed)
+    cmus = []
+    components = []
+    for i in range(cmu_count):
+        cmu_id = f"BENCH{i:05d}"
+        company = f"Bench Energy {i % 37} Ltd"
+        cmus.append({
+            "_id": i + 1,
+            "CMU ID": cmu_id,
+            "Name of Applicant": company,
+            "Parent Company": f"Bench Holdings {i % 11}",
+            "Delivery Year": "2025",
+            "Auction": rng.choice(_AUCTIONS),
+        })
+        for j in range(components_per_cmu):
+            components.append({
+                "_id": f"{cmu_id}-{j}",
+                "CMU ID": cmu_id,
+                "Location and Post Code": f"Site {rng.randint(1, 5000)}, Bench Road, NG{rng.randint(1, 25)} {rng.randint(1, 9)}AB",
+                "Description of CMU Components": f"Unit {j + 1}",
+                "Generating Technology Class": rng.choice(_TECHNOLOGIES),
+                "Company Name": company,
+                "Auction Name": rng.choice(_AUCTIONS),
+                "Delivery Year": "2025",
+                "Status": "Prequalified",
+                "Type": "Existing",
+                "De-Rated Capacity": f"{rng.uniform(0.1, 50):.3f}",
+            })
+    return {"cmus": cmus, "components": components}
+
+
+def load_recorded_dataset(path):
+    """Load a recorded dataset: {"cmus": [...], "components": [...]} as returned by the API"""
+    with open(path) as f:
+        data = json.load(f)
+    return {"cmus": data.get("cmus", []), "components": data.get("components", [])}
+
+
+class NesoApiStandIn:
+    """
+    Threaded HTTP server emulating the subset of CKAN the crawlers use.
+
+    Usage:
+        with NesoApiStandIn(dataset, latency_ms=20, error_rate=0.01) as api:
+            settings.NESO_API_URL = api.datastore_url
+    """
+
+    def __init__(self, dataset, latency_ms=0, error_rate=0.0, page_size=None,
+                 host='127.0.0.1', port=0, seed=42, last_modified=None):
+        self.latency = latency_ms / 1000.0
+        self.error_rate = error_rate
+        self.page_size = page_size
+        self.last_modified = last_modified or datetime.now(timezone.utc).replace(microsecond=0).isoformat()
+        self._rng = random.Random(seed)
+        self._rng_lock = threading.Lock()
+        self.stats = defaultdict(int)
+        self._stats_lock = threading.Lock()
+
+        self.resources = {
+            CMU_RESOURCE_ID: dataset["cmus"],
+            COMPONENT_RESOURCE_ID: dataset["components"],
+        }
+        # The crawlers search components with q=<CMU ID>; index it like the datastore's full-text search would
+        self._components_by_cmu = defaultdict(list)
+        for record in dataset["components"]:
+            self._components_by_cmu[str(record.get("CMU ID", "")).upper()].append(record)
+
+        self.server = ThreadingHTTPServer((host, port), self._handler_class())
+        self.server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def base_url(self):
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}/api/3/action"
+
+    @property
+    def datastore_url(self):
+        return f"{self.base_url}/datastore_search"
+
+    def start(self):
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self._thread.start()
+        logger.info(f"NESO API stand-in listening on {self.base_url}")
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def _count(self, key, amount=1):
+        with self._stats_lock:
+            self.stats[key] += amount
+
+    def _should_fail(self):
+        if not self.error_rate:
+            return False
+        with self._rng_lock:
+            return self._rng.random() < self.error_rate
+
+    def search(self, resource_id, q=None, limit=100, offset=0):
+        records = self.resources.get(resource_id)
+        if records is None:
+            return None
+        if q:
+            if resource_id == COMPONENT_RESOURCE_ID and q.upper() in self._components_by_cmu:
+                records = self._components_by_cmu[q.upper()]
+            else:
+                needle = q.lower()
+                records = [r for r in records if any(needle in str(v).lower() for v in r.values())]
+        if self.page_size is not None:
+            limit = min(limit, self.page_size)
+        page = records[offset:offset + limit] if limit > 0 else []
+        return {"total": len(records), "records": page, "limit": limit, "offset": offset}
+
+    def _handler_class(self):
+        standin = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, format, *args):
+                pass  # Keep benchmark output clean
+
+            def _send(self, status, payload):
+                body = json.dumps(payload).encode('utf-8')
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+                standin._count('bytes_sent', len(body))
+
+            def do_GET(self):
+                standin._count('requests')
+                if standin.latency:
+                    time.sleep(standin.latency)
+                if standin._should_fail():
+                    standin._count('errors_injected')
+                    self._send(500, {"success": False, "error": {"message": "Injected error"}})
+                    return
+
+                parsed = urlparse(self.path)
+                params = {k: v[-1] for k, v in parse_qs(parsed.query).items()}
+                action = parsed.path.rstrip('/').rsplit('/', 1)[-1]
+
+                if action == 'datastore_search':
+                    try:
+                        limit = int(params.get('limit') or 100)
+                        offset = int(params.get('offset') or 0)
+                    except ValueError:
+                        self._send(400, {"success": False, "error": {"message": "Bad limit/offset"}})
+                        return
+                    result = standin.search(params.get('resource_id'), params.get('q'), limit, offset)
+                    if result is None:
+                        self._send(404, {"success": False, "error": {"message": "Resource not found"}})
+                        return
+                    standin._count('records_served', len(result['records']))
+                    self._send(200, {"success": True, "result": result})
+                elif action == 'resource_show':
+                    resource_id = params.get('id')
+                    if resource_id not in standin.resources:
+                        self._send(404, {"success": False, "error": {"message": "Resource not found"}})
+                        return
+                    self._send(200, {"success": True, "result": {
+                        "id": resource_id,
+                        "last_modified": standin.last_modified,
+                        "datastore_active": True,
+                    }})
+                else:
+                    self._send(404, {"success": False, "error": {"message": f"Unknown action {action}"}})
+
+        return Handler
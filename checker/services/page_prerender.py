@@ -0,0 +1,144 @@
+"""
+Pre-rendered detail pages.
+
+After a rebuild every LocationGroup, company, technology and CMU page is
+rendered once for anonymous visitors (through the normal view stack, so the
+HTML is exactly what the view would return), gzipped and stored in
+PrerenderedPage. PrerenderedPageMiddleware then answers anonymous GETs for
+those paths with the stored bytes - one indexed lookup instead of the view's
+queries and template rendering.
+
+Rows carry the dataset generation and release they were rendered for and are
+only served while both still match, so a generation flip or a deploy falls
+back to live rendering until `prerender_pages` has run again.
+"""
+import gzip
+import logging
+import re
+
+from django.conf import settings
+from django.db import connections, transaction
+from django.test import Client
+from django.urls import reverse
+from django.utils import timezone
+from django.utils.text import slugify
+
+from ..models import Component, LocationGroup, PrerenderedPage
+from .dataset_generation import current_generation, warming
+from .traffic_sketch import WARMER_USER_AGENT
+
+logger = logging.getLogger(__name__)
+
+PAGE_KINDS = ('location', 'company', 'technology', 'cmu')
+COMPRESS_LEVEL = getattr(settings, 'PRERENDER_COMPRESS_LEVEL', 9)  # Compressed once, served many times
+RELEASE = getattr(settings, 'RELEASE_VERSION', '')
+
+# Same view, second URL - served from the canonical row
+_PATH_ALIASES = [
+    (re.compile(r'^/locations/(\d+)/$'), r'/location/\1/'),
+]
+
+
+def canonical_path(path):
+    for pattern, replacement in _PATH_ALIASES:
+        if pattern.match(path):
+            return pattern.sub(replacement, path)
+    return path
+
+
+def page_paths(kinds=PAGE_KINDS):
+    """{kind: [path, ...]} for every page to pre-render"""
+    paths = {}
+    if 'location' in kinds:
+        paths['location'] = [
+            reverse('location_detail', args=[pk])
+            for pk in LocationGroup.objects.order_by('-component_count').values_list('pk', flat=True)
+        ]
+
+    if 'company' in kinds or 'technology' in kinds:
+        companies, technologies = set(), set()
+        for company_counts, tech_counts in LocationGroup.objects.values_list('companies', 'technologies').iterator():
+            companies.update(company_counts or {})
+            technologies.update(tech_counts or {})
+        if 'company' in kinds:
+            # Sitemap links use slugs, in-page links the raw name - both are served
+            names = sorted(({slugify(name) for name in companies} | companies) - {''})
+            paths['company'] = [reverse('company_detail_map', kwargs={'company_name': name}) for name in names]
+        if 'technology' in kinds:
+            # The view matches on the raw name
+            paths['technology'] = [
+                reverse('technology_detail_map', kwargs={'technology_name': name})
+                for name in sorted(technologies - {''})
+            ]
+
+    if 'cmu' in kinds:
+        cmu_ids = (
+            Component.objects.exclude(cmu_id__isnull=True).exclude(cmu_id='')
+            .values_list('cmu_id', flat=True).distinct().order_by('cmu_id')
+        )
+        paths['cmu'] = [reverse('cmu_detail_map', kwargs={'cmu_id': cmu_id}) for cmu_id in cmu_ids]
+    return paths
+
+
+def render_pages(paths, generation):
+    """Render paths as an anonymous visitor for `generation`. Returns ([(path, gzipped html)], failed paths)."""
+    client = Client(HTTP_USER_AGENT=WARMER_USER_AGENT, HTTP_HOST='localhost')
+    rendered, failed = [], []
+    with warming(generation):
+        for path in paths:
+            try:
+                response = client.get(path)
+            except Exception as e:
+                logger.warning(f"Pre-render of {path} failed: {e}")
+                failed.append(path)
+                continue
+            if response.status_code != 200 or not response['Content-Type'].startswith('text/html'):
+                failed.append(path)
+                continue
+            content = response.content
+            if response.get('Content-Encoding') == 'gzip':
+                content = gzip.decompress(content)
+            # Keyed by the decoded canonical path, as the middleware looks it up
+            body = gzip.compress(content, compresslevel=COMPRESS_LEVEL, mtime=0)
+            rendered.append((canonical_path(response.wsgi_request.path), body))
+    return rendered, failed
+
+
+def render_partition(paths, generation):
+    """Worker entry point: render one partition and hand the bodies back to the parent to store"""
+    try:
+        return render_pages(paths, generation)
+    finally:
+        connections.close_all()
+
+
+def store_pages(rendered, generation):
+    rendered_at = timezone.now()
+    pages = [
+        PrerenderedPage(path=path, generation=generation, release=RELEASE, body=body, rendered_at=rendered_at)
+        for path, body in rendered
+    ]
+    with transaction.atomic():
+        PrerenderedPage.objects.bulk_create(
+            pages,
+            batch_size=200,
+            update_conflicts=True,
+            unique_fields=['path'],
+            update_fields=['generation', 'release', 'body', 'rendered_at'],
+        )
+
+
+def prune_pages(generation):
+    """Drop pages not re-rendered for `generation` (entities that no longer exist)"""
+    deleted, _ = PrerenderedPage.objects.filter(generation__lt=generation).delete()
+    return deleted
+
+
+def lookup(path):
+    """(gzipped body, rendered_at) for path if it was rendered for the live generation and release"""
+    return (
+        PrerenderedPage.objects
+        .filter(path=canonical_path(path), generation=current_generation(), release=RELEASE)
+        .values_list('body', 'rendered_at')
+        .first()
+    )
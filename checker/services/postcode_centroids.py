@@ -0,0 +1,200 @@
+"""
+Offline postcode geocoder backed by a memory-mapped centroid table.
+
+The table is built once from an ONS-style postcode CSV (ONSPD / NSPL / Code-Point
+exports all work) by `python manage.py build_postcode_centroids` and is then
+resolved by binary search over fixed-width records - no network, no API cost.
+
+File layout:
+    header:  b'PCC1' + uint32 record count
+    records: sorted by normalized postcode (upper case, no spaces)
+             7s postcode | f64 lat | f64 lng | 4s outward code | 40s county
+"""
+import csv
+import logging
+import mmap
+import os
+import re
+import struct
+import threading
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TABLE_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    'data', 'postcodes', 'postcode_centroids.bin'
+)
+
+MAGIC = b'PCC1'
+HEADER = struct.Struct('<4sI')
+RECORD = struct.Struct('<7sdd4s40s')
+
+# Full UK postcode anywhere in a free-text location string
+FULL_POSTCODE_RE = re.compile(r'\b([A-Z]{1,2}[0-9][A-Z0-9]?)\s*([0-9][A-Z]{2})\b', re.IGNORECASE)
+
+
+def normalize_postcode(postcode):
+    """'sw1a 1aa' -> 'SW1A1AA' (the table's sort key)"""
+    if not postcode:
+        return ''
+    return re.sub(r'\s+', '', str(postcode)).upper()
+
+
+def format_postcode(normalized):
+    """'SW1A1AA' -> 'SW1A 1AA'"""
+    return f"{normalized[:-3]} {normalized[-3:]}"
+
+
+def extract_postcode(text):
+    """Return the first full postcode in `text` as a normalized key, or None"""
+    if not text:
+        return None
+    match = FULL_POSTCODE_RE.search(text)
+    if not match:
+        return None
+    return (match.group(1) + match.group(2)).upper()
+
+
+def build_centroid_table(csv_path, out_path=None, postcode_column='pcds',
+                         lat_column='lat', lng_column='long', county_column='county'):
+    """
+    Build the sorted binary table from a CSV export.
+
+    Rows without coordinates (terminated/unallocated postcodes carry 99.999999
+    latitudes in ONSPD) are skipped. Returns the number of records written.
+    """
+    out_path = out_path or get_table_path()
+    records = {}
+
+    with open(csv_path, newline='', encoding='utf-8-sig') as f:
+        reader = csv.DictReader(f)
+        for row in reader:
+            key = normalize_postcode(row.get(postcode_column))
+            if not key or len(key) > 7:
+                continue
+            try:
+                lat = float(row.get(lat_column) or '')
+                lng = float(row.get(lng_column) or '')
+            except ValueError:
+                continue
+            if not (-90 <= lat <= 90) or not (-180 <= lng <= 180):
+                continue
+            outward = key[:-3][:4]
+            county = (row.get(county_column) or '').strip()
+            records[key] = (lat, lng, outward, county)
+
+    tmp_path = f"{out_path}.tmp"
+    os.makedirs(os.path.dirname(out_path), exist_ok=True)
+    with open(tmp_path, 'wb') as f:
+        f.write(HEADER.pack(MAGIC, len(records)))
+        for key in sorted(records):
+            lat, lng, outward, county = records[key]
+            f.write(RECORD.pack(
+                key.encode('ascii'),
+                lat,
+                lng,
+                outward.encode('ascii'),
+                county.encode('utf-8')[:40],
+            ))
+    # Atomic swap so running processes never map a half-written file
+    os.replace(tmp_path, out_path)
+
+    logger.info(f"Wrote {len(records)} postcode centroids to {out_path}")
+    return len(records)
+
+
+class PostcodeCentroidTable:
+    """Read-only, memory-mapped view over a centroid table file"""
+
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, 'rb')
+        self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, self.count = HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC:
+            self.close()
+            raise ValueError(f"{path} is not a postcode centroid table")
+
+    def __len__(self):
+        return self.count
+
+    def _key_at(self, index):
+        offset = HEADER.size + index * RECORD.size
+        return self._mm[offset:offset + 7].rstrip(b'\x00')
+
+    def lookup(self, postcode):
+        """Binary search for an exact postcode; returns a dict or None"""
+        key = normalize_postcode(postcode).encode('ascii', 'ignore')
+        if not key:
+            return None
+
+        lo, hi = 0, self.count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._key_at(mid) < key:
+                lo = mid + 1
+            else:
+                hi = mid
+
+        if lo >= self.count or self._key_at(lo) != key:
+            return None
+
+        raw_key, lat, lng, outward, county = RECORD.unpack_from(self._mm, HEADER.size + lo * RECORD.size)
+        normalized = raw_key.rstrip(b'\x00').decode('ascii')
+        return {
+            'postcode': format_postcode(normalized),
+            'latitude': lat,
+            'longitude': lng,
+            'outward_code': outward.rstrip(b'\x00').decode('ascii'),
+            'county': county.rstrip(b'\x00').decode('utf-8', 'ignore') or None,
+        }
+
+    def close(self):
+        self._mm.close()
+        self._file.close()
+
+
+_table = None
+_table_missing = False
+_table_lock = threading.Lock()
+
+
+def get_table_path():
+    return getattr(settings, 'POSTCODE_CENTROID_TABLE', DEFAULT_TABLE_PATH)
+
+
+def get_centroid_table():
+    """Lazily map the table once per process; returns None when it hasn't been built"""
+    global _table, _table_missing
+
+    if _table is not None or _table_missing:
+        return _table
+
+    with _table_lock:
+        if _table is None and not _table_missing:
+            path = get_table_path()
+            try:
+                _table = PostcodeCentroidTable(path)
+                logger.info(f"Loaded {len(_table)} postcode centroids from {path}")
+            except (OSError, ValueError) as e:
+                logger.warning(f"Offline postcode table unavailable ({e}) - falling back to online lookups")
+                _table_missing = True
+    return _table
+
+
+def lookup_postcode(postcode):
+    """Resolve a single postcode offline; None if unknown or the table isn't built"""
+    table = get_centroid_table()
+    if table is None:
+        return None
+    return table.lookup(postcode)
+
+
+def geocode_location(location):
+    """Resolve the postcode embedded in a component location string, if any"""
+    postcode = extract_postcode(location)
+    if not postcode:
+        return None
+    return lookup_postcode(postcode)
@@ -8,6 +8,8 @@ from django.core.cache import cache
 import re
 import time
 
+from .postcode_centroids import lookup_postcode
+
 logger = logging.getLogger(__name__)
 
 # Base URL for the postcodes.io API
@@ -19,6 +21,11 @@ def validate_postcode(postcode):
         return False
     
     postcode_cleaned = postcode.strip().upper().replace(" ", "")
+    
+    # Known postcodes resolve from the offline centroid table without an API call
+    if lookup_postcode(postcode_cleaned):
+        return True
+    
     cache_key = f"postcode_validation_{postcode_cleaned}"
     is_valid = cache.get(cache_key)
     
@@ -0,0 +1,164 @@
+"""
+Request coalescing for identical in-flight map and search requests.
+
+Requests are keyed by a signature (view, viewer, sorted query parameters).
+The first request for a signature computes the response; identical requests
+arriving while it runs wait for it instead of running the same queries:
+
+- within a process, on the leader's Event
+- across workers, on a short Redis lock - the worker holding it publishes the
+  finished response for COALESCE_RESULT_TTL seconds and the others poll for it
+
+So database load during a burst (cache flip, a bot walking filter
+permutations) follows the number of distinct requests, not total requests.
+Only plain 200 responses without cookies are shared; anything else, or a
+leader that takes longer than COALESCE_WAIT_TIMEOUT, and followers compute
+for themselves.
+"""
+import hashlib
+import logging
+import threading
+import time
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpResponse
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = 'coalesce:'
+WAIT_TIMEOUT = getattr(settings, 'COALESCE_WAIT_TIMEOUT', 30)
+LOCK_TIMEOUT = getattr(settings, 'COALESCE_LOCK_TIMEOUT', 60)  # Longest request we expect; a crashed worker frees the signature after this
+RESULT_TTL = getattr(settings, 'COALESCE_RESULT_TTL', 5)
+POLL_INTERVAL = 0.1
+
+# Headers a shared response carries over; the rest is added per request by middleware
+_SHARED_HEADERS = ('Content-Type', 'Content-Language', 'X-Cache-Status')
+
+
+class _Flight:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+
+
+_inflight = {}
+_inflight_guard = threading.Lock()
+
+
+def request_signature(name, request, params=None, vary_on_user=True):
+    """'coalesce:<name>:<hash of viewer and sorted query parameters>'"""
+    viewer = 'anon'
+    user = getattr(request, 'user', None)
+    if vary_on_user and user is not None and user.is_authenticated:
+        viewer = f"u{user.pk}"
+    query = '&'.join(
+        f"{key}={'|'.join(sorted(values))}" for key, values in sorted(request.GET.lists())
+        if params is None or key in params
+    )
+    digest = hashlib.blake2b(f"{viewer}:{request.path}?{query}".encode('utf-8'), digest_size=12).hexdigest()
+    return f"{KEY_PREFIX}{name}:{digest}"
+
+
+def _shareable(response):
+    return response.status_code == 200 and not response.streaming and not response.cookies
+
+
+def _freeze(response):
+    return {
+        'content': response.content,
+        'headers': {header: response[header] for header in _SHARED_HEADERS if response.has_header(header)},
+    }
+
+
+def _thaw(frozen):
+    response = HttpResponse(frozen['content'])
+    for header, value in frozen['headers'].items():
+        response[header] = value
+    return response
+
+
+def _compute_across_workers(signature, compute):
+    """Returns (frozen result or None, response computed here or None)"""
+    lock_key = f"{signature}:lock"
+    try:
+        frozen = cache.get(signature)
+        if frozen is not None:
+            return frozen, None
+        acquired = cache.add(lock_key, 1, LOCK_TIMEOUT)
+    except Exception as e:
+        logger.warning(f"Request coalescing unavailable for {signature}: {e}")
+        return None, compute()
+
+    if acquired:
+        frozen = None
+        try:
+            response = compute()
+            if _shareable(response):
+                frozen = _freeze(response)
+                try:
+                    cache.set(signature, frozen, RESULT_TTL)
+                except Exception as e:
+                    logger.warning(f"Could not publish coalesced response {signature}: {e}")
+            return frozen, response
+        finally:
+            try:
+                cache.delete(lock_key)
+            except Exception as e:
+                logger.warning(f"Could not release coalescing lock {lock_key}: {e}")
+
+    # Another worker is computing it - wait for its result
+    deadline = time.monotonic() + WAIT_TIMEOUT
+    try:
+        while time.monotonic() < deadline:
+            time.sleep(POLL_INTERVAL)
+            frozen = cache.get(signature)
+            if frozen is not None:
+                return frozen, None
+            if cache.get(lock_key) is None:
+                break  # finished without a shareable result
+    except Exception as e:
+        logger.warning(f"Request coalescing unavailable for {signature}: {e}")
+    return None, compute()
+
+
+def coalesce(signature, compute):
+    """Run compute() (returning an HttpResponse) once per signature across concurrent callers"""
+    with _inflight_guard:
+        flight = _inflight.get(signature)
+        leader = flight is None
+        if leader:
+            flight = _inflight[signature] = _Flight()
+
+    if not leader:
+        if flight.done.wait(WAIT_TIMEOUT) and flight.result is not None:
+            return _thaw(flight.result)
+        return compute()
+
+    try:
+        frozen, response = _compute_across_workers(signature, compute)
+        flight.result = frozen
+        return response if response is not None else _thaw(frozen)
+    finally:
+        flight.done.set()
+        with _inflight_guard:
+            _inflight.pop(signature, None)
+
+
+def coalesce_requests(name, params=None, vary_on_user=True):
+    """
+    View decorator: identical concurrent GETs share one computation.
+
+    params: query parameters that change the response (default: all of them)
+    vary_on_user: keep logged-in users' responses to themselves (pages that show the user)
+    """
+    def decorator(view_func):
+        @wraps(view_func)
+        def wrapper(request, *args, **kwargs):
+            if request.method != 'GET':
+                return view_func(request, *args, **kwargs)
+            signature = request_signature(name, request, params, vary_on_user)
+            return coalesce(signature, lambda: view_func(request, *args, **kwargs))
+        return wrapper
+    return decorator
@@ -9,16 +9,18 @@ from django.core.cache import cache
 from django.db.models import Count
 from checker.models import Component
 from .filter_options import get_all_technologies, get_all_companies
+from .single_flight import get_or_build
 
 logger = logging.getLogger(__name__)
 
 # Cache settings
 SUGGESTIONS_CACHE_TTL = 86400  # 24 hours
+SEARCH_DICTIONARY_KEY = "search:dictionary:v5"
 MIN_SIMILARITY_SCORE = 70  # Minimum score to suggest (0-100)
 MAX_SUGGESTIONS = 3  # Maximum number of suggestions to return
 
 
-def get_search_dictionary() -> List[str]:
+def _build_search_dictionary() -> List[str]:
     """
     Build a dictionary of common search terms including:
     - All technologies
@@ -26,88 +28,90 @@ def get_search_dictionary() -> List[str]:
     - Common capacity market terms
     - Common location names
     """
-    cache_key = "search:dictionary:v5"
-    dictionary = cache.get(cache_key)
-    
-    if dictionary is None:
-        logger.info("Building search dictionary for suggestions")
-        
-        # Start with technologies
-        dictionary = get_all_technologies()
-        
-        # Add top 100 companies
-        companies = get_all_companies()[:100]
-        dictionary.extend(companies)
-        
-        # Add common location names (top 200 most common to catch more places)
-        from django.db import connection
-        with connection.cursor() as cursor:
-            cursor.execute("""
-                SELECT location, COUNT(*) as component_count
-                FROM checker_component 
-                WHERE location IS NOT NULL AND location != ''
-                GROUP BY location
-                ORDER BY component_count DESC
-                LIMIT 200
-            """)
-            locations = [row[0] for row in cursor.fetchall()]
-            
-        # Extract city/area names from locations (remove postcodes and details)
-        location_names = []
-        for location in locations:
-            # Extract likely place names (before postcodes, common patterns)
-            import re
-            # Remove postcodes (UK format)
-            location_clean = re.sub(r'\b[A-Z]{1,2}\d{1,2}[A-Z]?\s*\d[A-Z]{2}\b', '', location)
-            # Remove common words like "CHP", "Road", "Avenue", etc. but keep place names
-            common_words = {'chp', 'road', 'avenue', 'street', 'lane', 'close', 'drive', 'way', 'place', 'ltd', 'limited', 'farm', 'site', 'station'}
-            
-            # Split by common delimiters and extract meaningful parts
-            parts = re.split(r'[,;]', location_clean)
-            for part in parts:
-                words = part.strip().split()
-                for word in words:
-                    word = word.strip(',').strip().lower()
-                    # Include words that are likely place names
-                    if (len(word) >= 4 and 
-                        not word.isdigit() and 
-                        word not in common_words and
-                        not re.match(r'^[a-z]{1,2}\d', word)):  # Avoid postcode fragments
-                        location_names.append(word)
-        
-        dictionary.extend(location_names)
+    logger.info("Building search dictionary for suggestions")
+    
+    # Start with technologies
+    dictionary = get_all_technologies()
+    
+    # Add top 100 companies
+    companies = get_all_companies()[:100]
+    dictionary.extend(companies)
+    
+    # Add common location names (top 200 most common to catch more places)
+    from django.db import connection
+    with connection.cursor() as cursor:
+        cursor.execute("""
+            SELECT location, COUNT(*) as component_count
+            FROM checker_component 
+            WHERE location IS NOT NULL AND location != ''
+            GROUP BY location
+            ORDER BY component_count DESC
+            LIMIT 200
+        """)
+        locations = [row[0] for row in cursor.fetchall()]
         
-        # Add common capacity market terms
-        common_terms = [
-            'battery', 'storage', 'gas', 'ocgt', 'ccgt', 'chp', 
-            'combined heat and power', 'solar', 'wind', 'nuclear',
-            'dsr', 'demand side response', 'ev charging', 'electric vehicle',
-            'interconnector', 'hydro', 'pumped hydro', 'diesel',
-            'coal', 'biomass', 'waste', 'landfill gas', 'sewage gas',
-            'reciprocating engine', 'gas turbine', 'steam turbine',
-            'flexitricity', 'limejump', 'kiwi power', 'enel x',
-            'centrica', 'sse', 'edf', 'eon', 'rwe', 'drax',
-            'intergen', 'uniper', 'ep uk', 'vitol', 'orsted',
-            # Common location names that we definitely want to suggest
-            'colindale', 'manchester', 'birmingham', 'glasgow', 'edinburgh',
-            'liverpool', 'newcastle', 'cardiff', 'bristol', 'leicester',
-            'london', 'peckham', 'camden', 'hackney', 'islington', 'southwark',
-            'lambeth', 'wandsworth', 'tower hamlets', 'greenwich', 'lewisham',
-            'leeds', 'sheffield', 'bradford', 'nottingham', 'southampton',
-            'portsmouth', 'brighton', 'oxford', 'cambridge', 'reading'
-        ]
-        dictionary.extend(common_terms)
+    # Extract city/area names from locations (remove postcodes and details)
+    location_names = []
+    for location in locations:
+        # Extract likely place names (before postcodes, common patterns)
+        import re
+        # Remove postcodes (UK format)
+        location_clean = re.sub(r'\b[A-Z]{1,2}\d{1,2}[A-Z]?\s*\d[A-Z]{2}\b', '', location)
+        # Remove common words like "CHP", "Road", "Avenue", etc. but keep place names
+        common_words = {'chp', 'road', 'avenue', 'street', 'lane', 'close', 'drive', 'way', 'place', 'ltd', 'limited', 'farm', 'site', 'station'}
         
-        # Remove duplicates and convert to lowercase for matching
-        # Also filter out very short terms that could cause bad matches
-        dictionary = list(set(term.lower() for term in dictionary if term and len(term) >= 4))
-        
-        cache.set(cache_key, dictionary, SUGGESTIONS_CACHE_TTL)
-        logger.info(f"Cached search dictionary with {len(dictionary)} terms")
-    
+        # Split by common delimiters and extract meaningful parts
+        parts = re.split(r'[,;]', location_clean)
+        for part in parts:
+            words = part.strip().split()
+            for word in words:
+                word = word.strip(',').strip().lower()
+                # Include words that are likely place names
+                if (len(word) >= 4 and 
+                    not word.isdigit() and 
+                    word not in common_words and
+                    not re.match(r'^[a-z]{1,2}\d', word)):  # Avoid postcode fragments
+                    location_names.append(word)
+    
+    dictionary.extend(location_names)
+    
+    # Add common capacity market terms
+    common_terms = [
+        'battery', 'storage', 'gas', 'ocgt', 'ccgt', 'chp', 
+        'combined heat and power', 'solar', 'wind', 'nuclear',
+        'dsr', 'demand side response', 'ev charging', 'electric vehicle',
+        'interconnector', 'hydro', 'pumped hydro', 'diesel',
+        'coal', 'biomass', 'waste', 'landfill gas', 'sewage gas',
+        'reciprocating engine', 'gas turbine', 'steam turbine',
+        'flexitricity', 'limejump', 'kiwi power', 'enel x',
+        'centrica', 'sse', 'edf', 'eon', 'rwe', 'drax',
+        'intergen', 'uniper', 'ep uk', 'vitol', 'orsted',
+        # Common location names that we definitely want to suggest
+        'colindale', 'manchester', 'birmingham', 'glasgow', 'edinburgh',
+        'liverpool', 'newcastle', 'cardiff', 'bristol', 'leicester',
+        'london', 'peckham', 'camden', 'hackney', 'islington', 'southwark',
+        'lambeth', 'wandsworth', 'tower hamlets', 'greenwich', 'lewisham',
+        'leeds', 'sheffield', 'bradford', 'nottingham', 'southampton',
+        'portsmouth', 'brighton', 'oxford', 'cambridge', 'reading'
+    ]
+    dictionary.extend(common_terms)
+    
+    # Remove duplicates and convert to lowercase for matching
+    # Also filter out very short terms that could cause bad matches
+    dictionary = list(set(term.lower() for term in dictionary if term and len(term) >= 4))
+    
+    logger.info(f"Built search dictionary with {len(dictionary)} terms")
     return dictionary
 
 
+def get_search_dictionary(force: bool = False) -> List[str]:
+    """Cached search dictionary; an expired copy is served while one worker rebuilds it."""
+    return get_or_build(
+        SEARCH_DICTIONARY_KEY, _build_search_dictionary,
+        SUGGESTIONS_CACHE_TTL, SUGGESTIONS_CACHE_TTL * 2, force=force,
+    )
+
+
 def get_search_suggestions(query: str, max_results: int = MAX_SUGGESTIONS) -> List[Tuple[str, float]]:
     """
     Get search suggestions for a misspelled query.
@@ -229,7 +233,6 @@ def get_multiple_suggestions(query: str) -> List[str]:
 
 def refresh_search_dictionary():
     """Force refresh of the search dictionary cache."""
-    cache.delete("search:dictionary:v1")
-    dictionary = get_search_dictionary()
+    dictionary = get_search_dictionary(force=True)
     logger.info(f"Search dictionary refreshed with {len(dictionary)} terms")
     return len(dictionary)
\ No newline at end of file
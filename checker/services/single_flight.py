@@ -0,0 +1,140 @@
+"""
+Single-flight cache rebuilds with stale-while-revalidate.
+
+Heavy keys (statistics page data, the CMU dataframe, the search dictionary,
+the company index) are stored with a soft expiry inside the value and a hard
+TTL in Redis. Reads past the soft expiry return the stale value and queue one
+background refresh. A cold miss rebuilds under a per-process lock plus a Redis
+lock, so only one worker per key hits Postgres while the others wait for its
+result.
+
+Values written directly with cache.set() by older code are still returned, they
+just never trigger a soft refresh.
+"""
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.cache import cache
+from django.db import connections
+
+logger = logging.getLogger(__name__)
+
+ENTRY_MARKER = '__single_flight__'
+LOCK_SUFFIX = ':rebuild_lock'
+DEFAULT_LOCK_TIMEOUT = 600  # Longest rebuild we expect; a crashed builder frees the key after this
+DEFAULT_WAIT_TIMEOUT = 60
+WAIT_POLL_INTERVAL = 0.25
+
+_process_locks = {}
+_process_locks_guard = threading.Lock()
+_refreshing = set()
+# Bounded so a burst of expiring keys can't spawn a thread per request
+_refresh_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix='cache-refresh')
+
+
+def _process_lock(key):
+    with _process_locks_guard:
+        if key not in _process_locks:
+            _process_locks[key] = threading.Lock()
+        return _process_locks[key]
+
+
+def _lookup(key):
+    """Returns (found, value, fresh)"""
+    entry = cache.get(key)
+    if entry is None:
+        return False, None, False
+    if isinstance(entry, dict) and entry.get(ENTRY_MARKER):
+        return True, entry['value'], time.time() < entry['fresh_until']
+    return True, entry, True
+
+
+def store(key, value, soft_ttl, hard_ttl=None):
+    """Cache value as fresh for soft_ttl seconds and servable (stale) until hard_ttl"""
+    hard_ttl = hard_ttl or soft_ttl * 2
+    cache.set(key, {ENTRY_MARKER: True, 'value': value, 'fresh_until': time.time() + soft_ttl}, hard_ttl)
+
+
+def _rebuild(key, builder, soft_ttl, hard_ttl, lock_timeout):
+    """
+    Build and store while holding the Redis lock.
+    Returns (built, value); built is False when another process holds the lock.
+    """
+    lock_key = f"{key}{LOCK_SUFFIX}"
+    if not cache.add(lock_key, 1, lock_timeout):
+        return False, None
+    try:
+        start = time.time()
+        value = builder()
+        store(key, value, soft_ttl, hard_ttl)
+        logger.info(f"Rebuilt cache key {key} in {time.time() - start:.2f}s")
+        return True, value
+    finally:
+        cache.delete(lock_key)
+
+
+def refresh_async(key, builder, soft_ttl, hard_ttl=None, lock_timeout=DEFAULT_LOCK_TIMEOUT):
+    """Queue a background rebuild unless one is already running in this process. Returns True if queued."""
+    with _process_locks_guard:
+        if key in _refreshing:
+            return False
+        _refreshing.add(key)
+
+    def run():
+        try:
+            _rebuild(key, builder, soft_ttl, hard_ttl, lock_timeout)
+        except Exception as e:
+            logger.error(f"Background refresh of {key} failed: {e}")
+        finally:
+            with _process_locks_guard:
+                _refreshing.discard(key)
+            connections.close_all()
+
+    _refresh_executor.submit(run)
+    return True
+
+
+def get_or_build(key, builder, soft_ttl, hard_ttl=None, lock_timeout=DEFAULT_LOCK_TIMEOUT,
+                 wait_timeout=DEFAULT_WAIT_TIMEOUT, block=True, force=False):
+    """
+    Return the cached value for key, building it at most once across workers.
+
+    - fresh hit: returned as is
+    - stale hit: returned as is, one background refresh is queued
+    - miss: built under the per-process + Redis lock; callers that lose the race
+      wait up to wait_timeout for the winner's value. With block=False a miss
+      queues a background build and returns None instead.
+    - force: rebuild now (still single-flight) regardless of what is cached
+    """
+    if not force:
+        found, value, fresh = _lookup(key)
+        if found:
+            if not fresh:
+                refresh_async(key, builder, soft_ttl, hard_ttl, lock_timeout)
+            return value
+        if not block:
+            refresh_async(key, builder, soft_ttl, hard_ttl, lock_timeout)
+            return None
+
+    with _process_lock(key):
+        if not force:
+            # Another thread in this process may have built it while we queued
+            found, value, _ = _lookup(key)
+            if found:
+                return value
+
+        deadline = time.monotonic() + wait_timeout
+        while True:
+            built, value = _rebuild(key, builder, soft_ttl, hard_ttl, lock_timeout)
+            if built:
+                return value
+
+            time.sleep(WAIT_POLL_INTERVAL)
+            found, value, _ = _lookup(key)
+            if found and not force:
+                return value
+            if time.monotonic() >= deadline:
+                logger.warning(f"Timed out waiting for another worker to rebuild {key}, building locally")
+                return builder()
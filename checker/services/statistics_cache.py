@@ -0,0 +1,108 @@
+"""
+Statistics page data.
+
+Built by `build_statistics_cache` from the statistics rollups and served
+through the single-flight cache so an expired entry is rebuilt once in the
+background while the statistics page keeps rendering the previous numbers.
+"""
+import json
+import logging
+
+from django.db.models import F
+
+from ..models import Component
+from . import statistics_rollups
+from .single_flight import get_or_build, store
+
+logger = logging.getLogger(__name__)
+
+STATISTICS_CACHE_KEY = 'statistics_page_data'
+STATISTICS_SOFT_TTL = 60 * 60 * 6  # 6 hours
+STATISTICS_HARD_TTL = 60 * 60 * 24  # stale numbers beat a blank page while rebuilding
+
+
+def build_statistics_data(log=logger.info):
+    """Compute every aggregate the statistics page shows"""
+    stats_data = {}
+    
+    # 1-6 come from the precomputed rollups (refresh_statistics_rollups)
+    log('Calculating summary stats...')
+    dataset_totals = statistics_rollups.totals()
+    stats_data['summary'] = {
+        'total_components': dataset_totals['component_count'],
+        'total_companies': statistics_rollups.rollups('company').count(),
+        'total_technologies': statistics_rollups.rollups('technology').count(),
+        'total_capacity': dataset_totals['derated_capacity_mw'],
+    }
+    
+    # 2. Top Companies by Component Count
+    log('Calculating top companies by count...')
+    stats_data['top_companies_count'] = list(
+        statistics_rollups.ranked('company', 'count')
+        .values(company_name=F('key'), count=F('component_count'))[:25]
+    )
+    
+    # 3. Top Companies by Capacity
+    log('Calculating top companies by capacity...')
+    stats_data['top_companies_capacity'] = list(
+        statistics_rollups.ranked('company', 'capacity')
+        .filter(derated_capacity_mw__gt=0)
+        .values(company_name=F('key'), total_capacity=F('derated_capacity_mw'))[:25]
+    )
+    
+    # 4. Technologies by Count
+    log('Calculating technologies by count...')
+    stats_data['tech_by_count'] = list(
+        statistics_rollups.ranked('technology', 'count')
+        .values(technology=F('key'), count=F('component_count'))[:25]
+    )
+    
+    # 5. Technologies by Capacity
+    log('Calculating technologies by capacity...')
+    stats_data['tech_by_capacity'] = list(
+        statistics_rollups.ranked('technology', 'capacity')
+        .filter(derated_capacity_mw__gt=0)
+        .values(technology=F('key'), total_capacity=F('derated_capacity_mw'))[:25]
+    )
+    
+    # 6. Components by Year
+    log('Calculating components by year...')
+    stats_data['components_by_year'] = list(
+        statistics_rollups.rollups('delivery_year')
+        .order_by('key')
+        .values(delivery_year=F('key'), count=F('component_count'))
+    )
+    
+    # 7. Top Components by Capacity
+    log('Calculating top components by capacity...')
+    top_components_capacity = list(
+        Component.objects.filter(derated_capacity_mw__isnull=False)
+        .filter(derated_capacity_mw__gt=0)
+        .order_by('-derated_capacity_mw')[:20]
+        .values('id', 'location', 'company_name', 'technology', 'derated_capacity_mw')
+    )
+    for comp in top_components_capacity:
+        comp['derated_capacity_mw'] = float(comp['derated_capacity_mw'])
+    stats_data['top_components_capacity'] = top_components_capacity
+
+    return stats_data
+
+
+def build_statistics_json():
+    return json.dumps(build_statistics_data())
+
+
+def store_statistics_json(stats_json):
+    store(STATISTICS_CACHE_KEY, stats_json, STATISTICS_SOFT_TTL, STATISTICS_HARD_TTL)
+
+
+def get_statistics_json(block=True, force=False):
+    """
+    Cached statistics JSON. With block=False a cold cache queues one
+    background build and returns None.
+    """
+    return get_or_build(
+        STATISTICS_CACHE_KEY, build_statistics_json,
+        STATISTICS_SOFT_TTL, STATISTICS_HARD_TTL,
+        block=block, force=force,
+    )
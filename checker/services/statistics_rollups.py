@@ -0,0 +1,146 @@
+"""
+Statistics rollups.
+
+Component, CMU and location counts and total de-rated capacity per company,
+technology, delivery year and auction, computed with one GROUP BY per
+dimension after each rebuild and stored in StatisticsRollup for the dataset
+generation being warmed. The statistics page and the company/technology
+ranking lists page through these precomputed, indexed rows instead of
+aggregating the whole Component table per request.
+
+Rows are refreshed for the generation being warmed while the live one keeps
+reading its own, so pages switch to the new numbers exactly at activation.
+Plain tables rather than Postgres materialized views, so SQLite works too.
+"""
+import logging
+
+from django.db import transaction
+from django.db.models import Count, Max, Q, Sum
+
+from ..models import Component, StatisticsRollup
+from .dataset_generation import current_generation
+from .single_flight import get_or_build
+
+logger = logging.getLogger(__name__)
+
+KEEP_GENERATIONS = 2
+# Per-generation single-flight key, so a missed warm is rebuilt by one worker, not by every request
+REFRESH_KEY = 'statistics_rollups:refreshed:{generation}'
+REFRESH_TTL = 3600 * 24
+
+# Rollup dimension -> Component field
+DIMENSION_FIELDS = {
+    'company': 'company_name',
+    'technology': 'technology',
+    'delivery_year': 'delivery_year',
+    'auction': 'auction_name',
+}
+
+
+def _measures():
+    # Annotation names must not clash with Component fields
+    return {
+        'n_components': Count('id'),
+        'n_with_capacity': Count('derated_capacity_mw'),
+        'capacity': Sum('derated_capacity_mw'),
+        'n_cmus': Count('cmu_id', distinct=True),
+        'n_locations': Count('location', distinct=True, filter=~Q(location='')),
+    }
+
+
+def _rollup(generation, dimension, key, values):
+    return StatisticsRollup(
+        generation=generation,
+        dimension=dimension,
+        key=key,
+        component_count=values['n_components'] or 0,
+        capacity_component_count=values['n_with_capacity'] or 0,
+        derated_capacity_mw=float(values['capacity'] or 0),
+        cmu_count=values['n_cmus'] or 0,
+        location_count=values['n_locations'] or 0,
+    )
+
+
+def refresh_rollups(generation=None):
+    """Rebuild the rollup rows for `generation` (default: the current one) and return it"""
+    if generation is None:
+        generation = current_generation()
+
+    rollups = []
+    for dimension, field in DIMENSION_FIELDS.items():
+        grouped = (
+            Component.objects.exclude(**{f'{field}__isnull': True}).exclude(**{field: ''})
+            .values(field)
+            .annotate(**_measures())
+            .order_by()
+        )
+        rollups.extend(_rollup(generation, dimension, values[field], values) for values in grouped)
+    rollups.append(_rollup(generation, 'total', '', Component.objects.aggregate(**_measures())))
+
+    with transaction.atomic():
+        StatisticsRollup.objects.filter(generation=generation).delete()
+        # Two first-use refreshes can race; the loser's identical rows are dropped
+        StatisticsRollup.objects.bulk_create(rollups, batch_size=1000, ignore_conflicts=True)
+        kept = list(
+            StatisticsRollup.objects.values_list('generation', flat=True)
+            .distinct().order_by('-generation')[:KEEP_GENERATIONS]
+        )
+        StatisticsRollup.objects.exclude(generation__in=kept).delete()
+
+    logger.info(f"Refreshed {len(rollups)} statistics rollups for generation {generation}")
+    return generation
+
+
+def rollup_generation():
+    """Newest generation with rollups that is not ahead of the live one (None if never refreshed)"""
+    return (
+        StatisticsRollup.objects.filter(generation__lte=current_generation())
+        .aggregate(generation=Max('generation'))['generation']
+    )
+
+
+def rollups(dimension):
+    """
+    Rollup rows for `dimension` in the live generation. When the generation was
+    activated without warming, the newest older rows are served while one
+    worker refreshes in the background; only a first-ever refresh is waited for.
+    """
+    generation = rollup_generation()
+    live = current_generation()
+    if generation != live:
+        refreshed = get_or_build(
+            REFRESH_KEY.format(generation=live), lambda: refresh_rollups(live), REFRESH_TTL,
+            block=generation is None,
+        )
+        if refreshed is not None:
+            generation = refreshed
+    return StatisticsRollup.objects.filter(generation=generation, dimension=dimension)
+
+
+def ranked(dimension, by='count', descending=True):
+    """
+    Rollup rows ordered by component count or total capacity.
+    Ranking by capacity leaves out keys with no de-rated capacity at all.
+    """
+    rows = rollups(dimension)
+    if by == 'capacity':
+        rows = rows.filter(capacity_component_count__gt=0)
+        field = 'derated_capacity_mw'
+    else:
+        field = 'component_count'
+    prefix = '-' if descending else ''
+    return rows.order_by(f'{prefix}{field}', 'key')
+
+
+def totals():
+    """Whole-dataset counts and capacity as a dict of the rollup measures"""
+    total = rollups('total').values(
+        'component_count', 'capacity_component_count', 'derated_capacity_mw', 'cmu_count', 'location_count'
+    ).first()
+    return total or {
+        'component_count': 0,
+        'capacity_component_count': 0,
+        'derated_capacity_mw': 0.0,
+        'cmu_count': 0,
+        'location_count': 0,
+    }
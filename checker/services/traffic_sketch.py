@@ -0,0 +1,163 @@
+"""
+Traffic sketch for cache warming.
+
+Search, map and list views record a normalized request key (path plus the
+query/filter/page parameters that change the response). Keys are counted in a
+daily Redis count-min sketch, and a small top-K sorted set keeps the heaviest
+hitters with their estimated counts. `warm_from_traffic` replays the top-N of
+the last few days after each dataset generation flip, so warming follows
+real users and crawlers instead of hardcoded lists.
+
+Counts are buffered in-process and flushed in one pipeline every
+TRAFFIC_FLUSH_INTERVAL seconds, so recording costs a dict update per request.
+"""
+import hashlib
+import logging
+import threading
+import time
+from collections import Counter
+from datetime import date, timedelta
+from functools import wraps
+from urllib.parse import urlencode
+
+import redis
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+SKETCH_WIDTH = 2048
+SKETCH_DEPTH = 4
+TOP_K = getattr(settings, 'TRAFFIC_TOP_K', 500)
+RETENTION_DAYS = 8
+FLUSH_INTERVAL = getattr(settings, 'TRAFFIC_FLUSH_INTERVAL', 10)
+WARMER_USER_AGENT = 'cmr-cache-warmer'
+
+# Parameters that change what a search/map/list response contains; everything else
+# (tracking params, cache busters, viewport bounds) is dropped from the key
+RECORDED_PARAMS = {
+    'q', 'query', 'search_query', 'quick_search', 'page', 'per_page', 'sort_by', 'sort_order',
+    'status', 'auction', 'technology', 'tech', 'subtype', 'company', 'show_active',
+    'residential', 'limit', 'detail_level',
+}
+
+# KEYS: sketch hash, top-k zset - ARGV: member, increment, top-k size, ttl, field...
+_RECORD_LUA = """
+local estimate = nil
+for i = 5, #ARGV do
+    local count = redis.call('HINCRBY', KEYS[1], ARGV[i], ARGV[2])
+    if estimate == nil or count < estimate then estimate = count end
+end
+redis.call('ZADD', KEYS[2], estimate, ARGV[1])
+if redis.call('ZCARD', KEYS[2]) > tonumber(ARGV[3]) * 2 then
+    redis.call('ZREMRANGEBYRANK', KEYS[2], 0, -(tonumber(ARGV[3]) + 1))
+end
+redis.call('EXPIRE', KEYS[1], ARGV[4])
+redis.call('EXPIRE', KEYS[2], ARGV[4])
+return estimate
+"""
+
+_pending = Counter()
+_pending_lock = threading.Lock()
+_last_flush = [time.monotonic()]
+_client = None
+_record_script = None
+
+
+def _redis():
+    global _client, _record_script
+    if _client is None:
+        _client = redis.from_url(settings.CACHES['default']['LOCATION'])
+        _record_script = _client.register_script(_RECORD_LUA)
+    return _client
+
+
+def _day_keys(day):
+    stamp = day.strftime('%Y%m%d')
+    return f'traffic:cms:{stamp}', f'traffic:topk:{stamp}'
+
+
+def _sketch_fields(member):
+    digest = hashlib.blake2b(member.encode('utf-8'), digest_size=4 * SKETCH_DEPTH).digest()
+    return [
+        f"{row}:{int.from_bytes(digest[row * 4:row * 4 + 4], 'little') % SKETCH_WIDTH}"
+        for row in range(SKETCH_DEPTH)
+    ]
+
+
+def normalize_request_key(request):
+    """
+    '/search/?page=2&q=battery' - path plus the recorded params in sorted order.
+    Only whitespace is normalized: filters and cache keys are case-sensitive
+    ('DSR', 'Octopus'), so a replayed key must keep the value's case.
+    """
+    params = []
+    for name in sorted(RECORDED_PARAMS & set(request.GET.keys())):
+        value = request.GET.get(name, '').strip()
+        if value:
+            params.append((name, ' '.join(value.split())))
+    return f"{request.path}?{urlencode(params)}" if params else request.path
+
+
+def record(member, amount=1):
+    with _pending_lock:
+        _pending[member] += amount
+        due = time.monotonic() - _last_flush[0] >= FLUSH_INTERVAL
+    if due:
+        flush()
+
+
+def flush():
+    """Write buffered counts into today's sketch and top-K set"""
+    with _pending_lock:
+        pending = dict(_pending)
+        _pending.clear()
+        _last_flush[0] = time.monotonic()
+    if not pending:
+        return
+    try:
+        client = _redis()
+        keys = _day_keys(date.today())
+        ttl = RETENTION_DAYS * 86400
+        pipe = client.pipeline(transaction=False)
+        for member, amount in pending.items():
+            _record_script(keys=keys, args=[member, amount, TOP_K, ttl, *_sketch_fields(member)], client=pipe)
+        pipe.execute()
+    except Exception as e:
+        logger.debug(f"Traffic sketch flush failed: {e}")
+
+
+def estimate(member, days=7):
+    """Count-min estimate of how often member was requested over the last `days` days"""
+    client = _redis()
+    total = 0
+    fields = _sketch_fields(member)
+    for offset in range(days):
+        counts = client.hmget(_day_keys(date.today() - timedelta(days=offset))[0], fields)
+        total += min(int(c or 0) for c in counts)
+    return total
+
+
+def top_requests(n=200, days=7):
+    """[(request key, estimated count)] of the most requested keys over the last `days` days"""
+    client = _redis()
+    totals = Counter()
+    for offset in range(days):
+        topk_key = _day_keys(date.today() - timedelta(days=offset))[1]
+        for member, score in client.zrevrange(topk_key, 0, TOP_K - 1, withscores=True):
+            totals[member.decode('utf-8')] += int(score)
+    return totals.most_common(n)
+
+
+def record_traffic(view_func):
+    """View decorator: count successful GETs by normalized request key"""
+    @wraps(view_func)
+    def wrapper(request, *args, **kwargs):
+        response = view_func(request, *args, **kwargs)
+        try:
+            if (request.method == 'GET' and response.status_code == 200
+                    and request.META.get('HTTP_USER_AGENT') != WARMER_USER_AGENT):
+                record(normalize_request_key(request))
+        except Exception as e:
+            logger.debug(f"Traffic recording failed: {e}")
+        return response
+    return wrapper
@@ -381,65 +381,6 @@ def unique_with_counts(descriptions):
     # Return as list of tuples, sorted by count (descending) then by description
     return sorted(desc_counts.items(), key=lambda x: (-x[1], x[0]))
 
-@register.filter(name='sort_auction_years_desc')
-def sort_auction_years_desc(auction_years):
-    """
-    Sort auction years in descending order (newest first).
-    Handles formats like '2024-25 (T-4) Four Year Ahead Capacity Auction'
-    """
-    if not auction_years or not isinstance(auction_years, list):
-        return []
-    
-    # Sort by extracting the year from each string
-    def get_year_key(year_str):
-        import re
-        match = re.search(r'(\d{4})-\d{2}', year_str)
-        if match:
-            return int(match.group(1))
-        return 0
-    
-    return sorted(auction_years, key=get_year_key, reverse=True)
-
-@register.filter(name='is_active_year')
-def is_active_year(auction_years):
-    """
-    Check if any auction year is 2024 or later (active).
-    Can handle dict (from LocationGroup), list, or single string.
-    Returns True if active, False if inactive.
-    """
-    import re
-    
-    # Handle dict (LocationGroup auction_years format: {"2024-25": 1, "2025-26": 2})
-    if isinstance(auction_years, dict):
-        for year_str in auction_years.keys():
-            match = re.search(r'(\d{4})', year_str)
-            if match:
-                year = int(match.group(1))
-                if year >= 2024:
-                    return True
-        return False
-    
-    # Handle single year string
-    if isinstance(auction_years, str):
-        match = re.search(r'(\d{4})', auction_years)
-        if match:
-            year = int(match.group(1))
-            return year >= 2024
-        return False
-    
-    # Handle list of years
-    if not auction_years or not isinstance(auction_years, list):
-        return False
-    
-    for year_str in auction_years:
-        # Extract the first year from patterns like "2024-25 (T-4)" or "2024/25"
-        match = re.search(r'(\d{4})', year_str)
-        if match:
-            year = int(match.group(1))
-            if year >= 2024:
-                return True
-    return False
-
 @register.filter(name='technology_color')
 def technology_color(technology):
     """
@@ -1,4 +1,18 @@
-from django.test import SimpleTestCase
+import gzip
+import os
+import pickle
+from unittest import SkipTest, mock
+
+from django.contrib.auth.models import AnonymousUser
+from django.db import OperationalError, connections, transaction
+from django.test import RequestFactory, SimpleTestCase, TestCase, TransactionTestCase
+from django.utils import timezone
+
+from . import db_router
+from .cache_backends import CompressedSerializer, LocalLRU, TieredRedisCache
+from .db_router import primary_reads, read_intent
+from .middleware.prerendered_pages import PrerenderedPageMiddleware
+from .models import CMURegistry, Component, DatasetSnapshot, RawPayload
 
 # Create your tests here.
 
@@ -14,3 +28,323 @@ class BasicTestCase(SimpleTestCase):
         """Test that Django can be imported"""
         import django
         self.assertIsNotNone(django.VERSION)
+
+
+class PrerenderedPageMiddlewareTestCase(SimpleTestCase):
+    """Pre-rendered pages go to anonymous visitors, never to bots"""
+
+    def setUp(self):
+        self.view_response = object()
+        self.middleware = PrerenderedPageMiddleware(lambda request: self.view_response)
+        self.middleware.enabled = True
+        self.factory = RequestFactory()
+        self.anonymous = AnonymousUser()
+
+        page = (gzip.compress(b'<html>prerendered</html>'), timezone.now())
+        patches = [
+            mock.patch('checker.middleware.prerendered_pages.lookup', return_value=page),
+            mock.patch('checker.middleware.prerendered_pages.compute_etag', return_value='"etag"'),
+        ]
+        self.lookup = patches[0].start()
+        patches[1].start()
+        for patch in patches:
+            self.addCleanup(patch.stop)
+
+    def get(self, user_agent):
+        request = self.factory.get('/companies/example/map/', HTTP_USER_AGENT=user_agent)
+        request.user = self.anonymous
+        return self.middleware(request)
+
+    def test_visitor_gets_prerendered_page(self):
+        response = self.get('Mozilla/5.0 (Windows NT 10.0; Win64; x64)')
+        self.assertEqual(response['X-Prerendered'], '1')
+
+    def test_bot_goes_through_view_protection(self):
+        response = self.get('Mozilla/5.0 (compatible; Googlebot/2.1; +http://www.google.com/bot.html)')
+        self.assertIs(response, self.view_response)
+        self.lookup.assert_not_called()
+
+
+
+class ReadReplicaRouterTestCase(TransactionTestCase):
+    """Reads go to the replica only inside read_intent() and only while it is safe"""
+    # Not TestCase: its wrapping transaction would keep every read on default
+    databases = {'default', 'replica'}
+
+    def setUp(self):
+        db_router._unavailable_until.clear()
+        self.addCleanup(db_router._unavailable_until.clear)
+
+    def read_db(self):
+        return Component.objects.all().db
+
+    def test_default_outside_read_intent(self):
+        self.assertEqual(self.read_db(), 'default')
+
+    def test_replica_inside_read_intent(self):
+        with read_intent():
+            self.assertEqual(self.read_db(), 'replica')
+            self.assertEqual(DatasetSnapshot.objects.all().db, 'replica')
+
+    def test_other_apps_stay_on_primary(self):
+        from django.contrib.auth.models import User
+        with read_intent():
+            self.assertEqual(User.objects.all().db, 'default')
+
+    def test_primary_after_a_write(self):
+        with read_intent():
+            DatasetSnapshot.objects.create(resource_id='components-resource', name='components')
+            self.assertEqual(self.read_db(), 'default')
+        with read_intent():
+            self.assertEqual(self.read_db(), 'replica')
+
+    def test_primary_inside_atomic(self):
+        with read_intent():
+            with transaction.atomic():
+                self.assertEqual(self.read_db(), 'default')
+            self.assertEqual(self.read_db(), 'replica')
+
+    def test_primary_reads(self):
+        with read_intent(), primary_reads():
+            self.assertEqual(self.read_db(), 'default')
+
+    def test_unreachable_replica_falls_back_to_primary(self):
+        failing = mock.patch.object(
+            connections['replica'], 'ensure_connection', side_effect=OperationalError('connection refused'),
+        )
+        with read_intent(), self.assertLogs('checker.db_router', 'WARNING'), failing as ensure_connection:
+            self.assertEqual(self.read_db(), 'default')
+            # Not retried until REPLICA_RETRY_SECONDS have passed
+            self.assertEqual(self.read_db(), 'default')
+        self.assertEqual(ensure_connection.call_count, 1)
+        with read_intent():
+            self.assertEqual(self.read_db(), 'default')
+
+
+class LocalLRUTestCase(SimpleTestCase):
+    """The in-process tier is bounded by total bytes and drops the least recently used first"""
+
+    def setUp(self):
+        self.lru = LocalLRU(max_bytes=30, max_item_bytes=20)
+
+    def test_evicts_least_recently_used(self):
+        self.lru.set('a', b'a' * 10, ttl=60)
+        self.lru.set('b', b'b' * 10, ttl=60)
+        self.lru.set('c', b'c' * 10, ttl=60)
+        self.lru.get('a')
+        self.lru.set('d', b'd' * 10, ttl=60)
+
+        self.assertIsNone(self.lru.get('b'))
+        self.assertEqual(self.lru.get('a'), b'a' * 10)
+        self.assertEqual(self.lru.bytes, 30)
+        self.assertEqual(len(self.lru), 3)
+
+    def test_overwrite_replaces_size(self):
+        self.lru.set('a', b'a' * 10, ttl=60)
+        self.lru.set('a', b'a' * 5, ttl=60)
+        self.assertEqual(self.lru.bytes, 5)
+
+    def test_oversized_and_zero_ttl_items_are_not_held(self):
+        self.lru.set('big', b'x' * 21, ttl=60)
+        self.lru.set('now', b'x', ttl=0)
+        self.assertEqual(len(self.lru), 0)
+        self.assertEqual(self.lru.bytes, 0)
+
+    def test_expired_entries_are_dropped(self):
+        self.lru.set('a', b'a' * 10, ttl=60)
+        with mock.patch('checker.cache_backends.time.monotonic', return_value=10 ** 12):
+            self.assertIsNone(self.lru.get('a'))
+        self.assertEqual(self.lru.bytes, 0)
+
+
+class NamespaceBudgetTestCase(SimpleTestCase):
+    """A write that takes a namespace over budget evicts its fewest-hits-per-byte keys (needs Redis)"""
+
+    BUDGET = 2500
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.cache = TieredRedisCache(os.environ.get('REDIS_URL', 'redis://127.0.0.1:6379/0'), {
+            'KEY_PREFIX': 'tiered_cache_test',
+            'OPTIONS': {
+                'serializer': 'checker.cache_backends.CompressedSerializer',
+                'NAMESPACE_BUDGETS': {'budget_test:': cls.BUDGET},
+            },
+        })
+        try:
+            cls.cache._client().ping()
+        except Exception as e:
+            raise SkipTest(f"Redis not available: {e}")
+
+    def tearDown(self):
+        client = self.cache._client(write=True)
+        keys = list(client.scan_iter(match=f'{self.cache.key_prefix}:*'))
+        if keys:
+            client.delete(*keys)
+
+    def test_write_over_budget_evicts_coldest_key(self):
+        self.cache.set('budget_test:hot', os.urandom(1000))
+        self.cache.set('budget_test:cold', os.urandom(1000))
+        for _ in range(3):
+            self.cache.get('budget_test:hot')
+        self.cache.set('budget_test:new', os.urandom(1000))
+
+        self.assertIsNone(self.cache.get('budget_test:cold'))
+        self.assertIsNotNone(self.cache.get('budget_test:hot'))
+        self.assertIsNotNone(self.cache.get('budget_test:new'))
+        usage = self.cache.namespace_usage()['budget_test:']
+        self.assertLessEqual(usage['bytes'], self.BUDGET)
+        self.assertEqual(usage['keys'], 2)
+
+    def test_unbudgeted_keys_are_not_tracked(self):
+        self.cache.set('other_key', os.urandom(3000))
+        self.assertEqual(self.cache.namespace_usage()['budget_test:']['bytes'], 0)
+
+    def test_delete_releases_tracked_bytes(self):
+        self.cache.set('budget_test:a', os.urandom(1000))
+        self.cache.delete('budget_test:a')
+        self.assertEqual(self.cache.namespace_usage()['budget_test:'], {'bytes': 0, 'budget': self.BUDGET, 'keys': 0})
+
+
+class GenerationScopedKeyTestCase(SimpleTestCase):
+    """Data-derived keys carry the dataset generation, bookkeeping and exempt keys don't"""
+
+    def setUp(self):
+        self.cache = TieredRedisCache('redis://127.0.0.1:6379/0', {
+            'KEY_PREFIX': 'p',
+            'OPTIONS': {'GENERATION_SCOPED': True, 'GENERATION_EXEMPT_PREFIXES': ['rl:']},
+        })
+        patch = mock.patch('checker.services.dataset_generation.current_generation', return_value=7)
+        patch.start()
+        self.addCleanup(patch.stop)
+
+    def test_data_keys_are_prefixed_with_generation(self):
+        self.assertEqual(self.cache.make_key('map_data_x'), 'p:1:g7:map_data_x')
+
+    def test_exempt_keys_are_not_prefixed(self):
+        self.assertEqual(self.cache.make_key('rl:ip:1.2.3.4'), 'p:1:rl:ip:1.2.3.4')
+        self.assertEqual(self.cache.make_key('dataset:generation'), 'p:1:dataset:generation')
+        self.assertEqual(self.cache.make_key('_tier:map_data_'), 'p:1:_tier:map_data_')
+
+    def test_unversioned_recovers_key_and_generation(self):
+        self.assertEqual(self.cache._unversioned('p:1:g7:map_data_x'), ('map_data_x', 7))
+        self.assertEqual(self.cache._unversioned('p:1:rl:ip'), ('rl:ip', None))
+        self.assertEqual(self.cache._unversioned('p:1:geocode:x'), ('geocode:x', None))
+
+    def test_unscoped_cache_leaves_keys_alone(self):
+        cache = TieredRedisCache('redis://127.0.0.1:6379/0', {'KEY_PREFIX': 'p'})
+        self.assertEqual(cache.make_key('map_data_x'), 'p:1:map_data_x')
+
+
+class CompressedSerializerTestCase(SimpleTestCase):
+    """Values come back as the type they were stored as, compressed or not"""
+
+    def setUp(self):
+        self.serializer = CompressedSerializer()
+
+    def round_trip(self, value):
+        payload = self.serializer.dumps(value)
+        loaded = self.serializer.loads(payload)
+        self.assertEqual(loaded, value)
+        self.assertIs(type(loaded), type(value))
+        return payload
+
+    def test_small_values_are_stored_uncompressed(self):
+        self.assertEqual(self.round_trip(b'{"a": 1}')[2:4], b'b-')
+        self.assertEqual(self.round_trip('£5 a year')[2:4], b's-')
+        self.assertEqual(self.round_trip({'a': [1, 2]})[2:4], b'p-')
+
+    def test_large_values_are_compressed(self):
+        for value, tag in ((b'x' * 5000, b'b'), ('é' * 5000, b's'), ([{'id': i} for i in range(500)], b'p')):
+            payload = self.round_trip(value)
+            self.assertEqual(payload[2:4], tag + b'z')
+
+    def test_zlib_when_zstandard_is_missing(self):
+        with mock.patch('checker.cache_backends.zstandard', None):
+            payload = self.round_trip('x' * 5000)
+        self.assertEqual(payload[2:4], b'sd')
+        self.assertEqual(self.serializer.loads(payload), 'x' * 5000)
+
+    def test_incompressible_values_stay_raw(self):
+        self.assertEqual(self.round_trip(os.urandom(5000))[2:4], b'b-')
+
+    def test_ints_stay_raw_for_incr(self):
+        self.assertEqual(self.serializer.dumps(42), 42)
+        # Redis hands counters back as bytes
+        self.assertEqual(self.serializer.loads(b'42'), 42)
+
+    def test_reads_values_written_by_redis_serializer(self):
+        self.assertEqual(self.serializer.loads(pickle.dumps({'a': 1})), {'a': 1})
+
+
+class RawPayloadTestCase(TestCase):
+    """Raw records are stored once per content and read back through the model properties"""
+
+    record = {'_id': 1, 'Component ID': 'C-1', 'Location and Post Code': 'Site A, AB1 2CD'}
+
+    def reload(self, component):
+        return Component.objects.select_related('raw_payload').get(pk=component.pk)
+
+    def test_store_dedups_identical_records(self):
+        digests = RawPayload.objects.store([self.record, dict(self.record), {}, None])
+        self.assertEqual(digests[0], digests[1])
+        self.assertEqual(digests[2:], [None, None])
+        self.assertEqual(RawPayload.objects.count(), 1)
+        self.assertEqual(RawPayload.objects.records(digests), {digests[0]: self.record})
+
+    def test_search_rank_is_not_part_of_the_record(self):
+        with_rank = RawPayload.objects.store([{**self.record, 'rank': 0.5}])
+        self.assertEqual(with_rank, RawPayload.objects.store([self.record]))
+        self.assertEqual(RawPayload.objects.get().record(), self.record)
+
+    def test_unreferenced(self):
+        Component.objects.create(component_id='C-1', cmu_id='CMU-1', additional_data=self.record)
+        orphan, = RawPayload.objects.store([{'_id': 2}])
+        self.assertEqual(list(RawPayload.objects.unreferenced().values_list('digest', flat=True)), [orphan])
+
+    def test_save_stores_additional_data(self):
+        component = Component(component_id='C-1', cmu_id='CMU-1', additional_data=self.record)
+        component.save()
+        self.assertEqual(component.raw_payload_id, RawPayload.for_record(self.record).digest)
+        self.assertEqual(self.reload(component).additional_data, self.record)
+
+        component.additional_data = {**self.record, 'Status': 'Prequalified'}
+        component.save()
+        self.assertEqual(self.reload(component).additional_data['Status'], 'Prequalified')
+
+    def test_bulk_create_stores_each_record_once(self):
+        Component.objects.bulk_create([
+            Component(component_id='C-1', cmu_id='CMU-1', additional_data=self.record),
+            Component(component_id='C-2', cmu_id='CMU-1', additional_data=dict(self.record)),
+            Component(component_id='C-3', cmu_id='CMU-1'),
+        ])
+        self.assertEqual(RawPayload.objects.count(), 1)
+        components = {c.component_id: c for c in Component.objects.select_related('raw_payload')}
+        self.assertEqual(components['C-1'].raw_payload_id, components['C-2'].raw_payload_id)
+        self.assertEqual(components['C-2'].additional_data, self.record)
+        self.assertEqual(components['C-3'].additional_data, {})
+
+    def test_update_or_create(self):
+        component, created = Component.objects.update_or_create(
+            component_id='C-1', defaults={'cmu_id': 'CMU-1', 'additional_data': self.record},
+        )
+        self.assertTrue(created)
+        self.assertEqual(self.reload(component).additional_data, self.record)
+
+        changed = {**self.record, 'Status': 'Rejected'}
+        component, created = Component.objects.update_or_create(
+            component_id='C-1', defaults={'additional_data': changed},
+        )
+        self.assertFalse(created)
+        self.assertEqual(self.reload(component).additional_data, changed)
+        self.assertEqual(self.reload(component).raw_payload_id, RawPayload.for_record(changed).digest)
+
+    def test_registry_raw_data(self):
+        registry, _ = CMURegistry.objects.update_or_create(
+            cmu_id='CMU-1', defaults={'raw_data': {'Name of Applicant': 'Example Energy Ltd'}},
+        )
+        self.assertEqual(registry.applicant_name, 'Example Energy Ltd')
+        self.assertEqual(
+            CMURegistry.objects.get(pk='CMU-1').raw_data, {'Name of Applicant': 'Example Energy Ltd'},
+        )
@@ -16,6 +16,7 @@ from django.http import HttpResponse
 # from .views_new_map_test import map_search_fixed_view
 # Import search GeoJSON view
 from .views_search_geojson import search_results_geojson
+from .decorators.conditional import generation_etag
 # Import batch API views
 from .views_batch_api import batch_geojson_api, optimized_geojson_stream
 # Import map search results view
@@ -88,17 +89,17 @@ urlpatterns = [
     path("api/auction-components/<str:company_id>/<str:year>/<str:auction_name>/",
          views.htmx_auction_components, name="htmx_auction_components"),
     path("api/cmu-details/<str:cmu_id>/",
-         views.get_cmu_details, name="htmx_cmu_details"),
+         generation_etag(views.get_cmu_details), name="htmx_cmu_details"),
 
     # Component detail page - use integer primary key
     path("component/<int:pk>/",
-         views.component_detail, name="component_detail"),
+         generation_etag(views.component_detail), name="component_detail"),
     path("component/by-id/<str:component_id>/",
          views.component_detail_by_id, name="component_detail_by_id"),
     
     # SEO-friendly component URLs
     path("components/<int:pk>/<slug:slug>/",
-         views.component_detail, name="component_detail_seo"),
+         generation_etag(views.component_detail), name="component_detail_seo"),
 
     # REMOVED: Old company detail page (replaced by optimized versions)
     # path("company/<str:company_id>/", views.company_detail, name="company_detail"),
@@ -114,7 +115,7 @@ urlpatterns = [
 
     # CMU detail page
     path("cmu/<str:cmu_id>/",
-         cmu_detail, name="cmu_detail"),
+         generation_etag(cmu_detail), name="cmu_detail"),
     
     # REDIRECT: CMU list view to map view (SEO canonical)
     path("cmu-optimized/<str:cmu_id>/",
@@ -130,21 +131,21 @@ urlpatterns = [
     path('map_results/', map_search_results_view, name='map_search_results'),
     path('map_test/', views.map_search_test, name='map_search_test'),
     # path('map_test_fix/', map_search_fixed_view, name='map_search_fixed_view'), 
-    path('api/map-data/', views.map_data_api, name='map_data_api'),
-    path('api/search-geojson/', search_results_geojson, name='search_results_geojson'),
-    path('api/batch-geojson/', batch_geojson_api, name='batch_geojson_api'),
+    path('api/map-data/', generation_etag(views.map_data_api), name='map_data_api'),
+    path('api/search-geojson/', generation_etag(search_results_geojson), name='search_results_geojson'),
+    path('api/batch-geojson/', generation_etag(batch_geojson_api), name='batch_geojson_api'),
     path('api/stream-geojson/', optimized_geojson_stream, name='optimized_geojson_stream'),
     path('api/component-map-detail/<int:component_id>/', views.component_map_detail_api, name='component_map_detail_api'),
     path('api/subtypes/', get_filtered_subtypes, name='filtered_subtypes'),
     path('api/company-technologies/', get_company_technologies, name='company_technologies'),
-    path('api/search-filters/', search_filters_api, name='search_filters_api'),
+    path('api/search-filters/', generation_etag(search_filters_api), name='search_filters_api'),
 
     # Location-based views
-    path('location/<int:location_id>/', location_detail, name='location_detail'),
+    path('location/<int:location_id>/', generation_etag(location_detail), name='location_detail'),
     path('location/by-name/<path:location_name>/', views.location_detail_by_name, name='location_detail_by_name'),
     
     # SEO-friendly location URLs
-    path('locations/<int:pk>/<slug:slug>/', location_detail_by_name_seo, name='location_detail_seo'),
+    path('locations/<int:pk>/<slug:slug>/', generation_etag(location_detail_by_name_seo), name='location_detail_seo'),
     # path('test/location-search/', test_location_search, name='test_location_search'),
     # path('test/location-search-html/', test_location_search_html, name='test_location_search_html'),
     # path('test/location-search-styled/', test_location_search_styled, name='test_location_search_styled'),
@@ -201,22 +202,22 @@ urlpatterns = [
     
     
     # Ultra-minimal SEO endpoints for search engine bots
-    path('seo/search/', search_seo_minimal, name='search_seo_minimal'),
-    path('seo/company/<path:company_name>/', company_seo_minimal, name='company_seo_minimal'),
-    path('seo/technology/<path:technology_name>/', technology_seo_minimal, name='technology_seo_minimal'),
-    path('seo/location/<str:location_group_id>/', location_seo_minimal, name='location_seo_minimal'),
-    path('seo/component/<int:component_id>/', component_seo_minimal, name='component_seo_minimal'),
-    path('seo/cmu/<str:cmu_id>/', cmu_seo_minimal, name='cmu_seo_minimal'),
+    path('seo/search/', generation_etag(search_seo_minimal), name='search_seo_minimal'),
+    path('seo/company/<path:company_name>/', generation_etag(company_seo_minimal), name='company_seo_minimal'),
+    path('seo/technology/<path:technology_name>/', generation_etag(technology_seo_minimal), name='technology_seo_minimal'),
+    path('seo/location/<str:location_group_id>/', generation_etag(location_seo_minimal), name='location_seo_minimal'),
+    path('seo/component/<int:component_id>/', generation_etag(component_seo_minimal), name='component_seo_minimal'),
+    path('seo/cmu/<str:cmu_id>/', generation_etag(cmu_seo_minimal), name='cmu_seo_minimal'),
     
     # NEW SEO-FRIENDLY URL STRUCTURE
     
     # Directory pages (must come before individual pages to avoid conflicts)
-    path('companies/', company_list_optimized, name='company_list_optimized'),
-    path('companies/by-total-capacity/', company_list_optimized, name='company_capacity_list'),
-    path('companies/by-component-count/', company_list_optimized, name='company_component_count_list'),
+    path('companies/', generation_etag(company_list_optimized), name='company_list_optimized'),
+    path('companies/by-total-capacity/', generation_etag(company_list_optimized), name='company_capacity_list'),
+    path('companies/by-component-count/', generation_etag(company_list_optimized), name='company_component_count_list'),
     
-    path('technologies/', technology_list_optimized, name='technology_list'),
-    path('technologies/by-total-capacity/', technology_list_optimized, name='technology_capacity_list'),
+    path('technologies/', generation_etag(technology_list_optimized), name='technology_list'),
+    path('technologies/by-total-capacity/', generation_etag(technology_list_optimized), name='technology_capacity_list'),
     
     path('components/', lambda request: redirect('search_map_view'), name='component_list'),
     path('locations/', lambda request: redirect('search_map_view'), name='location_list'),
@@ -224,16 +225,16 @@ urlpatterns = [
     
     # Individual pages (must come after directory pages) 
     # Accept both slugs and legacy URL-encoded names
-    path('companies/<path:company_name>/', company_detail_map, name='company_detail_map'),
-    path('technologies/<path:technology_name>/', technology_detail_map, name='technology_detail_map'),
-    path('cmus/<str:cmu_id>/', cmu_detail_map, name='cmu_detail_map'),
+    path('companies/<path:company_name>/', generation_etag(company_detail_map), name='company_detail_map'),
+    path('technologies/<path:technology_name>/', generation_etag(technology_detail_map), name='technology_detail_map'),
+    path('cmus/<str:cmu_id>/', generation_etag(cmu_detail_map), name='cmu_detail_map'),
     
     # Hierarchical structure: /locations/id/components/id
-    path('locations/<int:location_id>/components/<int:pk>/', get_component_details, name='component_detail_hierarchical'),
+    path('locations/<int:location_id>/components/<int:pk>/', generation_etag(get_component_details), name='component_detail_hierarchical'),
     
     # Flat structure (backward compatibility)
-    path('components/<int:pk>/', get_component_details, name='component_detail'),
-    path('locations/<int:location_id>/', location_detail, name='location_detail'),
+    path('components/<int:pk>/', generation_etag(get_component_details), name='component_detail'),
+    path('locations/<int:location_id>/', generation_etag(location_detail), name='location_detail'),
     
     # LEGACY URLs (will be redirected)
     path('company-map/<path:company_name>/', lambda request, company_name: redirect('company_detail_map', company_name=slugify(company_name), permanent=True)),
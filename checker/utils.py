@@ -228,28 +228,37 @@ class SmartCacheManager:
             info = self.redis_client.info('memory')
             used_memory = info.get('used_memory', 0)
             
-            # Heroku Redis free tier is 30MB
-            max_memory = 30 * 1024 * 1024  # 30MB in bytes
+            # Heroku Redis free tier is 30MB and doesn't always report maxmemory
+            max_memory = info.get('maxmemory') or getattr(settings, 'REDIS_MAX_MEMORY_BYTES', 30 * 1024 * 1024)
             
             usage_percentage = used_memory / max_memory
-            logger.debug(f"Redis memory usage: {usage_percentage:.1%} ({used_memory / 1024 / 1024:.1f}MB / 30MB)")
+            logger.debug(f"Redis memory usage: {usage_percentage:.1%} ({used_memory / 1024 / 1024:.1f}MB / {max_memory / 1024 / 1024:.0f}MB)")
             return usage_percentage
         except Exception as e:
             logger.error(f"Error checking Redis memory: {e}")
             return 0.0
     
     def clear_cache_if_needed(self):
-        """Clear cache if memory usage exceeds threshold"""
+        """
+        Relieve memory pressure when usage exceeds threshold.
+        With the tiered backend the budgeted namespaces are shrunk (coldest and
+        largest keys first) rather than flushing every warm key.
+        """
         usage = self.check_memory_usage()
         
         if usage >= self.threshold:
-            logger.warning(f"Redis memory usage at {usage:.1%}, clearing cache...")
             try:
-                cache.clear()
-                logger.info("Cache cleared successfully")
+                if hasattr(cache, 'shrink_namespaces'):
+                    logger.warning(f"Redis memory usage at {usage:.1%}, shrinking cache namespaces...")
+                    freed = cache.shrink_namespaces(fraction=0.5)
+                    logger.info(f"Freed {freed / 1024:.0f}KB from budgeted cache namespaces")
+                else:
+                    logger.warning(f"Redis memory usage at {usage:.1%}, clearing cache...")
+                    cache.clear()
+                    logger.info("Cache cleared successfully")
                 return True
             except Exception as e:
-                logger.error(f"Failed to clear cache: {e}")
+                logger.error(f"Failed to relieve cache memory: {e}")
         return False
 
 
@@ -37,6 +37,8 @@ from django.core.cache import cache
 
 from . import services
 from .services import data_access
+from .services.traffic_sketch import record_traffic
+from .services.request_coalescing import coalesce_requests
 from django.template.loader import render_to_string
 
 import stripe
@@ -769,8 +771,9 @@ def fetch_components_for_cmu_id(cmu_id, limit=None, page=1, per_page=100):
 def statistics_view(request):
     """View function for displaying database statistics"""
     from .utils import normalize
-    from django.db.models import Count, Q, Sum # Ensure Sum is imported
+    from django.db.models import F, Sum
     from django.core.cache import cache  # Add caching
+    from .services import statistics_rollups
     import logging # Add logging
     logger = logging.getLogger(__name__)
     
@@ -806,44 +809,33 @@ def statistics_view(request):
         company_sort = 'count' # Fallback to default
     if company_order not in ['asc', 'desc']:
         company_order = 'desc' # Fallback to default
-        
-    # Determine DB sort prefix
-    db_sort_prefix = '-' if company_order == 'desc' else ''
-        
+
     # --- Fetch Top Companies based on Sort Method --- 
-    top_companies_data = []
+    # Counts and capacity come from the precomputed rollups, not GROUP BYs over Component
+    total_components = statistics_rollups.totals()['component_count']
+    company_rows = statistics_rollups.ranked('company', company_sort, descending=company_order == 'desc')
     if company_sort == 'count':
         # Sort by Component Count
-        sort_field = f"{db_sort_prefix}count"
-        top_companies_data = Component.objects.exclude(company_name__isnull=True) \
-                                 .exclude(company_name='') \
-                                 .values('company_name') \
-                                 .annotate(count=Count('id')) \
-                                 .order_by(sort_field)[:COMPANY_LIMIT]
+        top_companies_data = list(
+            company_rows.values(company_name=F('key'), count=F('component_count'))[:COMPANY_LIMIT]
+        )
         # Add company_id and calculate percentage for display
-        total_components_for_pct = Component.objects.count() # Need total for percentage
         for company in top_companies_data:
             company['company_id'] = normalize(company['company_name'])
-            if total_components_for_pct > 0:
-                 company['percentage'] = (company['count'] / total_components_for_pct) * 100
+            if total_components > 0:
+                 company['percentage'] = (company['count'] / total_components) * 100
             else:
                  company['percentage'] = 0
         logger.info(f"Fetched top {len(top_companies_data)} companies sorted by count ({company_order}).")
     else: 
         # Sort by Total De-rated Capacity
-        sort_field = f"{db_sort_prefix}total_capacity"
-        top_companies_data = Component.objects.exclude(company_name__isnull=True) \
-                                 .exclude(company_name='') \
-                                 .exclude(derated_capacity_mw__isnull=True) \
-                                 .values('company_name') \
-                                 .annotate(total_capacity=Sum('derated_capacity_mw')) \
-                                 .order_by(sort_field)[:COMPANY_LIMIT]
+        top_companies_data = list(
+            company_rows.values(company_name=F('key'), total_capacity=F('derated_capacity_mw'))[:COMPANY_LIMIT]
+        )
         # Add company_id for links
         for company in top_companies_data:
             company['company_id'] = normalize(company['company_name'])
         logger.info(f"Fetched top {len(top_companies_data)} companies sorted by total capacity ({company_order}).")
-        
-    top_companies_data = list(top_companies_data) # Convert queryset to list
 
     # --- Technology Distribution Logic --- 
     # Determine Technology Sort Method
@@ -853,44 +845,33 @@ def statistics_view(request):
         tech_sort = 'count'
     if tech_order not in ['asc', 'desc']:
         tech_order = 'desc'
-    tech_db_sort_prefix = '-' if tech_order == 'desc' else ''
 
     # Count total distinct technologies (only needed for show_all check now)
-    total_distinct_tech_count = Component.objects.values('technology').distinct().count()
+    total_distinct_tech_count = statistics_rollups.rollups('technology').count()
     TECH_DISPLAY_LIMIT = 25
     show_all_techs = total_distinct_tech_count <= TECH_DISPLAY_LIMIT
 
-    # Base query excluding nulls/empties
-    base_tech_query = Component.objects.exclude(technology__isnull=True).exclude(technology='')
-
-    # Annotate and order based on sort selection
+    tech_rows = statistics_rollups.ranked('technology', tech_sort, descending=tech_order == 'desc')
     if tech_sort == 'count':
-        tech_queryset = base_tech_query.values('technology') \
-                                     .annotate(count=Count('id')) \
-                                     .order_by(f'{tech_db_sort_prefix}count')
+        tech_queryset = tech_rows.values(technology=F('key'), count=F('component_count'))
         logger.info(f"Fetching technologies sorted by count ({tech_order}).")
     else: # tech_sort == 'capacity'
-        # Exclude components with null capacity for this sort
-        tech_queryset = base_tech_query.exclude(derated_capacity_mw__isnull=True) \
-                                     .values('technology') \
-                                     .annotate(total_capacity=Sum('derated_capacity_mw')) \
-                                     .order_by(f'{tech_db_sort_prefix}total_capacity')
+        tech_queryset = tech_rows.values(technology=F('key'), total_capacity=F('derated_capacity_mw'))
         logger.info(f"Fetching technologies sorted by total capacity ({tech_order}).")
 
     # Apply limit if not showing all
     if not show_all_techs:
-        tech_distribution = tech_queryset[:TECH_DISPLAY_LIMIT]
+        tech_distribution = list(tech_queryset[:TECH_DISPLAY_LIMIT])
         logger.info(f"Displaying top {TECH_DISPLAY_LIMIT} technologies.")
     else:
-        tech_distribution = tech_queryset
-        logger.info(f"Displaying all {tech_distribution.count()} technologies.")
+        tech_distribution = list(tech_queryset)
+        logger.info(f"Displaying all {len(tech_distribution)} technologies.")
 
     # Get delivery year distribution - include all years
-    year_distribution = Component.objects.exclude(delivery_year__isnull=True) \
-                                 .exclude(delivery_year='') \
-                                 .values('delivery_year') \
-                                 .annotate(count=Count('id')) \
-                                 .order_by('delivery_year')  # Order by year ascending
+    year_rows = statistics_rollups.rollups('delivery_year')
+    year_distribution = list(
+        year_rows.order_by('key').values(delivery_year=F('key'), count=F('component_count'))  # Order by year ascending
+    )
     
     # --- New: Get Top Components by De-Rated Capacity (Using DB Field) --- 
     top_derated_components = []
@@ -915,30 +896,27 @@ def statistics_view(request):
     # --- End New Section --- 
 
     # Get total counts
-    total_components = Component.objects.count()
-    total_cmus = Component.objects.values('cmu_id').distinct().count()
-    total_companies = Component.objects.exclude(company_name__isnull=True) \
-                              .exclude(company_name='') \
-                              .values('company_name').distinct().count()
+    dataset_totals = statistics_rollups.totals()
+    total_cmus = dataset_totals['cmu_count']
+    total_companies = statistics_rollups.rollups('company').count()
     # Get count of unique locations
-    total_unique_locations = Component.objects.exclude(location__isnull=True) \
-                                    .exclude(location='') \
-                                    .values('location').distinct().count()
+    total_unique_locations = dataset_totals['location_count']
                                     
     # Get components currently in capacity market (2025-2028)
     current_market_base_query = Component.objects.filter(
-        delivery_year__gte='2025',
-        delivery_year__lte='2028'
+        delivery_year_start__gte=2025,
+        delivery_year_start__lte=2028
     )
-    current_market_count = current_market_base_query.count() # Get total count first
+    current_market_count = year_rows.filter(key__gte='2025', key__lte='2028') \
+                                    .aggregate(total=Sum('component_count'))['total'] or 0
     current_market_components = current_market_base_query.order_by('location')[:20]  # Then slice for display
 
     # Get components that were in the market before 2025 but are no longer in later years
     # Find CMUs not in current market
     past_market_cmus = (
         Component.objects
-        .filter(delivery_year__lt='2025')
-        .exclude(cmu_id__in=Component.objects.filter(delivery_year__gte='2025').values_list('cmu_id', flat=True))
+        .filter(delivery_year_start__lt=2025)
+        .exclude(cmu_id__in=Component.objects.filter(delivery_year_start__gte=2025).values_list('cmu_id', flat=True))
         .values('cmu_id')
         .distinct()
     )
@@ -949,8 +927,8 @@ def statistics_view(request):
         cmu_id = cmu_entry['cmu_id']
         latest_comp = Component.objects.filter(
             cmu_id=cmu_id, 
-            delivery_year__lt='2025'
-        ).order_by('-delivery_year').first()
+            delivery_year_start__lt=2025
+        ).order_by('-delivery_year_start').first()
         
         if latest_comp:
             past_market_components.append(latest_comp)
@@ -963,7 +941,7 @@ def statistics_view(request):
         company['company_id'] = normalize(company['company_name'])
         
     # Re-enable percentage calculation for tech distribution (always based on count for now)
-    total_components_for_pct = Component.objects.count()
+    total_components_for_pct = total_components
     for tech in tech_distribution:
         # If sorting by capacity, we need to add the component count separately if needed for display
         # For simplicity, let's just calculate percentage based on total components count
@@ -988,56 +966,42 @@ def statistics_view(request):
     CHART_LIMIT = 10
     
     # Company Chart Data (by Count)
-    company_count_chart_data = Component.objects.exclude(company_name__isnull=True).exclude(company_name='') \
-                                     .values('company_name') \
-                                     .annotate(count=Count('id')) \
-                                     .order_by('-count')
-    company_count_chart_labels = [c['company_name'] for c in company_count_chart_data[:CHART_LIMIT]]
-    company_count_chart_values = [c['count'] for c in company_count_chart_data[:CHART_LIMIT]]
+    company_count_chart_data = list(statistics_rollups.ranked('company', 'count').values_list('key', 'component_count'))
+    company_count_chart_labels = [name for name, _ in company_count_chart_data[:CHART_LIMIT]]
+    company_count_chart_values = [count for _, count in company_count_chart_data[:CHART_LIMIT]]
     # Add 'Other' category if needed
-    if company_count_chart_data.count() > CHART_LIMIT:
-        other_count = sum(c['count'] for c in company_count_chart_data[CHART_LIMIT:])
+    if len(company_count_chart_data) > CHART_LIMIT:
+        other_count = sum(count for _, count in company_count_chart_data[CHART_LIMIT:])
         company_count_chart_labels.append('Other')
         company_count_chart_values.append(other_count)
 
     # Company Chart Data (by Capacity)
-    company_capacity_chart_data = Component.objects.exclude(company_name__isnull=True).exclude(company_name='') \
-                                        .exclude(derated_capacity_mw__isnull=True) \
-                                        .values('company_name') \
-                                        .annotate(total_capacity=Sum('derated_capacity_mw')) \
-                                        .order_by('-total_capacity')
-    company_capacity_chart_labels = [c['company_name'] for c in company_capacity_chart_data[:CHART_LIMIT]]
-    company_capacity_chart_values = [float(c['total_capacity']) for c in company_capacity_chart_data[:CHART_LIMIT]] # Ensure float
+    company_capacity_chart_data = list(statistics_rollups.ranked('company', 'capacity').values_list('key', 'derated_capacity_mw'))
+    company_capacity_chart_labels = [name for name, _ in company_capacity_chart_data[:CHART_LIMIT]]
+    company_capacity_chart_values = [capacity for _, capacity in company_capacity_chart_data[:CHART_LIMIT]]
     # Add 'Other' category if needed
-    if company_capacity_chart_data.count() > CHART_LIMIT:
-        other_capacity = sum(float(c['total_capacity']) for c in company_capacity_chart_data[CHART_LIMIT:])
+    if len(company_capacity_chart_data) > CHART_LIMIT:
+        other_capacity = sum(capacity for _, capacity in company_capacity_chart_data[CHART_LIMIT:])
         company_capacity_chart_labels.append('Other')
         company_capacity_chart_values.append(other_capacity)
 
     # Technology Chart Data (by Count)
-    tech_chart_data = Component.objects.exclude(technology__isnull=True).exclude(technology='') \
-                          .values('technology') \
-                          .annotate(count=Count('id')) \
-                          .order_by('-count')
-    tech_chart_labels = [t['technology'] for t in tech_chart_data[:CHART_LIMIT]]
-    tech_chart_values = [t['count'] for t in tech_chart_data[:CHART_LIMIT]]
+    tech_chart_data = list(statistics_rollups.ranked('technology', 'count').values_list('key', 'component_count'))
+    tech_chart_labels = [name for name, _ in tech_chart_data[:CHART_LIMIT]]
+    tech_chart_values = [count for _, count in tech_chart_data[:CHART_LIMIT]]
     # Add 'Other' category if needed
-    if tech_chart_data.count() > CHART_LIMIT:
-        other_tech_count = sum(t['count'] for t in tech_chart_data[CHART_LIMIT:])
+    if len(tech_chart_data) > CHART_LIMIT:
+        other_tech_count = sum(count for _, count in tech_chart_data[CHART_LIMIT:])
         tech_chart_labels.append('Other')
         tech_chart_values.append(other_tech_count)
 
     # Technology Chart Data (by Capacity)
-    tech_capacity_chart_data = Component.objects.exclude(technology__isnull=True).exclude(technology='') \
-                                   .exclude(derated_capacity_mw__isnull=True) \
-                                   .values('technology') \
-                                   .annotate(total_capacity=Sum('derated_capacity_mw')) \
-                                   .order_by('-total_capacity')
-    tech_capacity_chart_labels = [t['technology'] for t in tech_capacity_chart_data[:CHART_LIMIT]]
-    tech_capacity_chart_values = [float(t['total_capacity']) for t in tech_capacity_chart_data[:CHART_LIMIT]] # Ensure float
+    tech_capacity_chart_data = list(statistics_rollups.ranked('technology', 'capacity').values_list('key', 'derated_capacity_mw'))
+    tech_capacity_chart_labels = [name for name, _ in tech_capacity_chart_data[:CHART_LIMIT]]
+    tech_capacity_chart_values = [capacity for _, capacity in tech_capacity_chart_data[:CHART_LIMIT]]
     # Add 'Other' category if needed
-    if tech_capacity_chart_data.count() > CHART_LIMIT:
-        other_tech_capacity = sum(float(t['total_capacity']) for t in tech_capacity_chart_data[CHART_LIMIT:])
+    if len(tech_capacity_chart_data) > CHART_LIMIT:
+        other_tech_capacity = sum(capacity for _, capacity in tech_capacity_chart_data[CHART_LIMIT:])
         tech_capacity_chart_labels.append('Other')
         tech_capacity_chart_values.append(other_tech_capacity)
 
@@ -1093,7 +1057,7 @@ def current_market_list(request):
     order = request.GET.get('order', 'asc') # Default order
     db_sort_prefix = '-' if order == 'desc' else ''
     if sort_by == 'year':
-        db_sort_field = f'{db_sort_prefix}delivery_year'
+        db_sort_field = f'{db_sort_prefix}delivery_year_start'
     else: # Default to location
         sort_by = 'location' # Ensure sort_by reflects the actual field
         db_sort_field = f'{db_sort_prefix}location'
@@ -1101,8 +1065,8 @@ def current_market_list(request):
 
     # Base query
     base_query = Component.objects.filter(
-        delivery_year__gte='2025',
-        delivery_year__lte='2028'
+        delivery_year_start__gte=2025,
+        delivery_year_start__lte=2028
     )
 
     # Get total count before sorting/pagination
@@ -1168,12 +1132,12 @@ def past_market_list(request):
         
         # Get a list of all CMU IDs that existed before 2025
         past_cmus_query = Component.objects.filter(
-            delivery_year__lt='2025'
+            delivery_year_start__lt=2025
         ).values_list('cmu_id', flat=True).distinct()
     
         # Get a list of all CMU IDs that exist in 2025+
         current_cmus_query = Component.objects.filter(
-            delivery_year__gte='2025'
+            delivery_year_start__gte=2025
         ).values_list('cmu_id', flat=True).distinct()
     
         print(f"Computing past CMUs (this may take a moment)...")
@@ -1199,8 +1163,8 @@ def past_market_list(request):
         for cmu_id in past_only_cmus:
             latest = Component.objects.filter(
                 cmu_id=cmu_id,
-                delivery_year__lt='2025'
-            ).order_by('-delivery_year').first()
+                delivery_year_start__lt=2025
+            ).order_by('-delivery_year_start').first()
     
             if latest:
                 all_latest_components.append(latest)
@@ -1817,7 +1781,7 @@ def technology_search_results(request, technology_name_encoded):
     
     try:
         # Query components filtered by technology (case-insensitive)
-        component_queryset = Component.objects.filter(technology__iexact=technology_name)
+        component_queryset = Component.objects.select_related('raw_payload').filter(technology__iexact=technology_name)
         
         # Apply database sorting only for date field                                
         if sort_field == "date":
@@ -2168,6 +2132,7 @@ def derated_capacity_list(request):
     
     logger.info(f"❌ derated_capacity_list cache MISS for page {page} - building...")
     from django.core.paginator import Paginator, EmptyPage, PageNotAnInteger
+    from .services import statistics_rollups
     
     logger.info("Full De-rated Capacity list requested")
     page = request.GET.get("page", 1)
@@ -2193,11 +2158,12 @@ def derated_capacity_list(request):
                                           .order_by(db_sort_field) \
                                           .only('id', 'location', 'company_name', 'derated_capacity_mw')
                                           
-        total_count = component_queryset.count()
+        total_count = statistics_rollups.totals()['capacity_component_count']
         logger.info(f"Found {total_count} components with de-rated capacity, sorting by {db_sort_field}")
         
         # Apply pagination directly to the queryset
         paginator = Paginator(component_queryset, per_page)
+        paginator.count = total_count  # Known from the rollups - skips a COUNT(*) over Component
         try:
             components_page = paginator.page(page)
         except PageNotAnInteger:
@@ -2284,8 +2250,9 @@ def company_capacity_list(request):
     
     logger.info(f"❌ company_capacity_list cache MISS for page {page} - building...")
     from django.core.paginator import Paginator, EmptyPage, PageNotAnInteger
-    from django.db.models import Sum
+    from django.db.models import F
     from .utils import normalize
+    from .services import statistics_rollups
     
     logger.info("Full Company list by Total Capacity requested")
     page = request.GET.get("page", 1)
@@ -2296,10 +2263,6 @@ def company_capacity_list(request):
     per_page = 50 # Companies per page
     start_time = time.time()
     
-    # Determine database sort order based on parameter
-    db_sort_prefix = '-' if sort_order_param == 'desc' else ''
-    db_sort_field = f'{db_sort_prefix}total_capacity'
-    
     company_list = []
     error_message = None
     total_count = 0
@@ -2307,16 +2270,12 @@ def company_capacity_list(request):
     paginator = None
     
     try:
-        # Query companies ranked by total capacity (similar to statistics view)
-        company_queryset = Component.objects.exclude(company_name__isnull=True) \
-                                    .exclude(company_name='') \
-                                    .exclude(derated_capacity_mw__isnull=True) \
-                                    .values('company_name') \
-                                    .annotate(total_capacity=Sum('derated_capacity_mw')) \
-                                    .order_by(db_sort_field)
+        # Companies ranked by total capacity from the precomputed rollups (as the statistics view)
+        company_queryset = statistics_rollups.ranked('company', 'capacity', descending=sort_order_param == 'desc') \
+                                             .values(company_name=F('key'), total_capacity=F('derated_capacity_mw'))
                                     
         total_count = company_queryset.count()
-        logger.info(f"Found {total_count} companies with de-rated capacity, sorting by {db_sort_field}")
+        logger.info(f"Found {total_count} companies with de-rated capacity, sorting {sort_order_param}")
         
         # Apply pagination directly to the queryset
         paginator = Paginator(company_queryset, per_page)
@@ -2404,24 +2363,19 @@ def company_component_count_list_view(request):
     sort_order = request.GET.get('sort', 'desc') # Default to descending
     page_number = request.GET.get('page', 1)
 
-    # Annotate each company with its total component count
-    # We need to count distinct components linked to each company.
-    # Assuming Component model has a ForeignKey to a Company-like model or a company_name field.
-    # If using a direct relation (e.g., component.company_info), it would be:
-    # companies_with_counts = CompanyInfo.objects.annotate(component_count=Count('component'))
-    # If using component.company_name and need to group by that:
-    companies_with_counts = Component.objects.values('company_name') \
-                                .annotate(component_count=Count('id')) \
-                                .exclude(company_name__isnull=True).exclude(company_name__exact='')
+    from django.db.models import F
+    from .services import statistics_rollups
 
+    # Component count per company, precomputed in the statistics rollups
     if sort_order == 'asc':
-        ordered_companies = companies_with_counts.order_by('component_count', 'company_name')
+        ordered_companies = statistics_rollups.ranked('company', 'count', descending=False)
         current_sort_label = "Smallest First"
         new_sort_order = 'desc'
     else: # Default to descending
-        ordered_companies = companies_with_counts.order_by('-component_count', 'company_name')
+        ordered_companies = statistics_rollups.ranked('company', 'count')
         current_sort_label = "Largest First"
         new_sort_order = 'asc'
+    ordered_companies = ordered_companies.values('component_count', company_name=F('key'))
 
     paginator = Paginator(ordered_companies, 50) # Show 50 companies per page
     page_obj = paginator.get_page(page_number)
@@ -2475,8 +2429,8 @@ def technology_list_view(request):
     
     logger.info(f"❌ technology_list_view cache MISS for page {page} - building...")
     from django.core.paginator import Paginator, EmptyPage, PageNotAnInteger
-    from django.db.models import Count
-    from .models import Component
+    from django.db.models import F
+    from .services import statistics_rollups
     import logging
     import time
 
@@ -2488,12 +2442,9 @@ def technology_list_view(request):
     error_message = None
 
     try:
-        # Query all non-empty technologies, count components, order by count
-        tech_queryset = Component.objects.exclude(technology__isnull=True) \
-                                 .exclude(technology='') \
-                                 .values('technology') \
-                                 .annotate(count=Count('id')) \
-                                 .order_by('-count')
+        # All non-empty technologies by component count, from the precomputed rollups
+        tech_queryset = statistics_rollups.ranked('technology', 'count') \
+                                          .values(technology=F('key'), count=F('component_count'))
         
         total_count = tech_queryset.count()
         logger.info(f"Found {total_count} distinct non-empty technologies.")
@@ -2508,7 +2459,7 @@ def technology_list_view(request):
             tech_page = paginator.page(paginator.num_pages)
             
         # Calculate percentages for display relative to total components
-        total_components = Component.objects.count()
+        total_components = statistics_rollups.totals()['component_count']
         for tech_data in tech_page.object_list:
             if total_components > 0:
                 tech_data['percentage'] = (tech_data['count'] / total_components) * 100
@@ -2573,8 +2524,8 @@ def technology_capacity_list_view(request):
     
     logger.info(f"❌ technology_capacity_list_view cache MISS for page {page} - building...")
     from django.core.paginator import Paginator, EmptyPage, PageNotAnInteger
-    from django.db.models import Sum, Value, FloatField # Import FloatField
-    from django.db.models.functions import Coalesce
+    from django.db.models import F
+    from .services import statistics_rollups
     import logging
     import time
 
@@ -2592,26 +2543,16 @@ def technology_capacity_list_view(request):
     tech_page = None
     paginator = None
 
-    # Determine database sort order based on parameter
-    db_sort_prefix = '-' if sort_order_param == 'desc' else ''
-    db_sort_field = f'{db_sort_prefix}total_capacity'
-
     try:
-        # Calculate the grand total capacity of all technologies
-        grand_total_capacity_result = Component.objects.exclude(derated_capacity_mw__isnull=True) \
-                                               .aggregate(grand_total=Coalesce(Sum('derated_capacity_mw', output_field=FloatField()), Value(0.0, output_field=FloatField())))
-        grand_total_capacity = grand_total_capacity_result['grand_total']
+        # Grand total and per-technology capacity come from the precomputed rollups
+        grand_total_capacity = statistics_rollups.totals()['derated_capacity_mw']
 
         # Query technologies ranked by total capacity
-        tech_queryset = Component.objects.exclude(technology__isnull=True) \
-                                   .exclude(technology='') \
-                                   .exclude(derated_capacity_mw__isnull=True) \
-                                   .values('technology') \
-                                   .annotate(total_capacity=Sum('derated_capacity_mw', output_field=FloatField())) \
-                                   .order_by(db_sort_field)
+        tech_queryset = statistics_rollups.ranked('technology', 'capacity', descending=sort_order_param == 'desc') \
+                                          .values(technology=F('key'), total_capacity=F('derated_capacity_mw'))
                                     
         total_count = tech_queryset.count()
-        logger.info(f"Found {total_count} technologies with de-rated capacity, sorting by {db_sort_field}. Grand total capacity: {grand_total_capacity}")
+        logger.info(f"Found {total_count} technologies with de-rated capacity, sorting {sort_order_param}. Grand total capacity: {grand_total_capacity}")
         
         paginator = Paginator(tech_queryset, per_page)
         try:
@@ -2846,9 +2787,11 @@ def company_map_results_view(request):
     
     return render(request, 'checker/map_company.html', context)
 
+@record_traffic
 @monitor_api
 @gzip_page
 @map_access_required
+@coalesce_requests('map_data', vary_on_user=False)
 def map_data_api(request):
     """
     Main map data API for fetching components by viewport and filters.
@@ -12,6 +12,7 @@ import logging
 from .models import Component, CMURegistry, LocationGroup
 from .services.company_search import search_companies_service
 from .services.component_search import search_components_service
+from .decorators.read_replica import read_replica
 
 logger = logging.getLogger(__name__)
 
@@ -26,6 +27,7 @@ def add_cors_headers(response):
 
 @csrf_exempt
 @require_http_methods(["GET", "POST", "OPTIONS"])
+@read_replica
 def api_search(request):
     """
     Main search endpoint for the API subdomain.
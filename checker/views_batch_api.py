@@ -14,15 +14,21 @@ import json
 import time
 import logging
 
-from .models import LocationGroup
+from .models import LocationMapPoint
+from .services.map_points import filter_technology, popup_rows, viewport_q
 from .services.map_cache import get_cached_map_data, cache_map_data, generate_map_cache_key
 from .decorators.access_required import map_access_required
+from .decorators.precompressed import precompressed_response
+from .decorators.read_replica import read_replica
+from .services.request_coalescing import coalesce_requests
 
 logger = logging.getLogger(__name__)
 
 
 @map_access_required
-@gzip_page
+@precompressed_response('batch_geojson', timeout=60 * 60)
+@coalesce_requests('batch_geojson', vary_on_user=False)
+@read_replica
 def batch_geojson_api(request):
     """
     Batch API endpoint that can handle multiple technology requests in a single call.
@@ -113,73 +119,55 @@ def batch_geojson_api(request):
 def generate_technology_geojson(technology, search_query, viewport, show_active, limit):
     """
     Generate GeoJSON data for a specific technology with optimized database queries.
+    Filters on the narrow LocationMapPoint rows; popup fields come from LocationGroup
+    for the returned points only.
     """
-    # Start with base query
-    location_groups = LocationGroup.objects.filter(
-        latitude__isnull=False,
-        longitude__isnull=False
-    )
-    
     # Apply viewport filtering for performance
-    location_groups = location_groups.filter(
-        latitude__gte=viewport['south'],
-        latitude__lte=viewport['north'],
-        longitude__gte=viewport['west'],
-        longitude__lte=viewport['east']
+    points = LocationMapPoint.objects.filter(
+        viewport_q(viewport['south'], viewport['west'], viewport['north'], viewport['east'])
     )
     
     # Apply active/inactive filter
-    if show_active:
-        location_groups = location_groups.filter(is_active=True)
-    else:
-        location_groups = location_groups.filter(is_active=False)
+    points = points.filter(is_active=bool(show_active))
     
     # Apply technology filter
     if technology and technology != 'All':
-        # Map technology variations
-        tech_variations = get_technology_variations(technology)
-        tech_filter = Q()
-        for variation in tech_variations:
-            tech_filter |= Q(technologies__has_key=variation)
-        location_groups = location_groups.filter(tech_filter)
+        points = filter_technology(points, technology)
     
     # Apply search query if provided
     if search_query:
         if search_query.upper().startswith(('CMU', 'BMU', 'DSR')):
-            location_groups = location_groups.filter(cmu_ids__contains=search_query.upper())
+            points = points.filter(location_group__cmu_ids__contains=search_query.upper())
         else:
             search_terms = search_query.split()
             for term in search_terms:
-                location_groups = location_groups.filter(
-                    Q(location__icontains=term) | Q(descriptions__icontains=term)
+                points = points.filter(
+                    Q(location_group__location__icontains=term) | Q(location_group__descriptions__icontains=term)
                 )
     
-    # Limit results and select only needed fields
-    location_groups = location_groups.only(
-        'location', 'latitude', 'longitude', 'technologies', 'companies', 
-        'descriptions', 'component_count', 'normalized_capacity_mw'
-    )[:limit]
+    # Limit results, then read the wide popup fields for just these points
+    points = list(points.order_by('pk')[:limit])
+    popups = popup_rows([point.pk for point in points], ['location', 'companies', 'descriptions'])
     
     # Build GeoJSON features
     features = []
-    for loc in location_groups:
-        # Get primary technology for this location
-        primary_tech = get_primary_technology(loc.technologies, technology)
+    for point in points:
+        popup = popups.get(point.pk, {})
         
         feature = {
             'type': 'Feature',
             'geometry': {
                 'type': 'Point',
-                'coordinates': [float(loc.longitude), float(loc.latitude)]
+                'coordinates': [point.longitude, point.latitude]
             },
             'properties': {
-                'id': loc.id,
-                'title': loc.location,
-                'technology': primary_tech,
-                'component_count': loc.component_count or 0,
-                'capacity_mw': loc.normalized_capacity_mw or 0,
-                'companies': loc.companies or {},
-                'description': get_location_description(loc.descriptions)
+                'id': point.pk,
+                'title': popup.get('location', ''),
+                'technology': get_primary_technology(point, technology),
+                'component_count': point.component_count,
+                'capacity_mw': point.capacity_mw or 0,
+                'companies': popup.get('companies') or {},
+                'description': get_location_description(popup.get('descriptions'))
             }
         }
         features.append(feature)
@@ -195,43 +183,14 @@ def generate_technology_geojson(technology, search_query, viewport, show_active,
     }
 
 
-def get_technology_variations(technology):
-    """Return all variations of a technology name that might exist in the database."""
-    tech_variations = {
-        'CHP': ['CHP', 'Combined Heat and Power (CHP)', 'CHP and autogeneration'],
-        'DSR': ['DSR', 'Demand Side Response'],
-        'Battery': ['Battery', 'Battery Storage', 'Battery storage'],
-        'OCGT': ['Gas', 'Gas - OCGTs and reciprocating engines', 'Gas reciprocating engines', 
-                'OCGT', 'Combined Cycle Gas Turbine (CCGT)'],
-        'Wind': ['Wind', 'Onshore Wind', 'Offshore Wind'],
-        'Solar': ['Solar', 'Solar Photovoltaics'],
-        'Nuclear': ['Nuclear'],
-        'Hydro': ['Hydro', 'Hydro Power', 'Pumped Storage Hydro'],
-        'Biomass': ['Biomass', 'Biomass and waste'],
-        'Interconnector': ['Interconnector'],
-        'Coal': ['Coal']
-    }
-    
-    return tech_variations.get(technology, [technology])
-
-
-def get_primary_technology(technologies_dict, requested_tech):
-    """Get the primary technology for a location, preferring the requested technology."""
-    if not technologies_dict:
-        return 'Unknown'
-    
-    # If requested technology exists, use it
-    if requested_tech and requested_tech in technologies_dict:
+def get_primary_technology(point, requested_tech):
+    """Get the primary technology for a map point, preferring the requested technology."""
+    # Points are already filtered to the requested technology, so show its simplified name
+    if requested_tech and requested_tech != 'All':
         return requested_tech
     
-    # Check for technology variations
-    tech_variations = get_technology_variations(requested_tech)
-    for variation in tech_variations:
-        if variation in technologies_dict:
-            return requested_tech  # Return the simplified name
-    
-    # Otherwise, return the technology with the highest count
-    return max(technologies_dict.items(), key=lambda x: x[1])[0]
+    # Otherwise, the technology with the highest count
+    return point.primary_technology or 'Unknown'
 
 
 def get_location_description(descriptions_dict):
@@ -248,6 +207,7 @@ def get_location_description(descriptions_dict):
 
 @map_access_required
 @gzip_page
+@read_replica
 def optimized_geojson_stream(request):
     """
     Streaming GeoJSON endpoint for very large datasets.
@@ -266,26 +226,19 @@ def optimized_geojson_stream(request):
         yield '{"type":"FeatureCollection","features":['
         
         # Get query for locations
-        location_groups = LocationGroup.objects.filter(
-            latitude__isnull=False,
-            longitude__isnull=False,
-            latitude__gte=viewport['south'],
-            latitude__lte=viewport['north'],
-            longitude__gte=viewport['west'],
-            longitude__lte=viewport['east']
-        ).only('location', 'latitude', 'longitude', 'technologies', 'component_count')
+        points = LocationMapPoint.objects.filter(
+            viewport_q(viewport['south'], viewport['west'], viewport['north'], viewport['east'])
+        ).select_related('location_group').only(
+            'latitude', 'longitude', 'primary_technology', 'component_count', 'location_group__location'
+        )
         
         # Apply technology filter
         if technology != 'All':
-            tech_variations = get_technology_variations(technology)
-            tech_filter = Q()
-            for variation in tech_variations:
-                tech_filter |= Q(technologies__has_key=variation)
-            location_groups = location_groups.filter(tech_filter)
+            points = filter_technology(points, technology)
         
         # Stream results
         first = True
-        for loc in location_groups.iterator(chunk_size=100):
+        for point in points.iterator(chunk_size=100):
             if not first:
                 yield ','
             first = False
@@ -294,13 +247,13 @@ def optimized_geojson_stream(request):
                 'type': 'Feature',
                 'geometry': {
                     'type': 'Point',
-                    'coordinates': [float(loc.longitude), float(loc.latitude)]
+                    'coordinates': [point.longitude, point.latitude]
                 },
                 'properties': {
-                    'id': loc.id,
-                    'title': loc.location,
-                    'technology': get_primary_technology(loc.technologies, technology),
-                    'component_count': loc.component_count or 0
+                    'id': point.pk,
+                    'title': point.location_group.location,
+                    'technology': get_primary_technology(point, technology),
+                    'component_count': point.component_count
                 }
             }
             yield json.dumps(feature)
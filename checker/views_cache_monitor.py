@@ -86,6 +86,15 @@ def cache_monitor_api(request):
         except Exception as e:
             redis_stats = {'error': f'Redis connection failed: {str(e)}'}
         
+        # Per key family hits/misses/bytes (TieredRedisCache only)
+        namespace_stats = {}
+        if hasattr(cache, 'namespace_stats'):
+            try:
+                days = max(1, min(int(request.GET.get('days', 1)), 7))
+                namespace_stats = cache.namespace_stats(days=days)
+            except Exception as e:
+                namespace_stats = {'error': f'Namespace stats unavailable: {str(e)}'}
+        
         # Calculate performance metrics
         hit_rate_numeric = 0
         if stats['total_requests'] > 0:
@@ -100,6 +109,7 @@ def cache_monitor_api(request):
             'cache_stats': stats,
             'cache_details': cache_details,
             'redis_stats': redis_stats,
+            'namespace_stats': namespace_stats,
             'performance_metrics': {
                 'hit_rate_numeric': round(hit_rate_numeric, 2),
                 'estimated_db_queries_saved': estimated_db_queries_saved,
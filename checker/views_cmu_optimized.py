@@ -3,12 +3,11 @@ Optimized CMU detail view using LocationGroup for high performance
 """
 import logging
 import time
-import re
 from django.shortcuts import render, get_object_or_404
 from django.core.paginator import Paginator
-from django.db.models import Q, Sum, Count
+from django.db.models import F, Q, Sum, Count
 
-from .models import LocationGroup, CMURegistry
+from .models import LocationGroup, CMURegistry, auction_sort_key
 
 logger = logging.getLogger(__name__)
 
@@ -59,31 +58,9 @@ def cmu_detail_optimized(request, cmu_id):
     
     # Apply status filter
     if status_filter == 'active':
-        # Filter for locations with any auction year >= 2024-25
-        filtered_ids = []
-        for lg in location_groups:
-            if lg.auction_years:
-                is_active = False
-                for year_str in lg.auction_years:
-                    if any(pattern in year_str for pattern in ['2024-25', '2025-26', '2026-27', '2027-28', '2028-29', '2029-30']):
-                        is_active = True
-                        break
-                if is_active:
-                    filtered_ids.append(lg.id)
-        location_groups = location_groups.filter(id__in=filtered_ids)
+        location_groups = location_groups.filter(is_active=True)
     elif status_filter == 'inactive':
-        # Filter for locations with NO auction years >= 2024-25
-        filtered_ids = []
-        for lg in location_groups:
-            if lg.auction_years:
-                is_active = False
-                for year_str in lg.auction_years:
-                    if any(pattern in year_str for pattern in ['2024-25', '2025-26', '2026-27', '2027-28', '2028-29', '2029-30']):
-                        is_active = True
-                        break
-                if not is_active:
-                    filtered_ids.append(lg.id)
-        location_groups = location_groups.filter(id__in=filtered_ids)
+        location_groups = location_groups.filter(is_active=False)
     
     # Apply auction year filter
     if auction_filter:
@@ -99,33 +76,17 @@ def cmu_detail_optimized(request, cmu_id):
     elif sort_by == 'components':
         order_field = 'component_count'
     elif sort_by == 'date':
-        # For date sorting, we need to handle it manually since it's JSON data
-        # Get all location groups and sort by most recent auction year
-        location_groups_list = list(location_groups)
-        
-        def get_latest_auction_year(lg):
-            if not lg.auction_years:
-                return 0
-            years = []
-            for year_str in lg.auction_years:
-                match = re.search(r'(\d{4})-\d{2}', year_str)
-                if match:
-                    years.append(int(match.group(1)))
-            return max(years) if years else 0
-        
-        location_groups_list.sort(
-            key=get_latest_auction_year, 
-            reverse=(sort_order == 'desc')
-        )
-        
-        # Convert back to list for pagination
-        location_groups = location_groups_list
-        
+        # Newest delivery year at each location (denormalized by the builder)
+        order_field = 'latest_delivery_year'
     else:  # Default to capacity
         order_field = 'normalized_capacity_mw'
     
-    # Apply regular database sorting (skip if we did manual date sorting)
-    if sort_by != 'date':
+    # Apply database sorting
+    if order_field == 'latest_delivery_year':
+        location_groups = location_groups.order_by(
+            F(order_field).desc(nulls_last=True) if sort_order == 'desc' else F(order_field).asc(nulls_last=True)
+        )
+    else:
         if sort_order == 'desc' and order_field not in ['location']:
             order_field = f'-{order_field}'
         elif sort_order == 'asc' and order_field == 'location':
@@ -136,26 +97,17 @@ def cmu_detail_optimized(request, cmu_id):
         location_groups = location_groups.order_by(order_field)
     
     # Calculate CMU-wide statistics
-    if sort_by == 'date':
-        # For manual sorting, calculate stats from the list
-        stats = {
-            'total_locations': len(location_groups),
-            'total_capacity': sum(lg.normalized_capacity_mw or 0 for lg in location_groups),
-            'total_components': sum(lg.component_count or 0 for lg in location_groups)
-        }
-    else:
-        stats = location_groups.aggregate(
-            total_locations=Count('id'),
-            total_capacity=Sum('normalized_capacity_mw'),
-            total_components=Sum('component_count')
-        )
+    stats = location_groups.aggregate(
+        total_locations=Count('id'),
+        total_capacity=Sum('normalized_capacity_mw'),
+        total_components=Sum('component_count')
+    )
     
     # Gather all technologies and companies
     all_technologies = set()
     all_companies = set()
     all_auction_years = set()
-    location_groups_iter = location_groups if sort_by == 'date' else location_groups
-    for lg in location_groups_iter:
+    for lg in location_groups:
         if lg.technologies:
             all_technologies.update(lg.technologies.keys())
         if lg.companies:
@@ -164,7 +116,7 @@ def cmu_detail_optimized(request, cmu_id):
             all_auction_years.update(lg.auction_years)
     
     # Paginate only if we have results
-    if (sort_by == 'date' and location_groups) or (sort_by != 'date' and location_groups.exists()):
+    if location_groups.exists():
         paginator = Paginator(location_groups, per_page)
         try:
             page_obj = paginator.page(page)
@@ -177,14 +129,7 @@ def cmu_detail_optimized(request, cmu_id):
         page_obj = Page([], 1, paginator)
     
     # Sort auction years (newest first)
-    def get_year_key(year_str):
-        import re
-        match = re.search(r'(\d{4})-\d{2}', year_str)
-        if match:
-            return int(match.group(1))
-        return 0
-    
-    sorted_auction_years = sorted(all_auction_years, key=get_year_key, reverse=True)
+    sorted_auction_years = sorted(all_auction_years, key=auction_sort_key, reverse=True)
     
     # Build context
     context = {
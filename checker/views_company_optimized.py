@@ -11,7 +11,7 @@ from django.views.decorators.cache import cache_page
 from django.views.decorators.gzip import gzip_page
 import urllib.parse
 
-from .models import LocationGroup, Component
+from .models import LocationGroup, Component, auction_sort_key
 from .utils import normalize, deslugify
 from .decorators.access_required import map_access_required
 from .decorators.bot_protection import bot_protected_view
@@ -159,6 +159,8 @@ def company_detail_optimized(request, company_id):
         'component_count',          # Displayed as count
         'descriptions',             # Displayed as description text
         'technologies',             # Displayed as technology badges
+        'auction_years',            # Displayed as auction years
+        'is_active',                # Displayed as Active/Inactive
         'normalized_capacity_mw'    # Displayed as capacity
     )
     
@@ -176,14 +178,7 @@ def company_detail_optimized(request, company_id):
         page_obj = Page([], 1, paginator)
     
     # Sort auction years (newest first)
-    def get_year_key(year_str):
-        import re
-        match = re.search(r'(\d{4})-\d{2}', year_str)
-        if match:
-            return int(match.group(1))
-        return 0
-    
-    sorted_auction_years = sorted(all_auction_years, key=get_year_key, reverse=True)
+    sorted_auction_years = sorted(all_auction_years, key=auction_sort_key, reverse=True)
     
     # Generate structured data for SEO
     class CompanyData:
@@ -394,7 +389,7 @@ def company_detail_map(request, company_name=None, company_slug=None):
     optimized_locations = location_groups.only(
         'id', 'location', 'county', 'latitude', 'longitude',
         'descriptions', 'technologies', 'companies', 'auction_years',
-        'component_count', 'normalized_capacity_mw'
+        'is_active', 'component_count', 'normalized_capacity_mw'
     )
     
     # Pagination BEFORE creating list (key optimization!)
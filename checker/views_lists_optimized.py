@@ -12,10 +12,14 @@ import json
 
 from .models import Component, LocationGroup
 from .utils import normalize
+from .services.traffic_sketch import record_traffic
+from .decorators.read_replica import read_replica
 
 logger = logging.getLogger(__name__)
 
 
+@record_traffic
+@read_replica
 def company_list_optimized(request):
     """
     Optimized company list view supporting multiple sort options
@@ -149,6 +153,8 @@ def company_list_optimized(request):
     return render(request, 'checker/company_list_optimized.html', context)
 
 
+@record_traffic
+@read_replica
 def technology_list_optimized(request):
     """
     Optimized technology list view supporting multiple sort options
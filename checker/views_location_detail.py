@@ -21,9 +21,6 @@ def location_detail(request, location_id):
     # Check if this is part of an aggregated CMU
     aggregation_info = check_cmu_aggregation(location_group)
     
-    # Fetch CMU Registry data for all CMUs at this location
-    cmu_registry_data = {}
-    
     # Handle both old list format and new dict format
     cmu_ids_to_process = []
     if isinstance(location_group.cmu_ids, dict) and 'sample' in location_group.cmu_ids:
@@ -33,18 +30,16 @@ def location_detail(request, location_id):
         # Old format: use all CMU IDs
         cmu_ids_to_process = location_group.cmu_ids
     
-    for cmu_id in cmu_ids_to_process:
-        registry_entry = CMURegistry.objects.filter(cmu_id=cmu_id).first()
-        if registry_entry and isinstance(registry_entry.raw_data, dict):
-            cmu_registry_data[cmu_id] = registry_entry.raw_data
+    # Registry details for every CMU at this location in one query
+    cmu_registry_data = CMURegistry.objects.details(cmu_ids_to_process)
     
     # Extract common secondary trading details (if consistent across CMUs)
     trading_contacts = defaultdict(set)
-    for cmu_id, registry_data in cmu_registry_data.items():
-        if registry_data.get("Secondary Trading Contact - Email"):
-            trading_contacts['emails'].add(registry_data["Secondary Trading Contact - Email"])
-        if registry_data.get("Secondary Trading Contact - Telephone"):
-            trading_contacts['phones'].add(registry_data["Secondary Trading Contact - Telephone"])
+    for registry_entry in cmu_registry_data.values():
+        if registry_entry.trading_contact_email:
+            trading_contacts['emails'].add(registry_entry.trading_contact_email)
+        if registry_entry.trading_contact_phone:
+            trading_contacts['phones'].add(registry_entry.trading_contact_phone)
     
     # Build auction links for each CMU at this location
     # This is the expensive operation that we've moved from search results
@@ -78,12 +73,14 @@ def location_detail(request, location_id):
             cmu_data['auction_links'] = auction_links
             
             # Add CMU registry data to each CMU
-            if cmu_id in cmu_registry_data:
-                cmu_data['registry_data'] = cmu_registry_data[cmu_id]
+            registry_entry = cmu_registry_data.get(cmu_id)
+            if registry_entry:
+                cmu_data['registry_data'] = registry_entry
                 # Extract key capacity data
-                cmu_data['registry_capacity'] = cmu_registry_data[cmu_id].get("De-Rated Capacity")
-                cmu_data['connection_capacity'] = cmu_registry_data[cmu_id].get("Connection / DSR Capacity")
-                cmu_data['parent_company'] = cmu_registry_data[cmu_id].get("Parent Company")
+                cmu_data['registry_capacity'] = registry_entry.derated_capacity_mw
+                cmu_data['connection_capacity'] = registry_entry.connection_capacity_mw
+                cmu_data['anticipated_capacity'] = registry_entry.anticipated_derated_capacity_mw
+                cmu_data['parent_company'] = registry_entry.parent_company
     
     context = {
         'location_group': location_group,
@@ -12,10 +12,12 @@ from django.core.cache import cache
 from .models import LocationGroup
 from .services.postcode_helpers import get_all_postcodes_for_area
 from .decorators.access_required import map_access_required
+from .decorators.read_replica import read_replica
 
 logger = logging.getLogger(__name__)
 
 @map_access_required
+@read_replica
 def search_filters_api(request):
     """
     AJAX endpoint to get relevant filter options for search results, technology pages, company pages, and CMU pages
@@ -3,7 +3,7 @@ Search GeoJSON API endpoint for map visualization using LocationGroup
 """
 from django.http import JsonResponse
 from django.db.models import Q
-from checker.models import LocationGroup
+from checker.models import LocationMapPoint
 import time
 import urllib.parse
 import json
@@ -16,17 +16,36 @@ except ImportError:
         return func
 
 from django.views.decorators.cache import cache_page
-from django.views.decorators.gzip import gzip_page
-from django.core.cache import cache
 from .decorators.access_required import map_access_required
+from .decorators.precompressed import precompressed_response
+from .decorators.read_replica import read_replica
+from .services.request_coalescing import coalesce_requests
+from .services.traffic_sketch import record_traffic
+from .services.map_points import display_technology, filter_technology, popup_rows, viewport_q
 
+VIEWPORT_PARAMS = ['north', 'south', 'east', 'west']
+
+
+def _is_static_request(request):
+    """Viewport requests have an unbounded key space - only whole-map requests are cached"""
+    return not any(request.GET.get(param) for param in VIEWPORT_PARAMS)
+
+
+@record_traffic
 @monitor_api
-@gzip_page
 @map_access_required
+@precompressed_response(
+    'search_geojson',
+    timeout=60 * 5,  # 5 minutes, as before
+    cacheable=_is_static_request,
+    params=['q', 'tech', 'subtype', 'company', 'show_active', 'residential', 'limit'],
+)
+@coalesce_requests('search_geojson', vary_on_user=False)
+@read_replica
 def search_results_geojson(request):
     """
     Return search results as GeoJSON for map display.
-    Uses LocationGroup for aggregated location data.
+    Filters on LocationMapPoint; LocationGroup supplies the returned markers' popup text.
     """
     # Track performance
     start_time = time.time()
@@ -37,27 +56,7 @@ def search_results_geojson(request):
     print(f"📊 Query Parameters: {query_params}")
     print(f"🕐 Request Start Time: {time.strftime('%H:%M:%S', time.localtime(start_time))}")
     
-    # Implement intelligent caching: only cache non-viewport requests
-    has_viewport = any(request.GET.get(param) for param in ['north', 'south', 'east', 'west'])
-    
-    if not has_viewport:
-        # Create cache key for static requests (no viewport bounds)
-        cache_params = []
-        for param in ['q', 'tech', 'subtype', 'company', 'show_active', 'residential', 'limit']:
-            value = request.GET.get(param, '')
-            if value:
-                cache_params.append(f"{param}={value}")
-        
-        cache_key = f"geojson_static:{'&'.join(cache_params) if cache_params else 'empty'}"
-        cached_response = cache.get(cache_key)
-        
-        if cached_response:
-            print(f"🚀 Cache HIT for static GeoJSON request")
-            return JsonResponse(cached_response)
-        
-        print(f"⏱️  Cache MISS for static GeoJSON request: {cache_key}")
-    else:
-        print(f"🗺️  Viewport request - no caching to prevent Redis bloat")
+    # Static (non-viewport) responses are cached compressed by precompressed_response
     
     # Get search query and any parameters
     search_query = request.GET.get('q', '')
@@ -83,11 +82,9 @@ def search_results_geojson(request):
         # Return a sample of active locations
         pass  # Continue to process the query
     
-    # Build query for LocationGroups
-    location_groups = LocationGroup.objects.filter(
-        latitude__isnull=False,
-        longitude__isnull=False
-    )
+    # Build query on the narrow map projection; wide LocationGroup rows are only
+    # joined for text/CMU/company filters and read for the returned page's popups
+    points = LocationMapPoint.objects.all()
     
     # Apply viewport bounds filtering EARLY for performance
     # This is critical for large datasets like Octopus DSR
@@ -99,12 +96,7 @@ def search_results_geojson(request):
             east_f = float(east)
             west_f = float(west)
             
-            location_groups = location_groups.filter(
-                latitude__gte=south_f,
-                latitude__lte=north_f,
-                longitude__gte=west_f,
-                longitude__lte=east_f
-            )
+            points = points.filter(viewport_q(south_f, west_f, north_f, east_f))
             viewport_applied = True
             print(f"🎯 Viewport bounds applied: N:{north_f:.2f} S:{south_f:.2f} E:{east_f:.2f} W:{west_f:.2f}")
         except ValueError:
@@ -117,9 +109,9 @@ def search_results_geojson(request):
     # When show_active=false, show inactive locations  
     # When show_active parameter not provided, show all locations
     if show_active is True:
-        location_groups = location_groups.filter(is_active=True)
+        points = points.filter(is_active=True)
     elif show_active is False:
-        location_groups = location_groups.filter(is_active=False)
+        points = points.filter(is_active=False)
     # If show_active is None (show_all case), don't filter by active status
     
     # Handle search query
@@ -127,83 +119,42 @@ def search_results_geojson(request):
         # Check if this is a CMU ID search
         if search_query.upper().startswith(('CMU', 'BMU', 'DSR')):
             # Search in the cmu_ids JSON field
-            location_groups = location_groups.filter(cmu_ids__contains=search_query.upper())
+            points = points.filter(location_group__cmu_ids__contains=search_query.upper())
         else:
             # Text search across location name and descriptions
             search_terms = search_query.split()
             for term in search_terms:
-                # Search in both location name and descriptions using Q objects
-                from django.db.models import Q
-                location_groups = location_groups.filter(
-                    Q(location__icontains=term) | Q(descriptions__icontains=term)
+                points = points.filter(
+                    Q(location_group__location__icontains=term) | Q(location_group__descriptions__icontains=term)
                 )
     
-    # Handle technology filter
+    # Handle technology filter - canonical technologies are a bit test on the narrow row
     if tech_filter and tech_filter != 'All':
-        # OPTIMIZED: Build all technology variations upfront at database level
-        tech_variations = {
-            'CHP': ['CHP', 'Combined Heat and Power (CHP)', 'CHP and autogeneration'],
-            'DSR': ['DSR', 'Demand Side Response'],
-            'EV Charging': ['EV Charging'],
-            'Battery': ['Battery', 'Battery Storage', 'Battery storage', 'Storage', 'Storage (Duration 0.5h)', 'Storage (Duration 1h)', 'Storage (Duration 1.5h)', 'Storage (Duration 2h)', 'Storage (Duration 2.5h)', 'Storage (Duration 3h)', 'Storage (Duration 3.5h)', 'Storage (Duration 4h)', 'Storage (Duration 4.5h)', 'Storage (Duration 5h)', 'Storage (Duration 5.5h)', 'Storage (Duration 6h)', 'Storage (Duration 7h)', 'Storage (Duration 8h)', 'Storage (Duration 8.5h)', 'Storage (Duration 9h)', 'Storage (Duration 9.5h)', 'Storage (Duration 12h)'],
-            'OCGT': ['Gas', 'Gas - OCGTs and reciprocating engines', 'Gas reciprocating engines', 'OCGT', 'Combined Cycle Gas Turbine (CCGT)', 'Open Cycle Gas Turbine (OCGT)', 'OCGT and Reciprocating Engines', 'OCGT and Reciprocating Engines (Fuel Type - Diesel)', 'OCGT and Reciprocating Engines (Fuel Type - Gas)', 'Reciprocating engines'],
-            'Wind': ['Wind', 'Onshore Wind', 'Offshore Wind'],
-            'Solar': ['Solar', 'Solar Photovoltaic'],
-            'Nuclear': ['Nuclear'],
-            'Hydro': ['Hydro', 'Hydro Power', 'Pumped Storage Hydro'],
-            'Biomass': ['Biomass', 'Energy from Waste', 'Coal/biomass'],
-            'Interconnector': ['Interconnector', 'Interconnection', 'BritNED (Netherlands)', 'Eleclink (France)', 'EWIC (Ireland)', 'EWIC (Republic of Ireland)', 'Greenlink (Republic of Ireland)', 'IFA2 (France)', 'IFA (France)', 'Moyle (Northern Ireland)', 'NEMO (Belgium)', 'NeuConnect (Germany)', 'NSL (Norway)', 'VikingLink (Denmark)'],
-            'Coal': ['Coal']
-        }
-        
-        # Build Q objects for all variations - do this ONCE at database level
-        from django.db.models import Q
-        q_filter = Q()
-        
-        # Check if we have variations for this tech
-        if tech_filter in tech_variations:
-            # For performance, use a single query with OR conditions
-            variations = tech_variations[tech_filter]
-            for variation in variations:
-                q_filter |= Q(technologies__has_key=variation)
-        else:
-            # Direct filter for unknown techs
-            q_filter = Q(technologies__has_key=tech_filter)
-            
-        location_groups = location_groups.filter(q_filter)
+        points = filter_technology(points, tech_filter)
     
     # Handle DSR subtype filtering (Octopus, Axle, Everything else)
     if tech_filter == 'DSR' and subtype_filter:
-        from django.db.models import Q
         if subtype_filter == 'Octopus':
             # Show only Octopus Energy DSR
-            location_groups = location_groups.filter(companies__has_key='OCTOPUS ENERGY LIMITED')
+            points = points.filter(location_group__companies__has_key='OCTOPUS ENERGY LIMITED')
         elif subtype_filter == 'Axle':
             # Show only Axle Energy DSR
-            location_groups = location_groups.filter(companies__has_key='AXLE ENERGY LIMITED')
+            points = points.filter(location_group__companies__has_key='AXLE ENERGY LIMITED')
         elif subtype_filter == 'Everything else':
             # Show all DSR except Octopus and Axle (current default DSR behavior)
-            exclude_query = Q()
-            exclude_query |= Q(companies__has_key='OCTOPUS ENERGY LIMITED')
-            exclude_query |= Q(companies__has_key='AXLE ENERGY LIMITED')
-            location_groups = location_groups.exclude(exclude_query)
+            points = points.filter(is_residential=False)
     
     # Handle residential DSR filtering
     residential_filter = request.GET.get('residential', '')
     if residential_filter:
         # If residential DSR filter is specified, only show that specific company
-        location_groups = location_groups.filter(companies__has_key=residential_filter)
+        points = points.filter(location_group__companies__has_key=residential_filter)
     # Skip residential exclusion entirely if a specific company is already selected
     # This optimizes queries for Octopus/Axle + DSR/EV Charging combinations
     elif not company_filter and not ((tech_filter == 'DSR' and subtype_filter)):
         # Only exclude residential companies if NO company is selected
         # and NOT using DSR subtypes
-        residential_companies = ['AXLE ENERGY LIMITED', 'OCTOPUS ENERGY LIMITED']
-        from django.db.models import Q
-        exclude_query = Q()
-        for company in residential_companies:
-            exclude_query |= Q(companies__has_key=company)
-        location_groups = location_groups.exclude(exclude_query)
+        points = points.filter(is_residential=False)
     
     # Handle company filter (for map explorer)
     if company_filter:
@@ -211,7 +162,6 @@ def search_results_geojson(request):
             # "Everything else" - show only companies with ≤7 locations
             # First get list of companies with >7 locations to exclude
             from django.db import connection
-            from django.db.models import Q
             
             with connection.cursor() as cursor:
                 cursor.execute("""
@@ -235,25 +185,24 @@ def search_results_geojson(request):
             # Exclude all companies with >7 locations
             exclude_query = Q()
             for company in big_companies:
-                exclude_query |= Q(companies__has_key=company)
-            location_groups = location_groups.exclude(exclude_query)
+                exclude_query |= Q(location_group__companies__has_key=company)
+            points = points.exclude(exclude_query)
         else:
             # Filter locations that have the specified company
             # The companies field is a JSON dict like {"Company Name": 3, "Another Company": 1}
             # Handle case-insensitive matching by checking all variations
-            from django.db.models import Q
             company_filter_upper = company_filter.upper()
             company_filter_lower = company_filter.lower()
             company_filter_title = company_filter.title()
             
             # Try multiple case variations to handle data inconsistencies
             company_query = (
-                Q(companies__has_key=company_filter) |  # Exact match
-                Q(companies__has_key=company_filter_upper) |  # UPPER CASE
-                Q(companies__has_key=company_filter_lower) |  # lower case
-                Q(companies__has_key=company_filter_title)  # Title Case
+                Q(location_group__companies__has_key=company_filter) |  # Exact match
+                Q(location_group__companies__has_key=company_filter_upper) |  # UPPER CASE
+                Q(location_group__companies__has_key=company_filter_lower) |  # lower case
+                Q(location_group__companies__has_key=company_filter_title)  # Title Case
             )
-            location_groups = location_groups.filter(company_query)
+            points = points.filter(company_query)
     
     # PERFORMANCE OPTIMIZATION: Skip count for Octopus/Axle queries
     # These queries are too slow and cause timeouts
@@ -270,7 +219,7 @@ def search_results_geojson(request):
     else:
         # Get total count before limiting
         count_start = time.time()
-        total_count = location_groups.count()
+        total_count = points.count()
         count_duration = time.time() - count_start
         print(f"📈 Count Query: {total_count} results in {count_duration:.3f}s")
     
@@ -294,77 +243,36 @@ def search_results_geojson(request):
     # Apply smart ordering based on zoom level
     if zoom_level > 10:
         # High zoom: prioritize by capacity (show important locations first)
-        location_groups = location_groups.order_by('-normalized_capacity_mw', 'location')
+        points = points.order_by('-capacity_mw', 'pk')
     else:
         # Low zoom: use ID-based ordering for performance (pseudo-random distribution)
         # Random ordering with '?' is very slow in PostgreSQL
-        location_groups = location_groups.order_by('id')
+        points = points.order_by('pk')
     
-    # Apply limit and OPTIMIZE: Only fetch fields needed for GeoJSON (60-80% egress reduction)
     query_start = time.time()
     
-    # For Octopus/Axle queries, defer only the largest unused fields that actually exist
-    if is_octopus_axle_query:
-        location_groups = location_groups.defer(
-            'capacity_calculation_notes', 'created_at', 'updated_at'
-        ).select_related('representative_component')[:limit]
-    else:
-        location_groups = location_groups.only(
-            'id', 'location', 'latitude', 'longitude', 'outward_code',
-            'technologies', 'companies', 'component_count', 'normalized_capacity_mw',
-            'is_active', 'representative_component_id', 'auction_years', 'cmu_ids', 'descriptions'
-        ).select_related('representative_component')[:limit]
-    
     # Force evaluation of queryset
-    location_list = list(location_groups)
+    point_list = list(points[:limit])
+    # Wide columns only for the markers being returned (popup title, description, CMU)
+    popups = popup_rows([point.pk for point in point_list], ['location', 'descriptions', 'cmu_ids'])
     data_duration = time.time() - query_start
-    print(f"💾 Data Query: {len(location_list)} locations fetched in {data_duration:.3f}s")
+    print(f"💾 Data Query: {len(point_list)} locations fetched in {data_duration:.3f}s")
     
-    # Convert LocationGroups to GeoJSON features
+    # Convert map points to GeoJSON features
     features = []
     
-    # Simplified processing for better performance
-    
-    for location_group in location_list:
-        # Get the technology to display based on filter
-        technologies = location_group.technologies or {}
+    for point in point_list:
+        popup = popups.get(point.pk, {})
         
-        if tech_filter and tech_filter != 'All':
-            # OPTIMIZED: Since filtering is now done at database level, 
-            # we know this location has the filtered technology
-            # Just find the best matching tech name from the location's technologies
-            dominant_tech = tech_filter
-            
-            # Try to find the exact technology name in this location
-            for tech_name in technologies.keys():
-                if tech_name == tech_filter:
-                    dominant_tech = tech_name
-                    break
-                # For display purposes, prefer the more specific technology name
-                if tech_filter == 'OCGT' and 'Open Cycle Gas Turbine (OCGT)' in tech_name:
-                    dominant_tech = tech_name
-                    break
-                elif tech_filter == 'Battery' and 'Storage (Duration' in tech_name:
-                    dominant_tech = tech_name
-                    break
-        else:
-            # No specific filter, use the location's primary technology with priority logic
-            dominant_tech = location_group.get_primary_technology()
-            
-            # Skip debug logging for performance
-        
-        # Get the latest auction year
-        auction_years = location_group.auction_years or []
-        latest_auction = auction_years[0] if auction_years else ''
+        # Get the technology to display based on filter
+        dominant_tech = display_technology(point, tech_filter)
         
         # Simple description handling for performance
-        descriptions = location_group.descriptions or []
+        descriptions = popup.get('descriptions') or []
         first_description = descriptions[0] if descriptions else ''
         
-        # Skip expensive description analysis for performance
-        
         # Get first CMU ID for display
-        cmu_ids_data = location_group.cmu_ids or {}
+        cmu_ids_data = popup.get('cmu_ids') or {}
         if isinstance(cmu_ids_data, dict) and 'sample' in cmu_ids_data:
             cmu_ids_list = cmu_ids_data['sample']
             display_cmu_id = cmu_ids_list[0] if cmu_ids_list else ''
@@ -373,35 +281,32 @@ def search_results_geojson(request):
         else:
             display_cmu_id = ''
         
-        # Get company with most components - use optimized method
         # When a company filter is active, show the filtered company instead of dominant
         if company_filter and company_filter != 'Everything else':
             # Use the filtered company name
             dominant_company = company_filter
         else:
             # Use the location's primary company
-            dominant_company = location_group.get_primary_company()
-        
-        # Skip debug logging for performance
+            dominant_company = point.primary_company or 'Unknown'
         
         # Create GeoJSON feature - OPTIMIZED for minimal egress
         feature = {
             'type': 'Feature',
             'geometry': {
                 'type': 'Point',
-                'coordinates': [location_group.longitude, location_group.latitude]
+                'coordinates': [point.longitude, point.latitude]
             },
             'properties': {
-                'id': location_group.id,
-                'title': location_group.location,
+                'id': point.pk,
+                'title': popup.get('location', ''),
                 'tech': dominant_tech,  # Shortened for bandwidth
                 'company': dominant_company,
                 'desc': first_description[:100] + ('...' if len(first_description) > 100 else ''),  # Truncate long descriptions
                 'cmu': display_cmu_id,
-                'url': f'/location/{location_group.id}/',  # Direct link to location group detail
-                'count': location_group.component_count,
-                'active': location_group.is_active,
-                'mw': location_group.normalized_capacity_mw or 0
+                'url': f'/location/{point.pk}/',  # Direct link to location group detail
+                'count': point.component_count,
+                'active': point.is_active,
+                'mw': point.capacity_mw or 0
             }
         }
         features.append(feature)
@@ -430,11 +335,6 @@ def search_results_geojson(request):
         }
     }
     
-    # Cache static requests (no viewport bounds) to reduce Redis bloat
-    if not has_viewport:
-        cache.set(cache_key, response_data, 60 * 5)  # Cache for 5 minutes (reduced to save Redis memory)
-        print(f"💾 Cached static GeoJSON response for 5 minutes")
-    
     total_duration = time.time() - start_time
     print(f"✅ GeoJSON Response: {len(features)} features, {total_duration:.3f}s total")
     print(f"🔚 Response End Time: {time.strftime('%H:%M:%S', time.localtime())}")
@@ -19,11 +19,17 @@ from .services.filter_options import get_complete_filter_options
 from .services.company_index_postgresql import get_company_links_html_postgresql
 from .decorators.access_required import map_access_required
 from .decorators.bot_protection import bot_protected_view
+from .decorators.read_replica import read_replica
+from .services.traffic_sketch import record_traffic
+from .services.request_coalescing import coalesce_requests
 
 logger = logging.getLogger(__name__)
 
+@record_traffic
 @bot_protected_view(rate='5/m')  # Strict rate limiting for bots
 # Removed @cache_page - using comprehensive search result caching instead
+@coalesce_requests('search_page')
+@read_replica
 def search_map_view_simple(request):
     """Search map view that displays results with a map using optimized search performance"""
     start_time = time_module.time()
@@ -701,16 +707,14 @@ def search_map_view_simple(request):
     performance_log['timings']['lazy_filters'] = time_module.time() - filter_start
     logger.info("🚀 Using lazy loading - filters will load on dropdown interaction")
     
-    # OPTIMIZED: Select only needed fields for pagination and prefetch related data
+    # OPTIMIZED: Select only needed fields for pagination
     # Use only() to load exactly what the template needs (like detail views)
-    # Also prefetch representative_component to avoid N+1 queries for colocation checks
-    optimized_locations = location_groups.select_related(
-        'representative_component'
-    ).only(
+    # Co-location and retailer badges read denormalized columns - no per-row queries
+    optimized_locations = location_groups.only(
         'id', 'location', 'component_count', 'descriptions', 'technologies', 
         'companies', 'latitude', 'longitude', 'outward_code', 'is_active', 
         'auction_years', 'normalized_capacity_mw',
-        'representative_component__id', 'representative_component__full_postcode'
+        'full_postcode', 'colocation_count', 'business_name', 'business_type', 'major_retailers'
     )
     
     # Paginate BEFORE processing (key optimization!)
@@ -725,49 +729,6 @@ def search_map_view_simple(request):
     performance_log['timings']['pagination'] = time_module.time() - pagination_start
     performance_log['db_queries']['after_pagination'] = len(connection.queries)
     
-    # PERFORMANCE: Prefetch colocation data to avoid N+1 queries in template
-    # This prevents 25+ queries when rendering search results with postcode links
-    colocation_start = time_module.time()
-    
-    # Get all postcodes for current page locations
-    location_ids = [loc.id for loc in page_obj]
-    if location_ids:
-        # First, get all postcodes from locations on this page
-        page_postcodes = []
-        for location in page_obj:
-            if location.representative_component and location.representative_component.full_postcode:
-                page_postcodes.append(location.representative_component.full_postcode)
-        
-        # Then count ALL location groups at these postcodes (not just ones on current page)
-        from django.db.models import Count
-        if page_postcodes:
-            postcodes_data = LocationGroup.objects.filter(
-                representative_component__full_postcode__in=page_postcodes
-            ).values('representative_component__full_postcode').annotate(
-                count=Count('id', distinct=True)
-            ).filter(count__gt=1)
-            
-            # Create a dict of postcode -> count for quick lookup
-            postcode_counts = {item['representative_component__full_postcode']: item['count'] for item in postcodes_data}
-        else:
-            postcode_counts = {}
-        
-        # Attach colocation info to each location
-        for location in page_obj:
-            if location.representative_component and location.representative_component.full_postcode:
-                postcode = location.representative_component.full_postcode
-                if postcode in postcode_counts and postcode_counts[postcode] > 1:
-                    location.colocation_info_cached = {
-                        'postcode': postcode,
-                        'count': postcode_counts[postcode]
-                    }
-                else:
-                    location.colocation_info_cached = None
-            else:
-                location.colocation_info_cached = None
-    
-    performance_log['timings']['colocation_prefetch'] = time_module.time() - colocation_start
-    
     # PERFORMANCE: Disabled expensive related locations feature - not displayed in template
     # This was causing 50+ database queries per page (2 per location) for unused functionality
     # TODO: If needed, implement as single efficient query or async loading
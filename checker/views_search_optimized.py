@@ -15,6 +15,7 @@ from .services.postcode_helpers import get_all_postcodes_for_area
 from .services.filter_options import get_complete_filter_options
 from .utils import normalize
 from .decorators.access_required import access_required
+from .decorators.read_replica import read_replica
 
 logger = logging.getLogger(__name__)
 
@@ -56,6 +57,7 @@ def homepage_view(request):
     })
 
 @access_required
+@read_replica
 def search_components_optimized(request):
     """
     EGRESS-OPTIMIZED search view using LocationGroup instead of Component
@@ -169,6 +171,7 @@ def search_components_optimized(request):
                     component_filter &= part_filter
                 
                 # Find unique locations that have matching components
+                # (all of them - "active" is a LocationGroup property, filtered on is_active below)
                 matching_locations = Component.objects.filter(
                     component_filter
                 ).values_list('location', flat=True).distinct()
@@ -401,7 +404,7 @@ def search_components_optimized(request):
     optimized_locations = location_groups.only(
         'id', 'location', 'county', 'latitude', 'longitude',
         'descriptions', 'technologies', 'companies', 'auction_years',
-        'component_count', 'normalized_capacity_mw'
+        'is_active', 'component_count', 'normalized_capacity_mw'
     )
     
     # Paginate BEFORE processing (key optimization!)
@@ -1,9 +1,10 @@
 from django.shortcuts import render, redirect
 from django.core.cache import cache
-from django.db.models import Count, Sum, Q
 from django.core.management import call_command
 from django.contrib.admin.views.decorators import staff_member_required
 from checker.models import Component
+from checker.services import statistics_rollups
+from checker.services.statistics_cache import get_statistics_json
 import json
 import logging
 
@@ -17,55 +18,35 @@ def statistics_view_optimized(request):
     # Check if we should force rebuild
     rebuild = request.GET.get('rebuild', '').lower() == 'true'
     
-    # Try to get cached data first
-    cache_key = 'statistics_page_data'
+    # Try to get cached data first. A cold or expired entry is rebuilt once in the
+    # background (single-flight), so concurrent visitors never pile onto Postgres.
     cached_data = None
-    
-    if not rebuild:
-        cached_json = cache.get(cache_key)
-        if cached_json:
-            try:
-                cached_data = json.loads(cached_json)
-                logger.info("Statistics loaded from cache")
-            except:
-                logger.error("Failed to parse cached statistics data")
+    cached_json = get_statistics_json(force=True) if rebuild else get_statistics_json(block=False)
+    if cached_json:
+        try:
+            cached_data = json.loads(cached_json)
+            logger.info("Statistics loaded from cache")
+        except:
+            logger.error("Failed to parse cached statistics data")
     
     # If no cached data, calculate it (this is the slow part)
     if not cached_data:
         logger.info("Building statistics from database...")
         
-        # For immediate response, redirect to a loading page
+        # For immediate response, redirect to a loading page while the queued build runs
         if not rebuild and request.GET.get('loading') != 'true':
-            # Start building cache in background
-            from django.core.management import call_command
-            from threading import Thread
-            
-            def build_cache():
-                try:
-                    call_command('build_statistics_cache')
-                except Exception as e:
-                    logger.error(f"Failed to build statistics cache: {e}")
-            
-            Thread(target=build_cache).start()
-            
-            # Redirect to loading page
             return render(request, 'checker/statistics_loading.html')
         
         # If we're here, we need to calculate stats synchronously
         stats_data = {}
         
         # Calculate all statistics (same as management command)
+        dataset_totals = statistics_rollups.totals()
         stats_data['summary'] = {
-            'total_components': Component.objects.count(),
-            'total_companies': Component.objects.exclude(
-                Q(company_name__isnull=True) | Q(company_name='')
-            ).values('company_name').distinct().count(),
-            'total_technologies': Component.objects.values('technology').distinct().count(),
-            'total_capacity': float(
-                Component.objects.aggregate(
-                    total=Sum('derated_capacity_mw')
-                )['total'] or 0
-            )
+            'total_components': dataset_totals['component_count'],
+            'total_companies': statistics_rollups.rollups('company').count(),
+            'total_technologies': statistics_rollups.rollups('technology').count(),
+            'total_capacity': dataset_totals['derated_capacity_mw'],
         }
         
         # Use the calculated data
@@ -152,8 +133,8 @@ def statistics_view_optimized(request):
         # Summary stats
         'total_components': total_components,
         'total_companies': summary.get('total_companies', 0), 
-        'total_cmus': Component.objects.values('cmu_id').distinct().count(),  # Not cached, small query
-        'total_unique_locations': Component.objects.exclude(location__isnull=True).exclude(location='').values('location').distinct().count(),  # Not cached, but reasonable
+        'total_cmus': statistics_rollups.totals()['cmu_count'],
+        'total_unique_locations': statistics_rollups.totals()['location_count'],
         
         # Company data
         'top_companies_data': top_companies_data,
@@ -251,18 +232,13 @@ def statistics_sections_view(request):
     # This could be AJAX-powered for dynamic loading
     if section == 'summary':
         # Just load summary stats
+        dataset_totals = statistics_rollups.totals()
         context = {
             'summary': {
-                'total_components': Component.objects.count(),
-                'total_companies': Component.objects.exclude(
-                    Q(company_name__isnull=True) | Q(company_name='')
-                ).values('company_name').distinct().count(),
-                'total_technologies': Component.objects.values('technology').distinct().count(),
-                'total_capacity': float(
-                    Component.objects.aggregate(
-                        total=Sum('derated_capacity_mw')
-                    )['total'] or 0
-                )
+                'total_components': dataset_totals['component_count'],
+                'total_companies': statistics_rollups.rollups('company').count(),
+                'total_technologies': statistics_rollups.rollups('technology').count(),
+                'total_capacity': dataset_totals['derated_capacity_mw'],
             }
         }
         return render(request, 'checker/statistics_summary.html', context)
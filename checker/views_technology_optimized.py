@@ -11,7 +11,7 @@ from django.views.decorators.gzip import gzip_page
 from django.conf import settings
 import urllib.parse
 
-from .models import LocationGroup, Component
+from .models import LocationGroup, Component, auction_sort_key
 from .templatetags.checker_tags import technology_color
 from .decorators.access_required import map_access_required
 from .decorators.bot_protection import bot_protected_view
@@ -139,7 +139,7 @@ def technology_detail_map(request, technology_name):
     optimized_locations = location_groups.only(
         'id', 'location', 'county', 'latitude', 'longitude',
         'descriptions', 'technologies', 'companies', 'auction_years',
-        'component_count', 'normalized_capacity_mw'
+        'is_active', 'component_count', 'normalized_capacity_mw'
     )
     
     # Pagination BEFORE creating list (key optimization!)
@@ -330,6 +330,8 @@ def technology_detail_optimized(request, technology_name):
         'component_count',          # Displayed as count
         'descriptions',             # Displayed as description text
         'technologies',             # Displayed as technology badges
+        'auction_years',            # Displayed as auction years
+        'is_active',                # Displayed as Active/Inactive
         'normalized_capacity_mw'    # Displayed as capacity
     )
     
@@ -347,14 +349,7 @@ def technology_detail_optimized(request, technology_name):
         page_obj = Page([], 1, paginator)
     
     # Sort auction years (newest first)
-    def get_year_key(year_str):
-        import re
-        match = re.search(r'(\d{4})-\d{2}', year_str)
-        if match:
-            return int(match.group(1))
-        return 0
-    
-    sorted_auction_years = sorted(all_auction_years, key=get_year_key, reverse=True)
+    sorted_auction_years = sorted(all_auction_years, key=auction_sort_key, reverse=True)
     companies = sorted(list(all_companies))
     technologies = sorted(list(all_technologies))
     